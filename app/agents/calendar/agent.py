@@ -3,14 +3,16 @@ Calendar agent creation and configuration.
 """
 
 from langchain.agents import create_agent
-from .tools import create_calendar_event, get_available_time_slots
+from .tools import create_calendar_event, get_available_time_slots, find_meeting_slots
 
 
 CALENDAR_AGENT_PROMPT = (
     "You are a calendar scheduling assistant. "
     "Parse natural language scheduling requests (e.g., 'next Tuesday at 2pm') "
     "into proper ISO datetime formats (YYYY-MM-DDTHH:MM:SS). "
-    "Use get_available_time_slots to check availability when needed. "
+    "Use get_available_time_slots to check availability on a single day. "
+    "For searches across several days or many attendees (e.g. 'first free hour next week'), "
+    "call find_meeting_slots once instead of checking day by day. "
     "Use create_calendar_event to schedule events. "
     "Always confirm what was scheduled in your final response."
 )
@@ -27,7 +29,7 @@ def create_calendar_agent(model):
     """
     agent = create_agent(
         model,
-        tools=[create_calendar_event, get_available_time_slots],
+        tools=[create_calendar_event, get_available_time_slots, find_meeting_slots],
         system_prompt=CALENDAR_AGENT_PROMPT,
     )
     
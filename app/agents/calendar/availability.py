@@ -0,0 +1,176 @@
+"""
+Bitmap availability solver for multi-day, many-attendee slot search.
+
+The search horizon is cut into fixed bins (settings.calendar_solver_resolution_minutes,
+5 by default). Each attendee's busy intervals become one row of a boolean
+matrix, built with a difference array and a cumulative sum; a bin touched
+by any busy time counts as busy. Free time is the AND of the required
+attendees' free rows and the working-hours mask, and a start bin fits when
+a cumulative-sum window over that row counts duration-many free bins.
+
+Candidates on the granularity grid are ranked by how many optional
+attendees can also make it, then by how many required attendees would be
+back to back with another meeting, then by start time (or by start time
+only with prefer="earliest").
+"""
+
+import math
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.core.settings_access import setting
+
+from .freebusy import Interval, query_busy
+
+
+MAX_SEARCH_DAYS = 31
+
+
+@dataclass
+class Candidate:
+    start: datetime
+    end: datetime
+    optional_free: int = 0
+    back_to_back: int = 0
+    optional_names: List[str] = field(default_factory=list)
+
+
+class AvailabilitySolver:
+    """Boolean bin grid over [start, end) at a fixed resolution (UTC)."""
+
+    def __init__(self, start: datetime, end: datetime, resolution_minutes: int = 5):
+        self.resolution = timedelta(minutes=resolution_minutes)
+        res_s = int(self.resolution.total_seconds())
+        epoch = int(start.timestamp())
+        self.start = datetime.fromtimestamp(epoch - epoch % res_s, tz=timezone.utc)
+        self.n = max(0, math.ceil((end - self.start) / self.resolution))
+        self._res_s = res_s
+        # Minute of day / weekday of every bin start, for working-hours masks and the slot grid
+        offsets = np.arange(self.n, dtype=np.int64) * res_s + int(self.start.timestamp())
+        self.minute_of_day = (offsets % 86400) // 60
+        self.weekday = ((offsets // 86400) + 3) % 7       # 1970-01-01 was a Thursday (Mon=0)
+
+    def bins(self, minutes: int) -> int:
+        return max(1, math.ceil(minutes * 60 / self._res_s))
+
+    def busy_matrix(self, people: Sequence[Sequence[Interval]]) -> np.ndarray:
+        """(len(people), n) bool; True where that person is busy for any part of the bin."""
+        diff = np.zeros((len(people), self.n + 1), dtype=np.int16)
+        counts = [len(intervals) for intervals in people]
+        total = sum(counts)
+        if total:
+            t0 = self.start.timestamp()
+            r = np.repeat(np.arange(len(people)), counts)
+            s = np.fromiter((i[0].timestamp() for p in people for i in p), np.float64, total) - t0
+            e = np.fromiter((i[1].timestamp() for p in people for i in p), np.float64, total) - t0
+            s = np.clip(np.floor(s / self._res_s), 0, self.n).astype(np.int64)
+            e = np.clip(np.ceil(e / self._res_s), 0, self.n).astype(np.int64)
+            keep = e > s
+            np.add.at(diff, (r[keep], s[keep]), 1)
+            np.add.at(diff, (r[keep], e[keep]), -1)
+        return np.cumsum(diff[:, :-1], axis=1, dtype=np.int16) > 0
+
+    def work_mask(self, start_hour: int, end_hour: int, weekdays: Sequence[int]) -> np.ndarray:
+        mod = self.minute_of_day
+        return (mod >= start_hour * 60) & (mod < end_hour * 60) & np.isin(self.weekday, list(weekdays))
+
+    @staticmethod
+    def fits(free: np.ndarray, d: int) -> np.ndarray:
+        """fits[..., i] is True when free[..., i:i + d] is all True (length n - d + 1)."""
+        c = np.concatenate([np.zeros(free.shape[:-1] + (1,), dtype=np.int32),
+                            np.cumsum(free, axis=-1, dtype=np.int32)], axis=-1)
+        return (c[..., d:] - c[..., :-d]) == d
+
+    def solve(
+        self,
+        required: Dict[str, Sequence[Interval]],
+        duration_minutes: int,
+        optional: Optional[Dict[str, Sequence[Interval]]] = None,
+        step_minutes: int = 15,
+        work_hours: Tuple[int, int] = (9, 17),
+        weekdays: Sequence[int] = (0, 1, 2, 3, 4),
+        not_before: Optional[datetime] = None,
+        max_results: int = 5,
+        prefer: str = "best",
+    ) -> List[Candidate]:
+        optional = optional or {}
+        d = self.bins(duration_minutes)
+        if self.n < d:
+            return []
+        work = self.work_mask(*work_hours, weekdays)
+        busy = self.busy_matrix(list(required.values()))
+        free = work & ~busy.any(axis=0)
+        ok = self.fits(free, d)
+        # Start on the clock grid (e.g. :00/:15/:30/:45), not before not_before
+        idx = np.arange(ok.size)
+        ok &= (self.minute_of_day[:ok.size] % max(1, step_minutes)) == 0
+        if not_before is not None:
+            ok &= idx >= math.ceil((not_before - self.start) / self.resolution)
+        cand = np.flatnonzero(ok)
+        if cand.size == 0:
+            return []
+
+        names = list(optional)
+        opt_fits = self.fits(work & ~self.busy_matrix(list(optional.values())), d)[:, cand] if names \
+            else np.zeros((0, cand.size), dtype=bool)
+        opt_count = opt_fits.sum(axis=0)
+        # Required attendees busy right before or right after the slot
+        before = np.where(cand > 0, busy[:, np.maximum(cand - 1, 0)], False)
+        after_idx = cand + d
+        after = np.where(after_idx < self.n, busy[:, np.minimum(after_idx, self.n - 1)], False)
+        b2b = (before | after).sum(axis=0)
+
+        order = cand.argsort() if prefer == "earliest" else np.lexsort((cand, b2b, -opt_count))
+        out = []
+        for k in order[:max_results]:
+            start = self.start + int(cand[k]) * self.resolution
+            out.append(Candidate(
+                start=start, end=start + timedelta(minutes=duration_minutes),
+                optional_free=int(opt_count[k]), back_to_back=int(b2b[k]),
+                optional_names=[n for j, n in enumerate(names) if opt_fits[j, k]],
+            ))
+        return out
+
+
+def search(service, attendees: Sequence[str], duration_minutes: int, start_date: str = "",
+           days: int = 14, optional_attendees: Sequence[str] = (), max_results: int = 5,
+           prefer: str = "best", now: Optional[datetime] = None) -> dict:
+    """Fetch free/busy once for the whole horizon and solve.
+
+    Returns {"candidates", "errors", "horizon": (start, end), "required",
+    "optional", "fetch_ms", "solve_ms"}; required/optional count distinct
+    attendees. The organizer's primary calendar counts as a required attendee.
+    """
+    now = now or datetime.now(timezone.utc)
+    day0 = datetime.strptime(start_date, "%Y-%m-%d").replace(tzinfo=timezone.utc) if start_date \
+        else now.replace(hour=0, minute=0, second=0, microsecond=0)
+    days = max(1, min(int(days), setting("calendar_max_search_days", MAX_SEARCH_DAYS)))
+    horizon = (max(day0, now), day0 + timedelta(days=days))
+    required_ids = list(dict.fromkeys(["primary", *attendees]))
+    optional_ids = [a for a in dict.fromkeys(optional_attendees) if a not in required_ids]
+    if horizon[0] >= horizon[1]:
+        return {"candidates": [], "errors": {}, "horizon": horizon, "required": len(required_ids),
+                "optional": len(optional_ids), "fetch_ms": 0.0, "solve_ms": 0.0}
+
+    t = time.perf_counter()
+    busy, errors = query_busy(service, required_ids + optional_ids, *horizon)
+    fetch_ms = (time.perf_counter() - t) * 1000
+
+    t = time.perf_counter()
+    solver = AvailabilitySolver(*horizon, setting("calendar_solver_resolution_minutes", 5))
+    candidates = solver.solve(
+        {a: busy[a] for a in required_ids if a in busy}, duration_minutes,
+        optional={a: busy[a] for a in optional_ids if a in busy},
+        step_minutes=setting("calendar_slot_granularity_minutes", 15),
+        work_hours=(setting("calendar_work_start_hour", 9), setting("calendar_work_end_hour", 17)),
+        weekdays=setting("calendar_work_weekdays", [0, 1, 2, 3, 4]),
+        not_before=horizon[0], max_results=max_results, prefer=prefer,
+    )
+    solve_ms = (time.perf_counter() - t) * 1000
+    return {"candidates": candidates, "errors": errors, "horizon": horizon,
+            "required": len(required_ids), "optional": len(optional_ids),
+            "fetch_ms": fetch_ms, "solve_ms": solve_ms}
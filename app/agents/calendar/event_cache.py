@@ -0,0 +1,260 @@
+"""
+Local Google Calendar event cache (SQLite), kept fresh with sync tokens.
+
+Each cached calendar (settings.calendar_cache_calendars, the organizer's
+"primary" by default) gets one full events.list from
+settings.calendar_cache_past_days ago; the nextSyncToken it ends with is
+then used to pull only changed and cancelled events. A read newer than
+settings.calendar_cache_max_age_seconds since the last sync is answered
+from SQLite without any API call. If Google expires the sync token (410),
+the calendar is re-synced in full.
+
+freebusy.query_busy reads the organizer's busy time here, so repeated
+availability checks and conflict checks only pull deltas; other
+attendees' calendars still come from freebusy.query. cache_stats() gives
+hit ratio and sync times for the Diagnostics tab.
+"""
+
+import os
+import time
+import sqlite3
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from googleapiclient.errors import HttpError
+
+from app.core.settings_access import setting
+
+from .freebusy import Interval, merge_intervals, parse_time, rfc3339
+
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    "calendar_id" TEXT NOT NULL, "event_id" TEXT NOT NULL,
+    "start" REAL NOT NULL, "end" REAL NOT NULL,
+    "busy" INTEGER NOT NULL, "summary" TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY ("calendar_id", "event_id")
+);
+CREATE INDEX IF NOT EXISTS idx_events_range ON events("calendar_id", "start", "end");
+CREATE TABLE IF NOT EXISTS sync_state (
+    "calendar_id" TEXT PRIMARY KEY, "sync_token" TEXT NOT NULL,
+    "window_start" REAL NOT NULL, "synced_at" REAL NOT NULL
+);
+"""
+
+EVENT_FIELDS = ("nextPageToken,nextSyncToken,items(id,status,summary,transparency,"
+                "start,end,attendees(self,responseStatus))")
+PAGE_SIZE = 2500
+
+
+def _event_times(event: dict) -> Optional[tuple]:
+    """(start, end) epoch seconds; all-day events span whole UTC days."""
+    start, end = event.get("start", {}), event.get("end", {})
+    try:
+        if "dateTime" in start:
+            return parse_time(start["dateTime"]).timestamp(), parse_time(end["dateTime"]).timestamp()
+        if "date" in start:
+            day = lambda d: datetime.strptime(d, "%Y-%m-%d").replace(tzinfo=timezone.utc).timestamp()
+            return day(start["date"]), day(end["date"])
+    except (KeyError, ValueError):
+        pass
+    return None
+
+
+def _is_busy(event: dict) -> bool:
+    """Blocks time like freebusy does: opaque and not declined by the calendar owner."""
+    if event.get("transparency") == "transparent":
+        return False
+    return not any(a.get("self") and a.get("responseStatus") == "declined" for a in event.get("attendees", []))
+
+
+class EventCache:
+    """Per-calendar event rows plus the sync token they are current to."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.stats = {"reads": 0, "hits": 0, "full_syncs": 0, "incremental_syncs": 0,
+                      "events_pulled": 0, "sync_ms_total": 0.0, "last_sync_ms": 0.0, "errors": 0}
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def _state(self, calendar_id: str) -> Optional[tuple]:
+        return self._db().execute(
+            'SELECT "sync_token", "window_start", "synced_at" FROM sync_state WHERE "calendar_id" = ?',
+            (calendar_id,)).fetchone()
+
+    # ── SYNC ──────────────────────────────────────────────────────────────────
+    def _pull(self, service, calendar_id: str, **params) -> tuple:
+        """All pages of events.list; returns (events, nextSyncToken)."""
+        events, page = [], None
+        while True:
+            resp = service.events().list(calendarId=calendar_id, singleEvents=True, maxResults=PAGE_SIZE,
+                                         fields=EVENT_FIELDS, pageToken=page, **params).execute()
+            events.extend(resp.get("items", []))
+            page = resp.get("nextPageToken")
+            if not page:
+                return events, resp.get("nextSyncToken")
+
+    def _apply(self, db: sqlite3.Connection, calendar_id: str, events: List[dict]) -> None:
+        gone, rows = [], []
+        for e in events:
+            times = _event_times(e)
+            if e.get("status") == "cancelled" or times is None:
+                gone.append((calendar_id, e["id"]))
+            else:
+                rows.append((calendar_id, e["id"], times[0], times[1], int(_is_busy(e)), e.get("summary", "")))
+        db.executemany('DELETE FROM events WHERE "calendar_id" = ? AND "event_id" = ?', gone)
+        db.executemany('INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?, ?)', rows)
+
+    def sync(self, service, calendar_id: str = "primary", full: bool = False) -> None:
+        """Bring calendar_id up to date: incremental with the stored token, else full."""
+        with self._lock:
+            db = self._db()
+            state = None if full else self._state(calendar_id)
+            t = time.perf_counter()
+            kind = "incremental_syncs"
+            try:
+                if state is not None:
+                    try:
+                        events, token = self._pull(service, calendar_id, syncToken=state[0])
+                        window_start = state[1]
+                    except HttpError as e:
+                        if getattr(e.resp, "status", None) != 410:
+                            raise
+                        logger.info(f"Calendar cache: sync token for {calendar_id} expired, full re-sync")
+                        state = None
+                if state is None:
+                    kind = "full_syncs"
+                    window_start = time.time() - setting("calendar_cache_past_days", 30) * 86400
+                    events, token = self._pull(service, calendar_id,
+                                               timeMin=rfc3339(datetime.fromtimestamp(window_start, timezone.utc)))
+            except Exception:
+                self.stats["errors"] += 1
+                raise
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                if kind == "full_syncs":
+                    db.execute('DELETE FROM events WHERE "calendar_id" = ?', (calendar_id,))
+                self._apply(db, calendar_id, events)
+                db.execute('INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?)',
+                           (calendar_id, token or "", window_start, time.time()))
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+            ms = (time.perf_counter() - t) * 1000
+            self.stats[kind] += 1
+            self.stats["events_pulled"] += len(events)
+            self.stats["sync_ms_total"] += ms
+            self.stats["last_sync_ms"] = ms
+            logger.info(f"Calendar cache: {kind.replace('_syncs', '')} sync of {calendar_id}, "
+                        f"{len(events)} event(s) in {ms:.0f} ms")
+
+    def _fresh(self, service, calendar_id: str, time_min: datetime) -> bool:
+        """Sync if needed; False if [time_min, ...) cannot be served from the cache."""
+        state = self._state(calendar_id)
+        if state is not None and not state[0]:
+            state = None        # no sync token was returned; treat as never synced
+        hit = state is not None and time.time() - state[2] <= setting("calendar_cache_max_age_seconds", 60)
+        if not hit:
+            self.sync(service, calendar_id, full=state is None)
+            state = self._state(calendar_id)
+        if state is None or time_min.timestamp() < state[1]:
+            return False
+        self.stats["hits"] += hit
+        return True
+
+    # ── READS ─────────────────────────────────────────────────────────────────
+    def busy(self, service, calendar_id: str, time_min: datetime, time_max: datetime) -> Optional[List[Interval]]:
+        """Merged busy intervals overlapping the window, or None if the cache
+        cannot answer (window starts before the cached range, or sync failed)."""
+        with self._lock:
+            self.stats["reads"] += 1
+            try:
+                if not self._fresh(service, calendar_id, time_min):
+                    return None
+            except Exception as e:
+                logger.warning(f"Calendar cache sync failed for {calendar_id}, using the API: {e}")
+                return None
+            rows = self._db().execute(
+                'SELECT "start", "end" FROM events WHERE "calendar_id" = ? AND "busy" = 1 '
+                'AND "start" < ? AND "end" > ?', (calendar_id, time_max.timestamp(), time_min.timestamp()))
+            to_dt = lambda ts: datetime.fromtimestamp(ts, timezone.utc)
+            return merge_intervals([(to_dt(s), to_dt(e)) for s, e in rows])
+
+    def conflicts(self, service, calendar_id: str, start: datetime, end: datetime,
+                  exclude_id: str = "") -> Optional[List[Dict[str, str]]]:
+        """Busy events overlapping [start, end) as {"summary", "start", "end"}, or None if unknown."""
+        with self._lock:
+            self.stats["reads"] += 1
+            try:
+                if not self._fresh(service, calendar_id, start):
+                    return None
+            except Exception as e:
+                logger.warning(f"Calendar cache sync failed for {calendar_id}: {e}")
+                return None
+            rows = self._db().execute(
+                'SELECT "summary", "start", "end" FROM events WHERE "calendar_id" = ? AND "busy" = 1 '
+                'AND "start" < ? AND "end" > ? AND "event_id" != ? ORDER BY "start"',
+                (calendar_id, end.timestamp(), start.timestamp(), exclude_id))
+            fmt = lambda ts: datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%d %H:%M")
+            return [{"summary": s or "(no title)", "start": fmt(a), "end": fmt(b)} for s, a, b in rows]
+
+    def upsert(self, calendar_id: str, event: dict) -> None:
+        """Write-through for events this app creates, ahead of the next delta."""
+        with self._lock:
+            self._apply(self._db(), calendar_id, [event])
+
+    def clear(self) -> None:
+        with self._lock:
+            db = self._db()
+            db.execute("DELETE FROM events")
+            db.execute("DELETE FROM sync_state")
+
+
+_caches: Dict[str, EventCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_event_cache(path: Optional[str] = None) -> Optional[EventCache]:
+    """Process-wide cache for path (default settings.calendar_cache_path); None if disabled."""
+    if path is None:
+        if not setting("calendar_cache_enabled", True):
+            return None
+        path = setting("calendar_cache_path", "data/calendar_cache.db")
+    with _caches_lock:
+        cache = _caches.get(path)
+        if cache is None:
+            cache = _caches[path] = EventCache(path)
+        return cache
+
+
+def cached_calendars() -> List[str]:
+    return list(setting("calendar_cache_calendars", ["primary"]))
+
+
+def cache_stats() -> dict:
+    """Totals across caches plus hit_ratio and avg_sync_ms."""
+    out = {"reads": 0, "hits": 0, "full_syncs": 0, "incremental_syncs": 0,
+           "events_pulled": 0, "sync_ms_total": 0.0, "last_sync_ms": 0.0, "errors": 0}
+    for cache in list(_caches.values()):
+        for k, v in cache.stats.items():
+            out[k] = v if k == "last_sync_ms" else out[k] + v
+    syncs = out["full_syncs"] + out["incremental_syncs"]
+    out["hit_ratio"] = out["hits"] / out["reads"] if out["reads"] else 0.0
+    out["avg_sync_ms"] = out["sync_ms_total"] / syncs if syncs else 0.0
+    return out
@@ -0,0 +1,163 @@
+"""
+Free/busy engine behind get_available_time_slots.
+
+Busy time for every attendee comes from Google's freebusy.query. Requests
+over the per-call calendar limit are split and sent as one batch request,
+so any attendee count costs a single HTTP round trip. Each person's
+intervals are merged; since every attendee must be free, the union of all
+busy time is swept once and each free gap yields the slot starts (on a
+granularity grid) where duration_minutes still fits.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.core.settings_access import setting
+
+
+logger = logging.getLogger(__name__)
+
+FREEBUSY_MAX_ITEMS = 50     # calendars per freebusy.query (Calendar API limit)
+
+Interval = Tuple[datetime, datetime]
+
+
+def parse_time(value: str) -> datetime:
+    """RFC 3339 timestamp (as returned by the API) -> aware UTC datetime."""
+    dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def rfc3339(dt: datetime) -> str:
+    return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+# ── INTERVALS ─────────────────────────────────────────────────────────────────
+def merge_intervals(intervals: Sequence[Interval]) -> List[Interval]:
+    """Sorted, non-overlapping union (touching intervals are joined)."""
+    merged: List[Interval] = []
+    for start, end in sorted(i for i in intervals if i[1] > i[0]):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def free_gaps(busy: Sequence[Interval], window_start: datetime, window_end: datetime) -> List[Interval]:
+    """Complement of merged busy intervals within [window_start, window_end)."""
+    gaps, cursor = [], window_start
+    for start, end in busy:
+        if end <= cursor:
+            continue
+        if start >= window_end:
+            break
+        if start > cursor:
+            gaps.append((cursor, start))
+        cursor = max(cursor, end)
+    if cursor < window_end:
+        gaps.append((cursor, window_end))
+    return gaps
+
+
+def sweep_slots(busy_by_person: Dict[str, Sequence[Interval]], window_start: datetime,
+                window_end: datetime, duration: timedelta, step: timedelta) -> List[Interval]:
+    """Every (start, end) of length duration, with start on the step grid
+    from window_start, during which nobody is busy."""
+    union = merge_intervals([i for person in busy_by_person.values() for i in person])
+    slots = []
+    for gap_start, gap_end in free_gaps(union, window_start, window_end):
+        offset = (gap_start - window_start) % step
+        start = gap_start if not offset else gap_start + (step - offset)
+        while start + duration <= gap_end:
+            slots.append((start, start + duration))
+            start += step
+    return slots
+
+
+# ── FREEBUSY API ──────────────────────────────────────────────────────────────
+def query_busy(service, calendars: Sequence[str], time_min: datetime,
+               time_max: datetime) -> Tuple[Dict[str, List[Interval]], Dict[str, str]]:
+    """Merged busy intervals per calendar id, plus {calendar id: error reason}
+    for calendars whose free/busy could not be read (not shared, not found).
+
+    Calendars in settings.calendar_cache_calendars are read from the local
+    event cache (event_cache.py) when it covers the window. The rest take
+    one freebusy.query per FREEBUSY_MAX_ITEMS calendars, sent together as a
+    single batch request when there is more than one.
+    """
+    ids = list(dict.fromkeys(c.strip() for c in calendars if c and c.strip()))
+    busy: Dict[str, List[Interval]] = {}
+    errors: Dict[str, str] = {}
+
+    # The organizer's own calendars come from the local event cache when it can answer
+    from .event_cache import cached_calendars, get_event_cache
+    cache = get_event_cache()
+    if cache is not None:
+        for cal_id in set(ids) & set(cached_calendars()):
+            local = cache.busy(service, cal_id, time_min, time_max)
+            if local is not None:
+                busy[cal_id] = local
+        ids = [c for c in ids if c not in busy]
+
+    chunks = [ids[i:i + FREEBUSY_MAX_ITEMS] for i in range(0, len(ids), FREEBUSY_MAX_ITEMS)]
+    requests = [service.freebusy().query(body={
+        "timeMin": rfc3339(time_min), "timeMax": rfc3339(time_max), "timeZone": "UTC",
+        "items": [{"id": c} for c in chunk],
+    }) for chunk in chunks]
+
+    responses: List[dict] = []
+    if len(requests) == 1:
+        responses.append(requests[0].execute())
+    elif requests:
+        failures = []
+
+        def collect(request_id, response, exception):
+            if exception is not None:
+                failures.append(exception)
+            else:
+                responses.append(response)
+
+        batch = service.new_batch_http_request(callback=collect)
+        for r in requests:
+            batch.add(r)
+        batch.execute()
+        if failures:
+            raise failures[0]
+
+    for response in responses:
+        for cal_id, info in response.get("calendars", {}).items():
+            if info.get("errors"):
+                errors[cal_id] = ", ".join(e.get("reason", "unknown") for e in info["errors"])
+                continue
+            busy[cal_id] = merge_intervals([(parse_time(b["start"]), parse_time(b["end"]))
+                                            for b in info.get("busy", [])])
+    return busy, errors
+
+
+def work_window(day: datetime) -> Interval:
+    """Working hours (settings.calendar_work_start_hour/_end_hour, UTC) on day."""
+    base = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+    return (base + timedelta(hours=setting("calendar_work_start_hour", 9)),
+            base + timedelta(hours=setting("calendar_work_end_hour", 17)))
+
+
+def find_slots(service, attendees: Sequence[str], date: str, duration_minutes: int,
+               granularity_minutes: Optional[int] = None, include_organizer: bool = True) -> dict:
+    """Common free slots for attendees (and the organizer's primary calendar)
+    within working hours on date (YYYY-MM-DD).
+
+    Returns {"slots": [(start, end)], "busy": {calendar: [intervals]},
+    "errors": {calendar: reason}, "window": (start, end)}.
+    """
+    step = timedelta(minutes=granularity_minutes or setting("calendar_slot_granularity_minutes", 15))
+    window = work_window(datetime.strptime(date, "%Y-%m-%d"))
+    calendars = (["primary"] if include_organizer else []) + list(attendees)
+    busy, errors = query_busy(service, calendars, *window)
+    slots = sweep_slots(busy, window[0], window[1], timedelta(minutes=duration_minutes), step)
+    return {"slots": slots, "busy": busy, "errors": errors, "window": window}
+
@@ -3,53 +3,63 @@ Calendar tools for Google Calendar integration.
 Production-ready with REAL API calls and complete error handling.
 """
 
-import os
-import pickle
+import logging
 from datetime import datetime, timedelta
-from typing import List
+from typing import List, Optional
 from langchain.tools import tool
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from app.core.google_services import Unavailable, get_service
+from .freebusy import find_slots, parse_time
+from .event_cache import cached_calendars, get_event_cache
+from .availability import search as search_availability
 
 
-SCOPES = ['https://www.googleapis.com/auth/calendar']
+logger = logging.getLogger(__name__)
+
+MAX_SLOTS_SHOWN = 16
 
 
 def get_calendar_service():
-    """Get authenticated Google Calendar service with proper error handling."""
+    """Get authenticated Google Calendar service, or None if unavailable.
+
+    Credentials and the built service are cached (per thread) by
+    app/core/google_services.py, so repeated tool calls skip the token
+    unpickle and discovery build. An unavailable connection is remembered
+    for a backoff period and never starts the browser OAuth flow here;
+    authorization happens from Settings → Connections.
+    """
     try:
-        creds = None
-        token_path = 'token_calendar.pickle'
-        
-        if os.path.exists(token_path):
-            with open(token_path, 'rb') as token:
-                creds = pickle.load(token)
-        
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                creds.refresh(Request())
-            else:
-                if not os.path.exists('credentials.json'):
-                    print("⚠️  credentials.json not found")
-                    return None
-                
-                flow = InstalledAppFlow.from_client_secrets_file('credentials.json', SCOPES)
-                creds = flow.run_local_server(port=0)
-            
-            with open(token_path, 'wb') as token:
-                pickle.dump(creds, token)
-        
-        service = build('calendar', 'v3', credentials=creds)
-        return service
+        return get_service('calendar')
+    
+    except Unavailable:
+        # Logged once per state change by the connection manager
+        return None
         
     except Exception as e:
         print(f"Calendar authentication failed: {e}")
         return None
 
 
+def _conflict_note(service, created_event: dict, start_time: str, end_time: str) -> str:
+    """Overlaps with the organizer's other events, read from the local event cache."""
+    cache = get_event_cache()
+    if cache is None or "primary" not in cached_calendars():
+        return ""
+    try:
+        cache.upsert("primary", created_event)
+        clashes = cache.conflicts(service, "primary", parse_time(start_time), parse_time(end_time),
+                                  exclude_id=created_event.get("id", ""))
+    except Exception as e:
+        logger.warning(f"Conflict check skipped: {e}")
+        return ""
+    if not clashes:
+        return ""
+    return (
+        f"\n\n⚠️  Overlaps with {len(clashes)} existing event(s):\n"
+        + "\n".join(f"  • {c['summary']} ({c['start']} - {c['end']} UTC)" for c in clashes[:5])
+    )
+
+
 @tool
 def create_calendar_event(
     title: str,
@@ -120,6 +130,7 @@ def create_calendar_event(
             f"  End: {end_time}\n"
             f"  Attendees: {len(attendees)}\n"
             f"  Link: {created_event.get('htmlLink', 'N/A')}"
+            + _conflict_note(service, created_event, start_time, end_time)
         )
     
     except HttpError as e:
@@ -133,7 +144,8 @@ def create_calendar_event(
 def get_available_time_slots(
     attendees: List[str],
     date: str,  # ISO format: "2024-01-15"
-    duration_minutes: int
+    duration_minutes: int,
+    granularity_minutes: int = 0
 ) -> str:
     """Check calendar availability for given attendees on a specific date.
     
@@ -141,11 +153,16 @@ def get_available_time_slots(
         attendees: List of attendee email addresses
         date: Date in ISO format (YYYY-MM-DD)
         duration_minutes: Duration of meeting in minutes
+        granularity_minutes: Spacing of candidate start times (default: from settings, 15)
     
     Returns:
         String with available time slots or error message
     """
     try:
+        if duration_minutes <= 0:
+            return "❌ duration_minutes must be a positive number of minutes."
+        datetime.strptime(date, "%Y-%m-%d")
+        
         # Get service
         service = get_calendar_service()
         
@@ -160,46 +177,32 @@ def get_available_time_slots(
                 + "\n\nTo check real availability, add credentials.json"
             )
         
-        # ACTUAL API CALL to get calendar events
+        # ONE free/busy round trip for the organizer and every attendee
         try:
-            time_min = f"{date}T00:00:00Z"
-            time_max = f"{date}T23:59:59Z"
-            
-            events_result = service.events().list(
-                calendarId='primary',
-                timeMin=time_min,
-                timeMax=time_max,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            events = events_result.get('items', [])
-            
-            # Calculate busy hours from REAL calendar data
-            busy_hours = set()
-            for event in events:
-                start = event.get('start', {}).get('dateTime', '')
-                if 'T' in start:
-                    hour = int(start.split('T')[1].split(':')[0])
-                    busy_hours.add(hour)
-            
-            # Generate available slots (9 AM - 5 PM)
-            available_slots = []
-            for hour in range(9, 17):
-                if hour not in busy_hours:
-                    available_slots.append(f"{hour:02d}:00")
+            result = find_slots(service, attendees, date, duration_minutes, granularity_minutes or None)
+            slots = result["slots"]
+            window_start, window_end = result["window"]
+            hours = f"{window_start:%H:%M}-{window_end:%H:%M} UTC"
+            checked = len(result["busy"])
+            unknown = (
+                "\n\n⚠️  Free/busy not visible for: "
+                + ", ".join(f"{cal} ({reason})" for cal, reason in result["errors"].items())
+                if result["errors"] else ""
+            )
             
-            if not available_slots:
+            if not slots:
                 return (
-                    f"⚠️  No available slots found on {date}.\n"
-                    f"All working hours (9 AM - 5 PM) are busy.\n"
-                    f"Found {len(events)} existing events."
+                    f"⚠️  No {duration_minutes}-minute slot on {date} ({hours}) "
+                    f"when all {checked} calendar(s) are free." + unknown
                 )
             
+            shown = slots[:MAX_SLOTS_SHOWN]
+            more = f"\n  … and {len(slots) - len(shown)} more" if len(slots) > len(shown) else ""
             return (
-                f"📅 Available time slots for {date}:\n"
-                f"(Based on real calendar data - {len(events)} events found)\n\n"
-                + "\n".join([f"  • {slot}" for slot in available_slots[:8]])
+                f"📅 Available {duration_minutes}-minute slots on {date} ({hours}):\n"
+                f"(Free/busy of {checked} calendar(s) - everyone is free)\n\n"
+                + "\n".join(f"  • {s:%H:%M}-{e:%H:%M}" for s, e in shown)
+                + more + unknown
             )
         
         except HttpError as e:
@@ -218,4 +221,95 @@ def get_available_time_slots(
             f"❌ Error checking availability: {str(e)}\n\n"
             f"Suggested default slots:\n"
             + "\n".join([f"  • {slot}" for slot in default_slots])
-        )
\ No newline at end of file
+        )
+
+
+@tool
+def find_meeting_slots(
+    attendees: List[str],
+    duration_minutes: int,
+    start_date: str = "",  # ISO format: "2024-01-15"; default today
+    days: int = 14,
+    optional_attendees: Optional[List[str]] = None,
+    max_results: int = 5,
+    prefer: str = "best"
+) -> str:
+    """Find the best meeting slots for many attendees over several days in one call.
+    
+    Use this instead of calling get_available_time_slots once per day, e.g. for
+    "first 45-minute slot in the next two weeks that works for these people".
+    
+    Args:
+        attendees: Required attendee email addresses (the organizer is always included)
+        duration_minutes: Duration of meeting in minutes
+        start_date: First day to search in ISO format (YYYY-MM-DD); default today
+        days: Number of days to search (default: 14)
+        optional_attendees: Attendees who should attend if possible (used for ranking)
+        max_results: Number of candidate slots to return (default: 5)
+        prefer: "best" (most optional attendees, fewest back-to-back meetings, then earliest)
+                or "earliest"
+    
+    Returns:
+        String with ranked candidate slots (UTC) or error message
+    """
+    try:
+        if duration_minutes <= 0:
+            return "❌ duration_minutes must be a positive number of minutes."
+        if prefer not in ("best", "earliest"):
+            return "❌ prefer must be 'best' or 'earliest'."
+        
+        service = get_calendar_service()
+        if service is None:
+            return (
+                "⚠️  Google Calendar not configured - cannot search free/busy.\n"
+                "Use get_available_time_slots for default working-hour suggestions."
+            )
+        
+        result = search_availability(
+            service, attendees, duration_minutes, start_date, days,
+            optional_attendees or [], max(1, min(max_results, 20)), prefer,
+        )
+        start, end = result["horizon"]
+        if start >= end:
+            return f"⚠️  The search window ({days} day(s) from {start_date}) is entirely in the past."
+        span = f"{start:%Y-%m-%d} to {end - timedelta(seconds=1):%Y-%m-%d}"
+        unknown = (
+            "\n\n⚠️  Free/busy not visible for: "
+            + ", ".join(f"{cal} ({reason})" for cal, reason in result["errors"].items())
+            if result["errors"] else ""
+        )
+        candidates = result["candidates"]
+        if not candidates:
+            return (
+                f"⚠️  No {duration_minutes}-minute slot between {span} "
+                f"when all required attendees are free." + unknown
+            )
+        
+        lines = []
+        for n, c in enumerate(candidates, 1):
+            notes = []
+            if result["optional"]:
+                notes.append(f"{c.optional_free}/{result['optional']} optional free")
+            if c.back_to_back:
+                notes.append(f"back-to-back for {c.back_to_back}")
+            lines.append(
+                f"  {n}. {c.start:%a %Y-%m-%d %H:%M}-{c.end:%H:%M} UTC"
+                + (f" ({', '.join(notes)})" if notes else "")
+            )
+        return (
+            f"📅 Best {duration_minutes}-minute slots between {span} "
+            f"for {result['required']} required attendee(s):\n\n"
+            + "\n".join(lines)
+            + f"\n\n(Start with #1 unless the user prefers otherwise; "
+            f"ISO start for create_calendar_event: {candidates[0].start:%Y-%m-%dT%H:%M:%S})"
+            + unknown
+        )
+    
+    except ValueError as e:
+        return f"❌ Invalid input: {str(e)}"
+    
+    except HttpError as e:
+        return f"❌ Google Calendar API error: {e.reason if hasattr(e, 'reason') else str(e)}"
+    
+    except Exception as e:
+        return f"❌ Error finding meeting slots: {str(e)}"
@@ -3,7 +3,7 @@ Data agent creation and configuration.
 """
 
 from langchain.agents import create_agent
-from .tools import read_contacts, add_contact, search_contacts, get_all_emails
+from .tools import read_contacts, add_contact, search_contacts, resolve_contact, resolve_contacts, get_all_emails
 
 
 DATA_AGENT_PROMPT = (
@@ -12,6 +12,10 @@ DATA_AGENT_PROMPT = (
     "The CSV contains: email, name, and designation fields. "
     "Use read_contacts to view all contacts or filter by designation. "
     "Use search_contacts to find specific contacts. "
+    "read_contacts and search_contacts return one page with the total count; "
+    "prefer narrowing the query over paging through large results with offset/limit. "
+    "Use resolve_contact when a person's name may be misspelled; it returns ranked candidates in one call. "
+    "Use resolve_contacts to resolve several people or teams at once; ask the user about anything it flags as ambiguous. "
     "Use add_contact to add new contacts. "
     "Use get_all_emails to retrieve all email addresses. "
     "Always provide clear responses about what data was found or modified."
@@ -29,7 +33,7 @@ def create_data_agent(model):
     """
     agent = create_agent(
         model,
-        tools=[read_contacts, add_contact, search_contacts, get_all_emails],
+        tools=[read_contacts, add_contact, search_contacts, resolve_contact, resolve_contacts, get_all_emails],
         system_prompt=DATA_AGENT_PROMPT,
     )
     
@@ -0,0 +1,379 @@
+"""
+In-memory contact store backed by the contacts CSV (or a Parquet file).
+
+The CSV is parsed once (stdlib csv, no pandas) and kept with a hash index
+by lower-cased email and an index by designation. Every read stats the file
+and reloads only when its mtime/size changed, so edits made elsewhere (the
+Contacts tab, a text editor) are picked up without re-parsing on each call.
+Substring search goes through a trigram index (trigram.py) built on the
+first search after each load. One store per path is shared by the data
+tools and the UI.
+
+Writes hold an exclusive lock on "<csv>.lock" (fcntl / msvcrt) so other
+processes see whole rows. add() appends a single line and updates the
+indexes in place; the file is only rewritten when its header lacks a column.
+
+get_contact_store() picks the backend from settings: contacts_backend
+("csv" | "sqlite" | "parquet"), or with "auto" the extension of
+csv_file_path (.db/.sqlite -> contact_store_sqlite.py, .parquet -> Parquet).
+"""
+
+import io
+import os
+import csv
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+from app.core.settings_access import get_settings
+
+from .trigram import TrigramIndex
+from .fuzzy import NameResolver
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = "data/contacts.csv"
+FIELDS = ["email", "name", "designation"]
+INDEX_MIN_ROWS = 2000   # below this a plain scan beats building the trigram index
+
+try:
+    import fcntl
+except ImportError:     # Windows
+    fcntl = None
+    try:
+        import msvcrt
+    except ImportError:
+        msvcrt = None
+
+SAMPLE_CONTACTS = [
+    {"email": "john.doe@example.com", "name": "John Doe", "designation": "Software Engineer"},
+    {"email": "jane.smith@example.com", "name": "Jane Smith", "designation": "Product Manager"},
+]
+
+
+class ContactStore:
+    """Contacts of one CSV file with email / designation indexes.
+
+    Rows are plain dicts keyed by the CSV header; treat them as read-only.
+    """
+
+    appendable = True   # add() may append one row instead of rewriting the file
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fields: List[str] = list(FIELDS)
+        self._lock = threading.RLock()
+        self._sig = None
+        self._rows: List[Dict[str, str]] = []
+        self._by_email: Dict[str, Dict[str, str]] = {}
+        self._by_designation: Dict[str, List[Dict[str, str]]] = {}
+        self._trigrams: Optional[TrigramIndex] = None
+        self._resolver: Optional[NameResolver] = None
+        self.stats = {"loads": 0, "hits": 0}
+
+    # ── LOADING ───────────────────────────────────────────────────────────────
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _fresh(self) -> None:
+        """Reload when the file changed since the last parse."""
+        sig = self._stat()
+        if sig is not None and sig == self._sig:
+            self.stats["hits"] += 1
+            return
+        fields, rows = self._read() if sig is not None else (list(FIELDS), [])
+        self._index(rows, fields)
+        self._sig = sig
+        self.stats["loads"] += 1
+        logger.debug(f"Loaded {len(rows)} contact(s) from {self.path}")
+
+    def _read(self) -> Tuple[List[str], List[Dict[str, str]]]:
+        with open(self.path, "r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            fields = [h.strip() for h in next(reader, None) or FIELDS]
+            return fields, [dict(zip(fields, rec)) for rec in reader if rec]
+
+    def _index(self, rows: List[Dict[str, str]], fields: List[str]) -> None:
+        by_email, by_designation = {}, {}
+        for r in rows:
+            email = r.get("email", "").lower()
+            if email:
+                by_email.setdefault(email, r)
+            by_designation.setdefault(r.get("designation", "").lower(), []).append(r)
+        self.fields = fields
+        self._rows = rows
+        self._by_email = by_email
+        self._by_designation = by_designation
+        self._trigrams = None
+        self._resolver = None
+
+    def invalidate(self) -> None:
+        """Force a reload on the next read (e.g. after writing the file directly)."""
+        with self._lock:
+            self._sig = None
+
+    @contextmanager
+    def _locked(self):
+        """Thread lock plus an exclusive lock file shared with other processes."""
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path + ".lock", "a+b") as lf:
+                if fcntl is not None:
+                    fcntl.flock(lf.fileno(), fcntl.LOCK_EX)
+                elif msvcrt is not None:
+                    lf.seek(0)
+                    msvcrt.locking(lf.fileno(), msvcrt.LK_LOCK, 1)
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(lf.fileno(), fcntl.LOCK_UN)
+                    elif msvcrt is not None:
+                        lf.seek(0)
+                        msvcrt.locking(lf.fileno(), msvcrt.LK_UNLCK, 1)
+
+    def ensure_exists(self) -> None:
+        """Create the file with two sample contacts if it is missing."""
+        if os.path.exists(self.path):
+            return
+        with self._locked():
+            if os.path.exists(self.path):
+                return
+            self._write(SAMPLE_CONTACTS, list(FIELDS))
+
+    # ── READS ─────────────────────────────────────────────────────────────────
+    def all(self) -> List[Dict[str, str]]:
+        with self._lock:
+            self._fresh()
+            return list(self._rows)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._fresh()
+            return len(self._rows)
+
+    def get(self, email: str) -> Optional[Dict[str, str]]:
+        with self._lock:
+            self._fresh()
+            return self._by_email.get((email or "").strip().lower())
+
+    def has(self, email: str) -> bool:
+        return self.get(email) is not None
+
+    def known(self, emails) -> set:
+        """The lower-cased emails among emails that are already stored."""
+        with self._lock:
+            self._fresh()
+            return {e for e in (x.strip().lower() for x in emails) if e in self._by_email}
+
+    def emails(self) -> List[str]:
+        with self._lock:
+            self._fresh()
+            return [r["email"] for r in self._rows if r.get("email")]
+
+    def by_designation(self, term: str) -> List[Dict[str, str]]:
+        """Contacts whose designation contains term (case-insensitive).
+
+        Scans the distinct designations, not the rows.
+        """
+        term = (term or "").lower()
+        with self._lock:
+            self._fresh()
+            keys = [d for d in self._by_designation if term in d]
+            if len(keys) == 1:
+                return list(self._by_designation[keys[0]])
+            keys = set(keys)
+            return [r for r in self._rows if r.get("designation", "").lower() in keys]
+
+    def search(self, query: str) -> List[Dict[str, str]]:
+        """Contacts whose name, email or designation contains query.
+
+        A "name:", "email:" or "designation:" prefix limits the search to that field.
+        """
+        field, q = self.parse_query(query)
+        with self._lock:
+            self._fresh()
+            if len(self._rows) < INDEX_MIN_ROWS:
+                q = q.lower()
+                return [r for r in self._rows
+                        if any(q in r.get(f, "").lower() for f in ([field] if field else FIELDS))]
+            if self._trigrams is None:
+                self._trigrams = TrigramIndex(self._rows, FIELDS)
+            return [self._rows[i] for i in self._trigrams.search(q, field)]
+
+    def resolve(self, query: str, k: int = 5) -> List[Tuple[float, Dict[str, str]]]:
+        """Top-k (score, contact) for a possibly misspelled name or email (fuzzy.py)."""
+        with self._lock:
+            self._fresh()
+            if "@" in (query or ""):
+                hit = self._by_email.get(query.strip().lower())
+                if hit is not None:
+                    return [(1.0, hit)]
+            if self._resolver is None:
+                self._resolver = NameResolver(self._rows)
+            return [(score, self._rows[n]) for score, n in self._resolver.resolve(query, k)]
+
+    @staticmethod
+    def parse_query(query: str) -> Tuple[Optional[str], str]:
+        """("name", "jon") for "name:jon"; (None, query) without a known field prefix."""
+        query = (query or "").strip()
+        head, sep, rest = query.partition(":")
+        if sep and head.strip().lower() in FIELDS:
+            return head.strip().lower(), rest.strip()
+        return None, query
+
+    # ── WRITES ────────────────────────────────────────────────────────────────
+    def add(self, email: str, name: str, designation: str) -> bool:
+        """Add a contact; False if the email is already present.
+
+        Appends one CSV line; the whole file is rewritten only if it is
+        missing or its header lacks one of FIELDS.
+        """
+        row = {"email": email.strip(), "name": name.strip(), "designation": designation.strip()}
+        with self._locked():
+            self._fresh()
+            if row["email"].lower() in self._by_email:
+                return False
+            if self._sig is None or not self.appendable or any(f not in self.fields for f in FIELDS):
+                fields = self.fields + [f for f in FIELDS if f not in self.fields]
+                self._write(self._rows + [row], fields)
+                return True
+            self._append(row)
+            return True
+
+    def add_many(self, rows: List[Dict[str, str]]) -> Tuple[int, int]:
+        """Add rows not already present (by email) in one atomic rewrite.
+
+        Returns (added, duplicates); duplicates include repeats within rows.
+        """
+        with self._locked():
+            self._fresh()
+            seen, new = set(self._by_email), []
+            for r in rows:
+                email = (r.get("email") or "").strip()
+                if not email or email.lower() in seen:
+                    continue
+                seen.add(email.lower())
+                new.append({"email": email, "name": (r.get("name") or "").strip(),
+                            "designation": (r.get("designation") or "").strip()})
+            if new:
+                fields = self.fields + [f for f in FIELDS if f not in self.fields]
+                self._write(self._rows + new, fields)
+            return len(new), len(rows) - len(new)
+
+    def _append(self, row: Dict[str, str]) -> None:
+        row = {f: row.get(f, "") for f in self.fields}
+        buf = io.StringIO()
+        csv.writer(buf, lineterminator="\n").writerow([row[f] for f in self.fields])
+        with open(self.path, "rb+") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell():
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    f.write(b"\n")
+            f.write(buf.getvalue().encode("utf-8"))
+        self._rows.append(row)
+        email = row["email"].lower()
+        if email:
+            self._by_email.setdefault(email, row)
+        self._by_designation.setdefault(row["designation"].lower(), []).append(row)
+        if self._trigrams is not None:
+            self._trigrams.add(row)
+        if self._resolver is not None:
+            self._resolver.add(row)
+        self._sig = self._stat()
+
+    def replace(self, rows: List[Dict[str, str]], fields: Optional[List[str]] = None) -> None:
+        """Rewrite the whole file (the Contacts tab's Save)."""
+        with self._locked():
+            fields = list(fields or self.fields)
+            clean = [{f: ("" if r.get(f) is None else str(r.get(f))).strip() for f in fields} for r in rows]
+            self._write(clean, fields)
+
+    def _write(self, rows: List[Dict[str, str]], fields: List[str]) -> None:
+        """Atomic full rewrite (temp file + rename); call under _locked()."""
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        self._write_file(tmp, rows, fields)
+        os.replace(tmp, self.path)
+        self._index(list(rows), list(fields))
+        self._sig = self._stat()
+
+    def _write_file(self, tmp: str, rows: List[Dict[str, str]], fields: List[str]) -> None:
+        with open(tmp, "w", encoding="utf-8", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=fields, extrasaction="ignore", lineterminator="\n")
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+class ParquetContactStore(ContactStore):
+    """Contacts in a Parquet file (needs pyarrow). Same in-memory indexes as
+    the CSV store; emails() reads only the email column when nothing is loaded.
+    Parquet cannot be appended to, so every write rewrites the file."""
+
+    appendable = False
+
+    def _read(self) -> Tuple[List[str], List[Dict[str, str]]]:
+        import pyarrow.parquet as pq
+        table = pq.read_table(self.path)
+        cols = {f: ["" if v is None else str(v) for v in table.column(f).to_pylist()] for f in table.column_names}
+        fields = list(table.column_names)
+        return fields, [dict(zip(fields, vals)) for vals in zip(*(cols[f] for f in fields))]
+
+    def _write_file(self, tmp: str, rows: List[Dict[str, str]], fields: List[str]) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        table = pa.table({f: pa.array([r.get(f, "") or "" for r in rows], pa.string()) for f in fields})
+        pq.write_table(table, tmp)
+
+    def emails(self) -> List[str]:
+        with self._lock:
+            sig = self._stat()
+            if sig is None or sig == self._sig:
+                return super().emails()
+            import pyarrow.parquet as pq
+            column = pq.read_table(self.path, columns=["email"]).column("email").to_pylist()
+            return [e for e in column if e]
+
+
+_stores: Dict[tuple, ContactStore] = {}
+_stores_lock = threading.Lock()
+
+BACKENDS = ("csv", "sqlite", "parquet")
+
+
+def backend_for(path: str, backend: Optional[str] = None) -> str:
+    """Explicit backend, or one implied by the file extension for "auto"."""
+    backend = (backend or "auto").lower()
+    if backend in BACKENDS:
+        return backend
+    if backend != "auto":
+        logger.warning(f"Unknown contacts backend '{backend}', using the file extension")
+    ext = os.path.splitext(path)[1].lower()
+    return {".db": "sqlite", ".sqlite": "sqlite", ".sqlite3": "sqlite", ".parquet": "parquet"}.get(ext, "csv")
+
+
+def open_store(path: str, backend: Optional[str] = None):
+    """A new (unshared) store for path; see get_contact_store for the shared one."""
+    kind = backend_for(path, backend)
+    if kind == "sqlite":
+        from .contact_store_sqlite import SqliteContactStore
+        return SqliteContactStore(path)
+    return ParquetContactStore(path) if kind == "parquet" else ContactStore(path)
+
+
+def get_contact_store(path: Optional[str] = None, backend: Optional[str] = None):
+    """Process-wide store for path (default settings.csv_file_path) and its backend."""
+    cfg = get_settings()
+    path = os.path.normpath(path or getattr(cfg, "csv_file_path", DEFAULT_PATH))
+    kind = backend_for(path, backend or getattr(cfg, "contacts_backend", "auto"))
+    with _stores_lock:
+        store = _stores.get((path, kind))
+        if store is None:
+            store = _stores[(path, kind)] = open_store(path, kind)
+        return store
@@ -0,0 +1,241 @@
+"""
+SQLite contact store (contacts_backend = "sqlite" or a .db csv_file_path).
+
+Contacts live in a table with a NOCASE unique index on email and an index
+on designation. Substring search uses an external-content FTS5 table with
+the trigram tokenizer, kept in sync by triggers; queries shorter than three
+characters, or SQLite builds without trigram support, fall back to LIKE.
+Same interface as ContactStore, so the data tools and UI work unchanged.
+"""
+
+import os
+import sqlite3
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from .contact_store import FIELDS, SAMPLE_CONTACTS, ContactStore
+from .fuzzy import NameResolver
+
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (
+    "id" INTEGER PRIMARY KEY, "email" TEXT NOT NULL,
+    "name" TEXT NOT NULL DEFAULT '', "designation" TEXT NOT NULL DEFAULT ''
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_contacts_email       ON contacts("email" COLLATE NOCASE);
+CREATE INDEX        IF NOT EXISTS idx_contacts_designation ON contacts("designation" COLLATE NOCASE);
+"""
+
+FTS_TABLE = """
+CREATE VIRTUAL TABLE IF NOT EXISTS contacts_fts USING fts5(
+    "email", "name", "designation", content='contacts', content_rowid='id', tokenize='trigram'
+)"""
+
+_FTS_DEL = """INSERT INTO contacts_fts(contacts_fts, rowid, "email", "name", "designation")
+    VALUES ('delete', OLD."id", OLD."email", OLD."name", OLD."designation");"""
+_FTS_INS = """INSERT INTO contacts_fts(rowid, "email", "name", "designation")
+    VALUES (NEW."id", NEW."email", NEW."name", NEW."designation");"""
+# Keep contacts_fts in sync; replace() drops ai/ad around a bulk load and rebuilds instead
+FTS_TRIGGERS = {
+    "trg_contacts_ai": f"AFTER INSERT ON contacts BEGIN {_FTS_INS} END",
+    "trg_contacts_ad": f"AFTER DELETE ON contacts BEGIN {_FTS_DEL} END",
+    "trg_contacts_au": f"AFTER UPDATE ON contacts BEGIN {_FTS_DEL} {_FTS_INS} END",
+}
+
+
+def _create_triggers(db: sqlite3.Connection, names=FTS_TRIGGERS) -> None:
+    for name in names:
+        db.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {FTS_TRIGGERS[name]}")
+
+
+_COLS = ", ".join(f'"{f}"' for f in FIELDS)
+
+
+def _like(term: str) -> str:
+    return "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+class SqliteContactStore:
+    """Contacts in SQLite; one shared connection guarded by a lock (WAL mode)."""
+
+    parse_query = staticmethod(ContactStore.parse_query)
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fields: List[str] = list(FIELDS)
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._fts = False
+        self._resolver: Optional[NameResolver] = None
+        self._resolver_rows: List[Dict[str, str]] = []
+        self._resolver_version = None
+        self.stats = {"queries": 0}
+
+    # ── CONNECTION ────────────────────────────────────────────────────────────
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is not None:
+            return self._conn
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        try:
+            conn.execute(FTS_TABLE)
+            _create_triggers(conn)
+            self._fts = True
+        except sqlite3.OperationalError as e:   # no FTS5 / trigram tokenizer in this build
+            logger.warning(f"Contacts FTS5 trigram index unavailable, using LIKE: {e}")
+        self._conn = conn
+        return conn
+
+    def _select(self, where: str = "", params: tuple = (), limit: Optional[int] = None) -> List[Dict[str, str]]:
+        with self._lock:
+            self.stats["queries"] += 1
+            sql = f"SELECT {_COLS} FROM contacts" + (f" WHERE {where}" if where else "") + ' ORDER BY "id"'
+            if limit:
+                sql += f" LIMIT {int(limit)}"
+            return [dict(r) for r in self._db().execute(sql, params)]
+
+    def _version(self):
+        """Changes whenever any connection (any process) commits a write."""
+        with self._lock:
+            db = self._db()
+            return (db.execute("PRAGMA data_version").fetchone()[0], db.total_changes)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._resolver = None
+
+    def ensure_exists(self) -> None:
+        """Create the database, seeded with two sample contacts if it is new."""
+        with self._lock:
+            new = not os.path.exists(self.path)
+            self._db()
+            if new:
+                self.add_many(SAMPLE_CONTACTS)
+
+    # ── READS ─────────────────────────────────────────────────────────────────
+    def all(self) -> List[Dict[str, str]]:
+        return self._select()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db().execute("SELECT COUNT(*) FROM contacts").fetchone()[0]
+
+    def get(self, email: str) -> Optional[Dict[str, str]]:
+        rows = self._select('"email" = ? COLLATE NOCASE', ((email or "").strip(),), limit=1)
+        return rows[0] if rows else None
+
+    def has(self, email: str) -> bool:
+        return self.get(email) is not None
+
+    def known(self, emails) -> set:
+        keys = list({e.strip().lower() for e in emails})
+        out = set()
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                part = keys[i:i + 500]
+                sql = f'SELECT lower("email") FROM contacts WHERE "email" COLLATE NOCASE IN ({", ".join("?" * len(part))})'
+                out.update(r[0] for r in self._db().execute(sql, part))
+        return out
+
+    def emails(self) -> List[str]:
+        with self._lock:
+            return [r[0] for r in self._db().execute('SELECT "email" FROM contacts WHERE "email" != \'\' ORDER BY "id"')]
+
+    def by_designation(self, term: str) -> List[Dict[str, str]]:
+        return self._match((term or "").strip(), "designation")
+
+    def search(self, query: str) -> List[Dict[str, str]]:
+        """Substring search over name/email/designation ("name:"-style prefixes allowed)."""
+        field, q = self.parse_query(query)
+        return self._match(q, field)
+
+    def _match(self, q: str, field: Optional[str]) -> List[Dict[str, str]]:
+        if not q:
+            return self.all()
+        fields = [field] if field else FIELDS
+        self._db()
+        if self._fts and len(q) >= 3:
+            phrase = '"' + q.replace('"', '""') + '"'
+            expr = f"{field} : {phrase}" if field else phrase
+            with self._lock:
+                self.stats["queries"] += 1
+                sql = ('SELECT c."email", c."name", c."designation" FROM contacts_fts '
+                       'JOIN contacts c ON c."id" = contacts_fts.rowid WHERE contacts_fts MATCH ? ORDER BY c."id"')
+                return [dict(r) for r in self._db().execute(sql, (expr,))]
+        where = " OR ".join(f'"{f}" LIKE ? ESCAPE \'\\\'' for f in fields)
+        return self._select(where, (_like(q),) * len(fields))
+
+    def resolve(self, query: str, k: int = 5) -> List[Tuple[float, Dict[str, str]]]:
+        """Fuzzy top-k (fuzzy.py), with the resolver rebuilt when the database changes."""
+        if "@" in (query or ""):
+            hit = self.get(query)
+            if hit is not None:
+                return [(1.0, hit)]
+        with self._lock:
+            version = self._version()
+            if self._resolver is None or version != self._resolver_version:
+                self._resolver_rows = self.all()
+                self._resolver = NameResolver(self._resolver_rows)
+                self._resolver_version = self._version()
+            rows = self._resolver_rows
+            return [(score, rows[n]) for score, n in self._resolver.resolve(query, k)]
+
+    # ── WRITES ────────────────────────────────────────────────────────────────
+    def add(self, email: str, name: str, designation: str) -> bool:
+        """Insert one contact; False if the email (case-insensitive) exists."""
+        with self._lock:
+            cur = self._db().execute(
+                f"INSERT OR IGNORE INTO contacts ({_COLS}) VALUES (?, ?, ?)",
+                (email.strip(), name.strip(), designation.strip()),
+            )
+            return cur.rowcount == 1
+
+    def add_many(self, rows: List[Dict[str, str]]) -> Tuple[int, int]:
+        """Insert rows in one transaction. Returns (added, duplicates)."""
+        vals = [((r.get("email") or "").strip(), (r.get("name") or "").strip(),
+                 (r.get("designation") or "").strip()) for r in rows]
+        vals = [v for v in vals if v[0]]
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                added = db.executemany(f"INSERT OR IGNORE INTO contacts ({_COLS}) VALUES (?, ?, ?)", vals).rowcount
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
+        return added, len(rows) - added
+
+    def replace(self, rows: List[Dict[str, str]], fields: Optional[List[str]] = None) -> None:
+        """Replace every contact in one transaction (the Contacts tab's Save).
+
+        The FTS index is rebuilt once afterwards instead of per row by triggers.
+        """
+        dropped = [f for f in (fields or []) if f not in FIELDS]
+        if dropped:
+            logger.warning(f"SQLite contacts keep only {FIELDS}; ignoring column(s) {dropped}")
+        vals = [tuple(("" if r.get(f) is None else str(r.get(f))).strip() for f in FIELDS) for r in rows]
+        bulk = ("trg_contacts_ai", "trg_contacts_ad")
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                if self._fts:
+                    for name in bulk:
+                        db.execute(f"DROP TRIGGER IF EXISTS {name}")
+                db.execute("DELETE FROM contacts")
+                db.executemany(f"INSERT OR IGNORE INTO contacts ({_COLS}) VALUES (?, ?, ?)", [v for v in vals if v[0]])
+                if self._fts:
+                    db.execute("INSERT INTO contacts_fts(contacts_fts) VALUES ('rebuild')")
+                    _create_triggers(db, bulk)
+                db.execute("COMMIT")
+            except Exception:
+                db.execute("ROLLBACK")
+                raise
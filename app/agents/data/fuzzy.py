@@ -0,0 +1,167 @@
+"""
+Fuzzy contact name resolution ("jon doe" -> John Doe).
+
+Names and email local parts are split into tokens; the index works on the
+distinct token vocabulary, which is far smaller than the row count:
+
+- a padded-trigram index over the vocabulary finds misspellings,
+- a Soundex index finds same-sounding tokens (jon / john),
+- candidates are re-scored with a bounded Levenshtein ratio.
+
+Candidate rows are those matching every query token (or, when fewer than k
+do, the most selective token). Each gets the mean, over query tokens, of the
+best similarity among its own tokens; the top-k come back with their scores.
+"""
+
+import re
+import heapq
+from array import array
+from collections import Counter
+from typing import Dict, List, Tuple
+
+
+MIN_SIMILARITY = 0.6    # token pairs below this do not count as a match
+TOKEN_CANDIDATES = 40   # vocabulary tokens re-scored per query token
+MAX_ROWS_SCANNED = 50_000
+
+_TOKEN = re.compile(r"[a-z]+|[0-9]+")
+_SOUNDEX = str.maketrans("bfpvcgjkqsxzdtlmnr", "111122222222334556", "aeiouyhw")
+
+
+def tokens(text: str) -> List[str]:
+    return _TOKEN.findall((text or "").lower())
+
+
+def soundex(token: str) -> str:
+    if not token or not token[0].isalpha():
+        return token
+    digits = token.translate(_SOUNDEX)
+    code = [d for i, d in enumerate(digits) if d.isdigit() and (i == 0 or d != digits[i - 1])]
+    if code and token[0].translate(_SOUNDEX) == code[0]:
+        code = code[1:]
+    return (token[0] + "".join(code) + "000")[:4]
+
+
+def _padded_grams(token: str) -> set:
+    t = f"${token}$"
+    return {t[i:i + 3] for i in range(len(t) - 2)}
+
+
+def similarity(a: str, b: str, cutoff: float = MIN_SIMILARITY) -> float:
+    """1 - levenshtein / longer length; 0.0 as soon as it must fall below cutoff."""
+    if a == b:
+        return 1.0
+    longer = max(len(a), len(b))
+    budget = int((1 - cutoff) * longer)
+    if abs(len(a) - len(b)) > budget:
+        return 0.0
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        if min(cur) > budget:
+            return 0.0
+        prev = cur
+    dist = prev[-1]
+    return 1 - dist / longer if dist <= budget else 0.0
+
+
+class NameResolver:
+    """Token / trigram / phonetic index over contact names and email local parts."""
+
+    def __init__(self, rows: List[dict]):
+        self.rows = rows
+        self._vocab: Dict[str, int] = {}
+        self._words: List[str] = []
+        self._postings: List[array] = []          # token id -> row numbers
+        self._row_tokens: List[Tuple[int, ...]] = []
+        self._grams: Dict[str, List[int]] = {}    # padded trigram -> token ids
+        self._sounds: Dict[str, List[int]] = {}   # soundex -> token ids
+        for r in rows:
+            self.add(r)
+
+    def _token_id(self, tok: str) -> int:
+        tid = self._vocab.get(tok)
+        if tid is None:
+            tid = self._vocab[tok] = len(self._words)
+            self._words.append(tok)
+            self._postings.append(array("I"))
+            for g in _padded_grams(tok):
+                self._grams.setdefault(g, []).append(tid)
+            self._sounds.setdefault(soundex(tok), []).append(tid)
+        return tid
+
+    def add(self, row: dict) -> None:
+        """Index row (the next row number, i.e. already last in self.rows)."""
+        n = len(self._row_tokens)
+        local = (row.get("email") or "").split("@")[0]
+        ids = tuple(dict.fromkeys(self._token_id(t) for t in tokens(row.get("name", "")) + tokens(local)))
+        for tid in ids:
+            self._postings[tid].append(n)
+        self._row_tokens.append(ids)
+
+    # ── QUERY ─────────────────────────────────────────────────────────────────
+    def _candidates(self, tok: str) -> Dict[int, float]:
+        """{token id: similarity} for vocabulary tokens close to tok."""
+        exact = self._vocab.get(tok)
+        out = {} if exact is None else {exact: 1.0}
+        qgrams = _padded_grams(tok)
+        shared = Counter()
+        for g in qgrams:
+            shared.update(self._grams.get(g, ()))
+        words = self._words
+        dice = lambda tid: shared[tid] / (len(qgrams) + len(words[tid]))
+        pool = set(heapq.nlargest(TOKEN_CANDIDATES, shared, key=dice))
+        pool.update(self._sounds.get(soundex(tok), ())[:TOKEN_CANDIDATES])
+        for tid in pool:
+            if tid in out:
+                continue
+            word = words[tid]
+            s = similarity(tok, word)
+            if soundex(word) == soundex(tok):
+                s = max(s, 0.7)
+            if word.startswith(tok) and len(tok) >= 3:
+                s = max(s, 0.7)
+            if s >= MIN_SIMILARITY:
+                out[tid] = s
+        return out
+
+    def _rows_of(self, cand: Dict[int, float]) -> set:
+        rows = set()
+        for tid in sorted(cand, key=cand.get, reverse=True):
+            rows.update(self._postings[tid])
+            if len(rows) >= MAX_ROWS_SCANNED:
+                break
+        return rows
+
+    def resolve(self, query: str, k: int = 5) -> List[Tuple[float, int]]:
+        """Top-k (score, row number), best first."""
+        qtoks = list(dict.fromkeys(tokens(query)))
+        if not qtoks:
+            return []
+        cands = [self._candidates(t) for t in qtoks]
+        matched = sorted((self._rows_of(c) for c in cands if c), key=len)
+        if not matched:
+            return []
+        # Rows matching every query token first; fall back to the most selective token's rows
+        rows = matched[0]
+        for other in matched[1:]:
+            both = rows & other
+            if len(both) < k:
+                break
+            rows = both
+        n_tokens = len(cands)
+        scored = []
+        for n in rows:
+            rt = self._row_tokens[n]
+            total = 0.0
+            for c in cands:
+                best = 0.0
+                for t in rt:
+                    s = c.get(t)
+                    if s is not None and s > best:
+                        best = s
+                total += best
+            scored.append((round(total / n_tokens, 3), -n))
+        return [(s, -neg) for s, neg in heapq.nlargest(k, scored)]
@@ -0,0 +1,207 @@
+"""
+Bulk contact import from CSV or vCard (.vcf).
+
+The source is streamed and handled in chunks: each chunk is validated with
+the email agent's validate_email and de-duplicated (within the import and
+against the contact store's email index). Accepted rows are committed with a
+single atomic rewrite of the contacts CSV at the end, so a failed import
+leaves the file untouched.
+
+    python -m app.agents.data.importer people.csv
+    python -m app.agents.data.importer team.vcf --dry-run
+"""
+
+import io
+import os
+import csv
+import sys
+import time
+import argparse
+import logging
+from typing import Callable, Dict, IO, Iterator, List, Optional, Union
+
+from app.agents.email.tools import validate_email
+from .contact_store import ContactStore, get_contact_store
+
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 5000
+MAX_ERRORS = 20     # invalid rows kept as examples in the report
+
+HEADER_ALIASES = {
+    "e-mail": "email", "email address": "email", "mail": "email",
+    "full name": "name", "display name": "name",
+    "title": "designation", "job title": "designation", "role": "designation",
+}
+
+
+# ── READERS ───────────────────────────────────────────────────────────────────
+def _text(source: Union[str, IO]) -> IO:
+    """Text stream for a path, a text file or a binary file (e.g. an upload)."""
+    if isinstance(source, str):
+        return open(source, "r", encoding="utf-8-sig", newline="")
+    if isinstance(source, io.TextIOBase):
+        return source
+    return io.TextIOWrapper(source, encoding="utf-8-sig", newline="")
+
+
+def iter_csv(stream: IO) -> Iterator[Dict[str, str]]:
+    reader = csv.reader(stream)
+    header = next(reader, None) or []
+    keys = [HEADER_ALIASES.get(h.strip().lower(), h.strip().lower()) for h in header]
+    for rec in reader:
+        if rec:
+            yield dict(zip(keys, rec))
+
+
+def _unfold(stream: IO) -> Iterator[str]:
+    """vCard lines with folded continuations (leading space/tab) joined."""
+    pending = None
+    for line in stream:
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and pending is not None:
+            pending += line[1:]
+            continue
+        if pending is not None:
+            yield pending
+        pending = line
+    if pending is not None:
+        yield pending
+
+
+def iter_vcard(stream: IO) -> Iterator[Dict[str, str]]:
+    """One row per VCARD: FN (or N), first EMAIL, TITLE (or ROLE)."""
+    card = None
+    for line in _unfold(stream):
+        prop, sep, value = line.partition(":")
+        if not sep:
+            continue
+        name = prop.split(";")[0].split(".")[-1].upper()
+        if name == "BEGIN" and value.strip().upper() == "VCARD":
+            card = {}
+        elif name == "END" and card is not None:
+            yield {"email": card.get("EMAIL", ""),
+                   "name": card.get("FN") or card.get("N", ""),
+                   "designation": card.get("TITLE") or card.get("ROLE", "")}
+            card = None
+        elif card is not None and name in ("FN", "N", "EMAIL", "TITLE", "ROLE") and name not in card:
+            value = value.replace("\\,", ",").replace("\\;", ";").strip()
+            if name == "N":   # Family;Given;Additional;Prefix;Suffix
+                parts = value.split(";")
+                value = " ".join(p for p in (parts[1:2] + parts[:1]) if p)
+            card[name] = value
+
+
+def _detect(source: Union[str, IO], fmt: Optional[str]) -> str:
+    if fmt:
+        return fmt.lower()
+    name = source if isinstance(source, str) else getattr(source, "name", "")
+    return "vcard" if str(name).lower().endswith((".vcf", ".vcard")) else "csv"
+
+
+def _chunks(rows: Iterator[Dict[str, str]], size: int) -> Iterator[List[Dict[str, str]]]:
+    chunk = []
+    for r in rows:
+        chunk.append(r)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ── IMPORT ────────────────────────────────────────────────────────────────────
+def import_contacts(
+    source: Union[str, IO],
+    fmt: Optional[str] = None,
+    store: Optional[ContactStore] = None,
+    chunk_size: int = CHUNK_SIZE,
+    dry_run: bool = False,
+    progress: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """Import contacts from a CSV/vCard path or file object.
+
+    Returns {"read", "added", "invalid", "duplicates", "seconds", "rows_per_sec",
+    "errors"}; progress(report) is called after every chunk.
+    """
+    store = store or get_contact_store()
+    kind = _detect(source, fmt)
+    report = {"read": 0, "added": 0, "invalid": 0, "duplicates": 0, "errors": []}
+    t0 = time.perf_counter()
+    stream = _text(source)
+    accepted, seen = [], set()
+    try:
+        rows = iter_vcard(stream) if kind == "vcard" else iter_csv(stream)
+        for chunk in _chunks(rows, max(1, chunk_size)):
+            valid = []
+            for r in chunk:
+                report["read"] += 1
+                email = (r.get("email") or "").strip()
+                if not email or not validate_email(email):
+                    report["invalid"] += 1
+                    if len(report["errors"]) < MAX_ERRORS:
+                        report["errors"].append(f"row {report['read']}: invalid email '{email}'")
+                    continue
+                valid.append((email.lower(), email, r))
+            known = store.known(k for k, _, _ in valid)
+            for key, email, r in valid:
+                if key in seen or key in known:
+                    report["duplicates"] += 1
+                    continue
+                seen.add(key)
+                accepted.append({"email": email, "name": r.get("name", ""), "designation": r.get("designation", "")})
+            if progress:
+                progress(_rate(report, t0))
+    finally:
+        if isinstance(source, str):
+            stream.close()
+        elif not isinstance(source, io.TextIOBase):
+            stream.detach()    # leave the caller's binary file open
+    if accepted and not dry_run:
+        added, dupes = store.add_many(accepted)   # dupes: rows added elsewhere meanwhile
+        report["added"], report["duplicates"] = added, report["duplicates"] + dupes
+    elif dry_run:
+        report["added"] = len(accepted)
+    report = _rate(report, t0)
+    logger.info(
+        f"Contact import ({kind}{', dry run' if dry_run else ''}): {report['read']} read, "
+        f"{report['added']} added, {report['duplicates']} duplicate, {report['invalid']} invalid "
+        f"in {report['seconds']:.2f}s ({report['rows_per_sec']:.0f} rows/s)"
+    )
+    return report
+
+
+def _rate(report: dict, t0: float) -> dict:
+    secs = time.perf_counter() - t0
+    return {**report, "seconds": secs, "rows_per_sec": report["read"] / secs if secs > 0 else 0.0}
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m app.agents.data.importer",
+                                 description="Bulk-import contacts from CSV or vCard.")
+    ap.add_argument("file", help="CSV (email,name,designation) or .vcf file")
+    ap.add_argument("--format", choices=["csv", "vcard"], help="override detection by extension")
+    ap.add_argument("--contacts", help="contacts file to import into (default: settings.csv_file_path)")
+    ap.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    ap.add_argument("--dry-run", action="store_true", help="validate and count without writing")
+    args = ap.parse_args(argv)
+    if not os.path.exists(args.file):
+        print(f"❌ File not found: {args.file}", file=sys.stderr)
+        return 1
+
+    def show(r):
+        print(f"\r  {r['read']:,} rows read ({r['rows_per_sec']:,.0f} rows/s)", end="", flush=True)
+
+    r = import_contacts(args.file, args.format, get_contact_store(args.contacts),
+                        args.chunk_size, args.dry_run, show)
+    print(f"\n{'Would add' if args.dry_run else 'Added'} {r['added']:,} · duplicates {r['duplicates']:,} · "
+          f"invalid {r['invalid']:,} · {r['seconds']:.2f}s ({r['rows_per_sec']:,.0f} rows/s)")
+    for e in r["errors"]:
+        print(f"  {e}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
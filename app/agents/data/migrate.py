@@ -0,0 +1,54 @@
+"""
+Convert the contacts file between backends (CSV, SQLite/FTS5, Parquet).
+
+    python -m app.agents.data.migrate data/contacts.db
+    python -m app.agents.data.migrate data/contacts.parquet --source data/contacts.csv
+
+The destination backend follows its extension (or --to). The source is left
+untouched; point CSV_FILE_PATH (or CONTACTS_BACKEND) at the new file afterwards.
+"""
+
+import os
+import sys
+import time
+import argparse
+from typing import List, Optional
+
+from .contact_store import BACKENDS, backend_for, get_contact_store, open_store
+
+
+def migrate(source: str, dest: str, to: Optional[str] = None, source_backend: Optional[str] = None) -> dict:
+    """Copy every contact from source to dest (dest is replaced). Returns counts and timing."""
+    t0 = time.perf_counter()
+    src = open_store(source, source_backend)
+    rows = src.all()
+    dst = open_store(dest, to)
+    dst.replace(rows, list(src.fields))
+    return {"rows": len(rows), "written": len(dst), "from": backend_for(source, source_backend),
+            "to": backend_for(dest, to), "seconds": time.perf_counter() - t0}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m app.agents.data.migrate",
+                                 description="Convert the contacts file to another backend.")
+    ap.add_argument("dest", help="new contacts file, e.g. data/contacts.db or data/contacts.parquet")
+    ap.add_argument("--to", choices=BACKENDS, help="destination backend (default: by extension)")
+    ap.add_argument("--source", help="existing contacts file (default: settings.csv_file_path)")
+    args = ap.parse_args(argv)
+    source = args.source or get_contact_store().path
+    if not os.path.exists(source):
+        print(f"❌ Source not found: {source}", file=sys.stderr)
+        return 1
+    if os.path.abspath(source) == os.path.abspath(args.dest):
+        print("❌ Source and destination are the same file", file=sys.stderr)
+        return 1
+    r = migrate(source, args.dest, args.to)
+    print(f"✅ {r['rows']:,} contacts {r['from']} → {r['to']} ({args.dest}, {r['written']:,} rows) in {r['seconds']:.2f}s")
+    if r["written"] != r["rows"]:
+        print(f"   {r['rows'] - r['written']:,} row(s) skipped (blank or duplicate email)")
+    print(f"   To use it: CSV_FILE_PATH={args.dest}" + ("" if args.to is None else f" CONTACTS_BACKEND={args.to}"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,57 +1,99 @@
 """
-Data tools for CSV file operations.
+Data tools for contact operations.
+Everything goes through the shared contact store (CSV, SQLite or Parquet,
+chosen by settings.csv_file_path / settings.contacts_backend).
 """
 
-import os
-import pandas as pd
-from typing import List, Dict, Optional
+import re
+import json
+from typing import Callable, List, Dict, Optional
 from langchain.tools import tool
+from .contact_store import ContactStore, get_contact_store
 
+# Listing tools return one page; the char budget (~4 chars/token) caps what reaches the LLM
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+MAX_OUTPUT_CHARS = 6000
 
-CSV_FILE_PATH = "data/contacts.csv"
+# resolve_contacts: a top match is "resolved" when it scores at least RESOLVED_SCORE
+# and beats the runner-up by AMBIGUITY_MARGIN; otherwise candidates are returned
+RESOLVED_SCORE = 0.85
+AMBIGUITY_MARGIN = 0.1
+MAX_GROUP_EMAILS = 50
+_GROUP_WORDS = re.compile(r"\b(?:the|all|every|everyone|team|teams|group|dept|department|folks|people)\b", re.I)
+
+
+def _store() -> ContactStore:
+    return get_contact_store()
 
 
 def ensure_csv_exists():
-    """Ensure CSV file and directory exist."""
-    os.makedirs(os.path.dirname(CSV_FILE_PATH), exist_ok=True)
-    
-    if not os.path.exists(CSV_FILE_PATH):
-        # Create with sample data
-        df = pd.DataFrame({
-            'email': ['john.doe@example.com', 'jane.smith@example.com'],
-            'name': ['John Doe', 'Jane Smith'],
-            'designation': ['Software Engineer', 'Product Manager']
-        })
-        df.to_csv(CSV_FILE_PATH, index=False)
+    """Ensure the contacts file (or database) and its directory exist."""
+    _store().ensure_exists()
+
+
+def _line(r: Dict[str, str]) -> str:
+    return f"- {r.get('name', '')} ({r.get('email', '')}) - {r.get('designation', '')}\n"
+
+
+def _page(rows: List[Dict[str, str]], header: str, offset: int, limit: int,
+          next_call: Callable[[int, int], str]) -> str:
+    """One page of rows under MAX_OUTPUT_CHARS, with the total and a continuation hint.
+
+    header is the "Found N contact(s)..." prefix; next_call(offset, limit)
+    spells out the follow-up tool call.
+    """
+    total = len(rows)
+    offset = max(0, int(offset or 0))
+    limit = max(1, min(int(limit or DEFAULT_LIMIT), MAX_LIMIT))
+    if offset >= total:
+        return f"{header}: none left at offset {offset}."
+    lines, used = [], len(header) + 200
+    for r in rows[offset:offset + limit]:
+        line = _line(r)
+        used += len(line)
+        if used > MAX_OUTPUT_CHARS and lines:
+            break
+        lines.append(line)
+    end = offset + len(lines)
+    if offset == 0 and end == total:
+        return f"{header}:\n\n" + "".join(lines)
+    result = f"{header} (showing {offset + 1}-{end}):\n\n" + "".join(lines)
+    if end < total:
+        result += f"\n... {total - end} more. Continue with {next_call(end, limit)}, or narrow the query.\n"
+    return result
 
 
 @tool
 def read_contacts(
-    filter_designation: Optional[str] = None
+    filter_designation: Optional[str] = None,
+    offset: int = 0,
+    limit: int = DEFAULT_LIMIT
 ) -> str:
     """Read contacts from CSV file, optionally filtered by designation.
     
+    Returns one page: the total count, up to `limit` contacts starting at
+    `offset`, and the call to make for the next page.
+    
     Args:
         filter_designation: Optional designation to filter by (e.g., 'Engineer', 'Manager')
+        offset: Number of matching contacts to skip (default 0)
+        limit: Maximum contacts to return (default 50, max 200)
     
     Returns:
         String representation of contacts
     """
     try:
         ensure_csv_exists()
-        df = pd.read_csv(CSV_FILE_PATH)
-        
-        if filter_designation:
-            df = df[df['designation'].str.contains(filter_designation, case=False, na=False)]
+        store = _store()
+        rows = store.by_designation(filter_designation) if filter_designation else store.all()
         
-        if df.empty:
+        if not rows:
             return "No contacts found matching criteria."
         
-        result = f"Found {len(df)} contact(s):\n\n"
-        for _, row in df.iterrows():
-            result += f"- {row['name']} ({row['email']}) - {row['designation']}\n"
-        
-        return result
+        arg = f"filter_designation={filter_designation!r}, " if filter_designation else ""
+        return _page(rows, f"Found {len(rows)} contact(s)", offset, limit,
+                     lambda o, n: f"read_contacts({arg}offset={o}, limit={n})")
     
     except Exception as e:
         return f"❌ Error reading contacts: {str(e)}"
@@ -75,22 +117,11 @@ def add_contact(
     """
     try:
         ensure_csv_exists()
-        df = pd.read_csv(CSV_FILE_PATH)
         
-        # Check if email already exists
-        if email in df['email'].values:
+        # Duplicate check is an index lookup inside add()
+        if not _store().add(email, name, designation):
             return f"❌ Contact with email {email} already exists."
         
-        # Add new contact
-        new_row = pd.DataFrame([{
-            'email': email,
-            'name': name,
-            'designation': designation
-        }])
-        
-        df = pd.concat([df, new_row], ignore_index=True)
-        df.to_csv(CSV_FILE_PATH, index=False)
-        
         return f"✅ Contact added: {name} ({email}) - {designation}"
     
     except Exception as e:
@@ -99,40 +130,139 @@ def add_contact(
 
 @tool
 def search_contacts(
-    query: str
+    query: str,
+    offset: int = 0,
+    limit: int = DEFAULT_LIMIT
 ) -> str:
     """Search contacts by name, email, or designation.
     
+    Returns one page of matches with the total count and a continuation hint.
+    
     Args:
-        query: Search term to look for across all fields
+        query: Search term to look for across all fields. Prefix with
+            "name:", "email:" or "designation:" to search one field only
+            (e.g. "email:@acme.com").
+        offset: Number of matches to skip (default 0)
+        limit: Maximum matches to return (default 50, max 200)
     
     Returns:
         String representation of matching contacts
     """
     try:
         ensure_csv_exists()
-        df = pd.read_csv(CSV_FILE_PATH)
         
         # Search across all columns
-        mask = (
-            df['name'].str.contains(query, case=False, na=False) |
-            df['email'].str.contains(query, case=False, na=False) |
-            df['designation'].str.contains(query, case=False, na=False)
-        )
+        rows = _store().search(query)
         
-        df = df[mask]
-        
-        if df.empty:
+        if not rows:
             return f"No contacts found matching '{query}'."
         
-        result = f"Found {len(df)} contact(s) matching '{query}':\n\n"
-        for _, row in df.iterrows():
-            result += f"- {row['name']} ({row['email']}) - {row['designation']}\n"
+        return _page(rows, f"Found {len(rows)} contact(s) matching '{query}'", offset, limit,
+                     lambda o, n: f"search_contacts(query={query!r}, offset={o}, limit={n})")
+    
+    except Exception as e:
+        return f"❌ Error searching contacts: {str(e)}"
+
+
+@tool
+def resolve_contact(
+    name: str,
+    top_k: int = 5
+) -> str:
+    """Resolve a possibly misspelled person name (or email) to ranked contacts.
+    
+    Use this instead of retrying search_contacts with different spellings:
+    one call returns the closest candidates with a 0-1 match score.
+    
+    Args:
+        name: Name as the user typed it (e.g., 'jon doe', 'samad')
+        top_k: Maximum number of candidates to return (default 5)
+    
+    Returns:
+        Ranked candidates with scores
+    """
+    try:
+        ensure_csv_exists()
+        matches = _store().resolve(name, max(1, min(int(top_k), 25)))
+        
+        if not matches:
+            return f"No contacts resemble '{name}'."
+        
+        result = f"Top {len(matches)} match(es) for '{name}':\n\n"
+        for i, (score, r) in enumerate(matches, 1):
+            result += f"{i}. {r.get('name', '')} ({r.get('email', '')}) - {r.get('designation', '')} [score {score:.2f}]\n"
         
         return result
     
     except Exception as e:
-        return f"❌ Error searching contacts: {str(e)}"
+        return f"❌ Error resolving contact: {str(e)}"
+
+
+def _candidate(score: float, r: Dict[str, str]) -> Dict[str, object]:
+    return {"name": r.get("name", ""), "email": r.get("email", ""),
+            "designation": r.get("designation", ""), "score": round(score, 2)}
+
+
+def _resolve_one(store: ContactStore, query: str) -> Dict[str, object]:
+    """Resolution of one query: resolved / ambiguous / group / not_found."""
+    q = (query or "").strip()
+    if not q:
+        return {"status": "not_found"}
+    # "the DevOps team", "all engineers" -> everyone whose designation matches
+    term = " ".join(_GROUP_WORDS.sub(" ", q).split())
+    if term != q and term:
+        members = store.by_designation(term)
+        if not members and term.endswith("s"):
+            term = term[:-1]
+            members = store.by_designation(term)
+        if members:
+            return {"status": "group", "designation": term, "count": len(members),
+                    "emails": [r.get("email", "") for r in members[:MAX_GROUP_EMAILS]],
+                    **({"truncated": True} if len(members) > MAX_GROUP_EMAILS else {})}
+    matches = store.resolve(q, 3)
+    if not matches:
+        return {"status": "not_found"}
+    (top, best), rest = matches[0], matches[1:]
+    if top >= RESOLVED_SCORE and (not rest or top - rest[0][0] >= AMBIGUITY_MARGIN):
+        return {"status": "resolved", **_candidate(top, best)}
+    return {"status": "ambiguous", "candidates": [_candidate(sc, r) for sc, r in matches]}
+
+
+@tool
+def resolve_contacts(
+    queries: List[str]
+) -> str:
+    """Resolve several people (names, emails or teams) to contacts in ONE call.
+    
+    Use this for multi-attendee requests ("invite Jane, Bob and the DevOps team")
+    instead of calling search_contacts once per person.
+    
+    Args:
+        queries: One entry per person or group, e.g. ["Jane", "bob wilson", "DevOps team"]
+    
+    Returns:
+        JSON: {"results": {query: {"status": "resolved" | "ambiguous" | "group" |
+        "not_found", ...}}, "emails": [resolved + group emails], "needs_clarification":
+        [queries that are ambiguous, not found, or groups over MAX_GROUP_EMAILS members,
+        which are left out of "emails" until the query is narrowed or confirmed]}
+    """
+    try:
+        ensure_csv_exists()
+        store = _store()
+        results, emails, unclear = {}, [], []
+        for q in queries or []:
+            res = results[q] = _resolve_one(store, q)
+            if res["status"] == "resolved":
+                emails.append(res["email"])
+            elif res["status"] == "group" and not res.get("truncated"):
+                emails.extend(res["emails"])
+            else:
+                unclear.append(q)
+        return json.dumps({"results": results, "emails": list(dict.fromkeys(emails)),
+                           "needs_clarification": unclear}, ensure_ascii=False)
+    
+    except Exception as e:
+        return f"❌ Error resolving contacts: {str(e)}"
 
 
 @tool
@@ -144,8 +274,7 @@ def get_all_emails() -> List[str]:
     """
     try:
         ensure_csv_exists()
-        df = pd.read_csv(CSV_FILE_PATH)
-        return df['email'].tolist()
+        return _store().emails()
     
     except Exception as e:
         return []
\ No newline at end of file
@@ -0,0 +1,94 @@
+"""
+Trigram inverted index for case-insensitive substring search over contacts.
+
+Every field value is lower-cased and split into overlapping 3-character
+grams; each gram maps to a sorted array of row numbers. A query is answered
+by intersecting the posting lists of its grams (smallest first, bisecting
+into the larger ones) and then verifying the few surviving candidates with a
+real substring check. Queries shorter than three characters fall back to a
+scan of the field values.
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional
+
+
+def grams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """Per-field trigram postings over a list of row dicts.
+
+    Each field's postings are built on the first query that touches it.
+    """
+
+    def __init__(self, rows: List[dict], fields: Iterable[str]):
+        self.rows = rows
+        self.fields = list(fields)
+        self._values: Dict[str, List[str]] = {}
+        self._postings: Dict[str, Dict[str, array]] = {}
+
+    def _build(self, field: str) -> None:
+        values = [str(r.get(field) or "").lower() for r in self.rows]
+        postings: Dict[str, array] = {}
+        get = postings.get
+        for n, value in enumerate(values):
+            for g in grams(value):
+                p = get(g)
+                if p is None:
+                    p = postings[g] = array("I")
+                p.append(n)
+        self._values[field], self._postings[field] = values, postings
+
+    def add(self, row: dict) -> None:
+        """Index row (already appended to self.rows) in the fields built so far."""
+        n = len(self.rows) - 1
+        for field, postings in self._postings.items():
+            value = str(row.get(field) or "").lower()
+            self._values[field].append(value)
+            for g in grams(value):
+                p = postings.get(g)
+                if p is None:
+                    p = postings[g] = array("I")
+                p.append(n)
+
+    # ── QUERY ─────────────────────────────────────────────────────────────────
+    def search(self, query: str, field: Optional[str] = None) -> List[int]:
+        """Sorted row numbers whose field (or any field) contains query."""
+        q = (query or "").lower()
+        fields = [field] if field else self.fields
+        if len(fields) == 1:
+            return self._search_field(q, fields[0])
+        hits = set()
+        for f in fields:
+            hits.update(self._search_field(q, f))
+        return sorted(hits)
+
+    def _search_field(self, q: str, field: str) -> List[int]:
+        if field not in self._postings:
+            self._build(field)
+        values = self._values[field]
+        if len(q) < 3:
+            return [i for i, v in enumerate(values) if q in v]
+        postings = self._postings[field]
+        lists = []
+        for g in grams(q):
+            p = postings.get(g)
+            if p is None:
+                return []
+            lists.append(p)
+        lists.sort(key=len)
+        candidates = lists[0]
+        # Narrow with the next lists only while bisecting beats verifying outright
+        for p in lists[1:3]:
+            if len(candidates) > len(p) // 8:
+                break
+            candidates = [i for i in candidates if _contains(p, i)]
+        return [i for i in candidates if q in values[i]]
+
+
+def _contains(sorted_arr: array, x: int) -> bool:
+    i = bisect_left(sorted_arr, x)
+    return i < len(sorted_arr) and sorted_arr[i] == x
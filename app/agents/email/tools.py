@@ -3,25 +3,14 @@ Email tools for Gmail integration.
 Production-ready with REAL API calls and complete error handling.
 """
 
-import os
-import pickle
 import base64
 import re
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import List
 from langchain.tools import tool
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-
-
-SCOPES = [
-    'https://www.googleapis.com/auth/gmail.send',
-    'https://www.googleapis.com/auth/gmail.readonly'
-]
+from app.core.google_services import Unavailable, get_service
 
 
 def validate_email(email: str) -> bool:
@@ -31,31 +20,20 @@ def validate_email(email: str) -> bool:
 
 
 def get_gmail_service():
-    """Get authenticated Gmail service with proper error handling."""
+    """Get authenticated Gmail service, or None if unavailable.
+
+    Credentials and the built service are cached (per thread) by
+    app/core/google_services.py, so repeated tool calls skip the token
+    unpickle and discovery build. An unavailable connection is remembered
+    for a backoff period and never starts the browser OAuth flow here;
+    authorization happens from Settings → Connections.
+    """
     try:
-        creds = None
-        token_path = 'token_gmail.pickle'
-        
-        if os.path.exists(token_path):
-            with open(token_path, 'rb') as token:
-                creds = pickle.load(token)
-        
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                creds.refresh(Request())
-            else:
-                if not os.path.exists('credentials.json'):
-                    print("⚠️  credentials.json not found")
-                    return None
-                
-                flow = InstalledAppFlow.from_client_secrets_file('credentials.json', SCOPES)
-                creds = flow.run_local_server(port=0)
-            
-            with open(token_path, 'wb') as token:
-                pickle.dump(creds, token)
-        
-        service = build('gmail', 'v1', credentials=creds)
-        return service
+        return get_service('gmail')
+    
+    except Unavailable:
+        # Logged once per state change by the connection manager
+        return None
         
     except Exception as e:
         print(f"Gmail authentication failed: {e}")
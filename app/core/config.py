@@ -19,8 +19,51 @@ class Settings(BaseSettings):
     google_calendar_credentials_path: str = "credentials.json"
     google_gmail_credentials_path: str = "credentials.json"
     
+    # Calendar availability (UTC, like the events create_calendar_event makes)
+    calendar_work_start_hour: int = 9
+    calendar_work_end_hour: int = 17
+    calendar_slot_granularity_minutes: int = 15
+    calendar_work_weekdays: list[int] = [0, 1, 2, 3, 4]  # Mon=0 (find_meeting_slots)
+    calendar_solver_resolution_minutes: int = 5
+    calendar_max_search_days: int = 31
+    
+    # Local calendar event cache (SQLite, incremental sync via syncToken)
+    calendar_cache_enabled: bool = True
+    calendar_cache_path: str = "data/calendar_cache.db"
+    calendar_cache_calendars: list[str] = ["primary"]
+    calendar_cache_max_age_seconds: int = 60  # staleness allowed before pulling deltas
+    calendar_cache_past_days: int = 30  # how far back the initial full sync goes
+    
     # Data
     csv_file_path: str = "data/contacts.csv"
+    contacts_backend: str = "auto"  # "auto" (by csv_file_path extension) | "csv" | "sqlite" | "parquet"
+    
+    # Meeting/email tracker storage
+    tracker_backend: str = "json"  # "json" | "sqlite"
+    tracker_db_path: str = "data/tracker.db"
+    tracker_journal: bool = False
+    tracker_journal_compact_bytes: int = 4 * 1024 * 1024
+    tracker_wal_group_ms: float = 0.0  # extra wait so more journal appends share one fsync
+    tracker_wal_fsync: bool = True
+    tracker_serializer: str = "auto"  # "auto" | "orjson" | "msgspec" | "json"
+    tracker_json_pretty: bool = False  # indent tracker JSON files (slower, larger)
+    email_archive_segment: str = "month"  # "year" | "month" | "day" | "off"
+    email_archive_plain_segments: int = 1  # newest archive segments left uncompressed
+    
+    # Email send dedup / idempotency keys
+    email_dedup_ttl_seconds: int = 30
+    email_idempotency_ttl_seconds: int = 24 * 60 * 60
+    email_dedup_persist: bool = False  # also keep keys in tracker_db_path
+    
+    # Tracker retention — background job; records past these limits are moved
+    # to gzipped archives. Age rules map status ("*" = any) to days.
+    retention_enabled: bool = False
+    retention_interval_minutes: int = 60
+    retention_meetings_max_age_days: dict[str, int] = {"Rejected": 180}
+    retention_emails_max_age_days: dict[str, int] = {"failed": 90, "rejected": 180}
+    retention_meetings_max_records: int = 0  # 0 = unlimited
+    retention_emails_max_records: int = 0
+    retention_archive_dir: str = "data/retention"
     
     # Agent settings
     temperature: float = 0.7
@@ -0,0 +1,320 @@
+"""
+Google API connections (Calendar, Gmail): pooled clients and connection state.
+
+Credentials are loaded from the token pickle once per process and kept in
+memory; they are refreshed ahead of expiry (REFRESH_AHEAD) and written back,
+and re-read only when the token file changes on disk. Services are built
+from the discovery document bundled with google-api-python-client (parsed
+once per API) and cached per thread, because the httplib2 transport under
+each service is not thread-safe.
+
+Each connection also tracks its state for the UI. A connection that cannot
+be used (no client secrets, no valid token, refresh failing) is remembered
+as unavailable for a backoff TTL that doubles up to BACKOFF_MAX, so tool
+calls fail fast instead of re-checking files every time. The interactive
+OAuth flow never runs on the request path; it is started explicitly with
+authorize() from Settings → Connections.
+"""
+
+import os
+import json
+import time
+import pickle
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Dict, List, Optional
+
+from google.auth.exceptions import RefreshError
+from google.auth.transport.requests import Request
+from google_auth_oauthlib.flow import InstalledAppFlow
+from googleapiclient.discovery import build, build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+
+from app.core.settings_access import setting
+
+
+logger = logging.getLogger(__name__)
+
+REFRESH_AHEAD = timedelta(minutes=5)    # refresh tokens this long before they expire
+REFRESH_RETRY = timedelta(seconds=30)   # after a failed refresh-ahead, while the token still works
+BACKOFF_MIN = 30.0                      # seconds an "unavailable" result is cached, doubling
+BACKOFF_MAX = 600.0
+AUTHORIZE_TIMEOUT = 120                 # seconds to wait for the browser consent in authorize()
+
+OK_STATES = ("connected", "ready")
+
+
+class Unavailable(Exception):
+    """The connection cannot be used right now; .state says why."""
+    state = "error"
+
+
+class NotConfigured(Unavailable):
+    """No usable token and no client secrets file to authorize with."""
+    state = "not_configured"
+
+
+class NeedsAuthorization(Unavailable):
+    """Client secrets exist but there is no valid token; run authorize()."""
+    state = "needs_authorization"
+
+
+def _utcnow() -> datetime:
+    # google-auth keeps Credentials.expiry as a naive UTC datetime
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+@lru_cache(maxsize=None)
+def _document(api: str, version: str) -> Optional[dict]:
+    """Bundled (static) discovery document, parsed once; None if not bundled."""
+    doc = get_static_doc(api, version)
+    return json.loads(doc) if doc else None
+
+
+_local = threading.local()
+_stats = {"calls": 0, "builds": 0, "loads": 0, "refreshes": 0, "fast_failures": 0}
+
+
+# ── CONNECTION ────────────────────────────────────────────────────────────────
+class Connection:
+    """One Google API with its token pickle, cached credentials and state."""
+
+    def __init__(self, name: str, label: str, api: str, version: str, scopes: List[str],
+                 token_path: str, secrets_setting: Optional[str] = None):
+        self.name = name
+        self.label = label
+        self.api = api
+        self.version = version
+        self.scopes = scopes
+        self.token_path = token_path
+        self.secrets_setting = secrets_setting
+        self._client_secrets: Optional[str] = None
+        self.creds = None
+        self._sig = None
+        self._refresh_retry_at: Optional[datetime] = None
+        self._lock = threading.Lock()
+        # State: unknown | ready | connected | not_configured | needs_authorization | error
+        self.state = "unknown"
+        self.detail = ""
+        self.since = time.time()
+        self._error: Optional[Unavailable] = None
+        self._retry_at = 0.0          # monotonic; no re-check before this while unavailable
+        self._backoff = 0.0
+        self._peek_error = False      # current failure came from _peek (files only), not credentials()
+
+    @property
+    def client_secrets(self) -> str:
+        if self._client_secrets is None:
+            self._client_secrets = (setting(self.secrets_setting, None) if self.secrets_setting
+                                    else None) or "credentials.json"
+        return self._client_secrets
+
+    # ── credentials ──
+    def _signature(self):
+        try:
+            st = os.stat(self.token_path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _stale(self, creds) -> bool:
+        if not creds.token:
+            return True
+        if creds.expiry is None:
+            return False
+        if self._refresh_retry_at is not None and _utcnow() < self._refresh_retry_at and not creds.expired:
+            return False
+        return creds.expiry - REFRESH_AHEAD <= _utcnow()
+
+    def _save(self, creds) -> None:
+        with open(self.token_path, "wb") as token:
+            pickle.dump(creds, token)
+        self._sig = self._signature()
+
+    def _load(self):
+        sig = self._signature()
+        if self.creds is None or sig != self._sig:
+            self.creds, self._sig = None, sig
+            if sig is not None:
+                with open(self.token_path, "rb") as token:
+                    self.creds = pickle.load(token)
+                _stats["loads"] += 1
+        creds = self.creds
+        if creds is not None and self._stale(creds) and creds.refresh_token:
+            try:
+                creds.refresh(Request())
+                _stats["refreshes"] += 1
+                self._refresh_retry_at = None
+                self._save(creds)
+            except RefreshError as e:       # revoked or otherwise rejected grant
+                if not creds.valid:
+                    raise NeedsAuthorization(f"token refresh rejected: {e}") from e
+                self._refresh_retry_at = _utcnow() + REFRESH_RETRY
+                logger.warning(f"{self.label} token refresh-ahead rejected, retrying later: {e}")
+            except Exception as e:
+                if not creds.valid:
+                    raise
+                self._refresh_retry_at = _utcnow() + REFRESH_RETRY
+                logger.warning(f"{self.label} token refresh-ahead failed, retrying later: {e}")
+        if creds is None or not creds.valid:
+            if not os.path.exists(self.client_secrets):
+                raise NotConfigured(f"{self.client_secrets} not found")
+            raise NeedsAuthorization(f"no valid token in {self.token_path}; authorize in Settings → Connections")
+        return creds
+
+    def credentials(self):
+        """Valid credentials, or Unavailable (cached for the backoff TTL)."""
+        creds = self.creds
+        if creds is not None and not self._stale(creds) and self._signature() == self._sig:
+            return creds
+        if self._error is not None and time.monotonic() < self._retry_at:
+            _stats["fast_failures"] += 1
+            raise type(self._error)(str(self._error))   # fresh instance; no traceback build-up
+        with self._lock:
+            if self._error is not None and time.monotonic() < self._retry_at:
+                _stats["fast_failures"] += 1
+                raise type(self._error)(str(self._error))
+            try:
+                creds = self._load()
+            except Unavailable as e:
+                self._fail(e)
+                raise
+            except Exception as e:
+                err = Unavailable(f"{type(e).__name__}: {e}")
+                self._fail(err)
+                raise err from e
+            self._set("connected", "")
+            return creds
+
+    # ── state ──
+    def _set(self, state: str, detail: str) -> None:
+        if state != self.state:
+            self.since = time.time()
+            if state == "connected":
+                logger.info(f"{self.label} connected")
+        self.state, self.detail = state, detail
+        if state in OK_STATES:
+            self._error, self._retry_at, self._backoff = None, 0.0, 0.0
+
+    def _fail(self, err: Unavailable, peek: bool = False) -> None:
+        self._peek_error = peek
+        self._backoff = min(BACKOFF_MAX, self._backoff * 2) if self._backoff else BACKOFF_MIN
+        self._retry_at = time.monotonic() + self._backoff
+        if err.state != self.state or str(err) != self.detail:
+            logger.warning(f"{self.label} unavailable ({err.state}): {err}; next check in {self._backoff:.0f}s")
+        self._set(err.state, str(err))
+        self._error = err
+
+    def _peek(self) -> None:
+        """Local-only state before first use: token/secrets presence, no network.
+        Only moves the state out of "unknown" (or out of a failure it recorded
+        itself); what credentials() found stands until it checks again."""
+        if os.path.exists(self.token_path):
+            self._set("ready", f"{self.token_path} found, not used yet")
+        elif os.path.exists(self.client_secrets):
+            self._fail(NeedsAuthorization(f"no token yet ({self.token_path}); authorize in Settings → Connections"),
+                       peek=True)
+        else:
+            self._fail(NotConfigured(f"{self.client_secrets} not found"), peek=True)
+
+    def status(self) -> dict:
+        """State for the UI, from memory (files are only checked once the backoff expires)."""
+        with self._lock:
+            if self.state == "unknown" or (self._peek_error and time.monotonic() >= self._retry_at):
+                self._peek()
+            return {
+                "name": self.name, "label": self.label, "state": self.state, "detail": self.detail,
+                "ok": self.state in OK_STATES, "since": self.since,
+                "retry_in": max(0.0, self._retry_at - time.monotonic()) if self._error else 0.0,
+                "client_secrets": self.client_secrets, "token_path": self.token_path,
+            }
+
+    def reset(self) -> None:
+        """Drop cached credentials and any cached failure; the next use re-checks."""
+        with self._lock:
+            self.creds, self._sig = None, None
+            self._error, self._retry_at, self._backoff = None, 0.0, 0.0
+            self._peek_error = False
+            self.state, self.detail = "unknown", ""
+
+    def authorize(self, timeout: int = AUTHORIZE_TIMEOUT):
+        """Run the browser OAuth consent (local server) and store the token.
+
+        Interactive: call only on an explicit user action, never from a tool.
+        """
+        if not os.path.exists(self.client_secrets):
+            err = NotConfigured(f"{self.client_secrets} not found")
+            with self._lock:
+                self._fail(err)
+            raise err
+        flow = InstalledAppFlow.from_client_secrets_file(self.client_secrets, self.scopes)
+        try:
+            creds = flow.run_local_server(port=0, timeout_seconds=timeout)
+        except Exception as e:
+            raise NeedsAuthorization(f"authorization not completed: {e}") from e
+        with self._lock:
+            self.creds = creds
+            self._save(creds)
+            self._set("connected", "")
+        return creds
+
+    # ── services ──
+    def service(self):
+        """This thread's client, rebuilt only when the credentials object changes.
+
+        In-place token refreshes are picked up by the existing client.
+        """
+        _stats["calls"] += 1
+        creds = self.credentials()
+        services = getattr(_local, "services", None)
+        if services is None:
+            services = _local.services = {}
+        cached = services.get(self)
+        if cached is not None and cached[0] is creds:
+            return cached[1]
+        doc = _document(self.api, self.version)
+        if doc is not None:
+            service = build_from_document(doc, credentials=creds)
+        else:
+            service = build(self.api, self.version, credentials=creds, cache_discovery=False)
+        _stats["builds"] += 1
+        logger.debug(f"Built {self.api} {self.version} service for thread {threading.current_thread().name}")
+        services[self] = (creds, service)
+        return service
+
+
+CONNECTIONS: Dict[str, Connection] = {c.name: c for c in (
+    Connection("calendar", "Google Calendar", "calendar", "v3",
+               ["https://www.googleapis.com/auth/calendar"],
+               "token_calendar.pickle", "google_calendar_credentials_path"),
+    Connection("gmail", "Gmail", "gmail", "v1",
+               ["https://www.googleapis.com/auth/gmail.send",
+                "https://www.googleapis.com/auth/gmail.readonly"],
+               "token_gmail.pickle", "google_gmail_credentials_path"),
+)}
+
+
+# ── PUBLIC API ────────────────────────────────────────────────────────────────
+def get_service(name: str):
+    """Pooled client for a connection in CONNECTIONS; raises Unavailable."""
+    return CONNECTIONS[name].service()
+
+
+def connection_states() -> Dict[str, dict]:
+    return {name: c.status() for name, c in CONNECTIONS.items()}
+
+
+def authorize(name: str, timeout: int = AUTHORIZE_TIMEOUT):
+    return CONNECTIONS[name].authorize(timeout)
+
+
+def invalidate(name: Optional[str] = None) -> None:
+    """Reset one connection (or all): cached credentials, failures and clients."""
+    for c in ([CONNECTIONS[name]] if name else CONNECTIONS.values()):
+        c.reset()
+
+
+def service_stats() -> dict:
+    return dict(_stats)
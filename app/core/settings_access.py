@@ -0,0 +1,29 @@
+"""
+Tolerant access to the application settings.
+
+Importing app.core.config raises when required settings (the Azure OpenAI
+ones) are missing. Background services and tools that only need optional
+values read them here instead, falling back to their own defaults.
+"""
+
+import logging
+from functools import lru_cache
+
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def get_settings():
+    """The Settings instance, or None if it cannot be loaded (warned once)."""
+    try:
+        from app.core.config import settings
+        return settings
+    except Exception as e:
+        logger.warning(f"Settings unavailable, using defaults: {e}")
+        return None
+
+
+def setting(name: str, default):
+    """settings.<name>, or default when unset or settings cannot be loaded."""
+    return getattr(get_settings(), name, default)
@@ -10,9 +10,9 @@ from langchain.agents.middleware import HumanInTheLoopMiddleware
 from langgraph.checkpoint.memory import InMemorySaver
 
 # Import actual tools (these are used directly)
-from app.agents.calendar.tools import create_calendar_event, get_available_time_slots
+from app.agents.calendar.tools import create_calendar_event, get_available_time_slots, find_meeting_slots
 from app.agents.email.tools import send_email
-from app.agents.data.tools import read_contacts, add_contact, search_contacts, get_all_emails
+from app.agents.data.tools import read_contacts, add_contact, search_contacts, resolve_contact, resolve_contacts, get_all_emails
 
 
 # Configure logging
@@ -44,14 +44,14 @@ def create_supervisor_agent(model, enable_hitl: bool = True):
         
         # Wrap calendar tools with HITL
         if enable_hitl:
-            calendar_tools = [create_calendar_event, get_available_time_slots]
+            calendar_tools = [create_calendar_event, get_available_time_slots, find_meeting_slots]
             email_tools = [send_email]
         else:
-            calendar_tools = [create_calendar_event, get_available_time_slots]
+            calendar_tools = [create_calendar_event, get_available_time_slots, find_meeting_slots]
             email_tools = [send_email]
         
         # Data tools don't need HITL for read operations
-        data_tools = [read_contacts, add_contact, search_contacts, get_all_emails]
+        data_tools = [read_contacts, add_contact, search_contacts, resolve_contact, resolve_contacts, get_all_emails]
         
         # Validate all tools are available
         all_tools = calendar_tools + email_tools + data_tools
@@ -67,14 +67,17 @@ def create_supervisor_agent(model, enable_hitl: bool = True):
             "CRITICAL: USE tools to execute tasks, don't just describe them.\n\n"
             
             "Tools available:\n"
-            "• create_calendar_event, get_available_time_slots\n"
+            "• create_calendar_event, get_available_time_slots, find_meeting_slots\n"
             "• send_email\n"
-            "• read_contacts, add_contact, search_contacts, get_all_emails\n\n"
+            "• read_contacts, add_contact, search_contacts, resolve_contact, resolve_contacts, get_all_emails\n\n"
             
             "Rules:\n"
             "1. Email request → USE send_email tool\n"
             "2. Calendar request → USE create_calendar_event tool\n"
+            "   Free slot over several days or for many people → USE find_meeting_slots once (not one call per day)\n"
             "3. Data request → USE read_contacts or search_contacts\n"
+            "   Person named by the user → USE resolve_contact once (handles misspellings)\n"
+            "   Several people/teams → USE resolve_contacts once with all of them, then ask only about 'needs_clarification'\n"
             "4. Multi-step task → Execute each tool sequentially\n"
             "5. Datetime format: ISO (YYYY-MM-DDTHH:MM:SS)\n\n"
             
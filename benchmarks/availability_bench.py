@@ -0,0 +1,69 @@
+"""
+benchmarks/availability_bench.py
+Solve time of the bitmap availability solver (app/agents/calendar/availability.py)
+after the free/busy fetch: two weeks, 100 attendees with synthetic busy
+calendars, at 5- and 1-minute resolution. The earliest slot is checked
+against the interval sweep used by get_available_time_slots.
+
+    python -m benchmarks.availability_bench                 # 100 attendees, 14 days
+    python -m benchmarks.availability_bench 300 28
+"""
+import random, statistics, sys, time
+from datetime import datetime, timedelta, timezone
+
+from app.agents.calendar.availability import AvailabilitySolver
+from app.agents.calendar.freebusy import merge_intervals, sweep_slots
+
+START = datetime(2024, 1, 15, tzinfo=timezone.utc)   # a Monday
+
+
+def _calendars(people: int, days: int, per_day: int = 3) -> dict:
+    rnd = random.Random(5)
+    out = {}
+    for p in range(people):
+        busy = []
+        for d in range(days):
+            day = START + timedelta(days=d)
+            for _ in range(rnd.randint(0, per_day)):
+                s = day + timedelta(hours=8, minutes=5 * rnd.randrange(0, 120))
+                busy.append((s, s + timedelta(minutes=rnd.choice([15, 30, 30, 45, 60, 90]))))
+        out[f"p{p}@example.com"] = merge_intervals(busy)
+    return out
+
+
+def _earliest_by_sweep(busy: dict, days: int, duration: int, step: int):
+    for d in range(days):
+        day = START + timedelta(days=d)
+        if day.weekday() >= 5:
+            continue
+        slots = sweep_slots(busy, day + timedelta(hours=9), day + timedelta(hours=17),
+                            timedelta(minutes=duration), timedelta(minutes=step))
+        if slots:
+            return slots[0][0]
+    return None
+
+
+def main(people: int, days: int, runs: int = 20) -> None:
+    print(f"{people} attendees, {days} days")
+    for per_day in (1, 2):
+        busy = _calendars(people, days, per_day)
+        required = dict(list(busy.items())[:people // 2])
+        optional = dict(list(busy.items())[people // 2:])
+        expected = _earliest_by_sweep(required, days, 45, 15)
+        for resolution in (5, 1):
+            lat, first = [], None
+            for _ in range(runs):
+                t = time.perf_counter()
+                solver = AvailabilitySolver(START, START + timedelta(days=days), resolution)
+                best = solver.solve(required, 45, optional, max_results=5)
+                earliest = solver.solve(required, 45, max_results=1, prefer="earliest")
+                lat.append((time.perf_counter() - t) * 1000)
+                first = earliest[0].start if earliest else None
+            print(f"  ≤{per_day} meetings/day, {resolution}-min bins: median {statistics.median(lat):6.2f} ms "
+                  f"(best + earliest), earliest {f'{first:%a %d %H:%M}' if first else 'none'} "
+                  f"{'= sweep' if first == expected else f'!= sweep {expected}'}"
+                  + (f", best has {best[0].optional_free}/{len(optional)} optional" if best else ""))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100, int(sys.argv[2]) if len(sys.argv) > 2 else 14)
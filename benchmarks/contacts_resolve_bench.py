@@ -0,0 +1,61 @@
+"""
+benchmarks/contacts_resolve_bench.py
+Latency of resolve_contact's fuzzy resolver (app/agents/data/fuzzy.py) on a
+synthetic directory with generated, high-cardinality names.
+
+    python -m benchmarks.contacts_resolve_bench            # 1M contacts
+    python -m benchmarks.contacts_resolve_bench 200000
+"""
+import random, statistics, sys, time
+
+from app.agents.data.fuzzy import NameResolver
+
+SYLLABLES = ["an", "ba", "chi", "da", "el", "fa", "go", "ha", "in", "jo", "ka", "li", "mo", "na",
+             "or", "pe", "qui", "ra", "sa", "ti", "u", "vi", "wa", "xe", "ya", "zo", "mar", "son", "ter"]
+TITLES = ["Software Engineer", "Product Manager", "UX Designer", "Data Scientist", "Sales Lead"]
+
+
+def _name(rnd: random.Random, parts: int) -> str:
+    return "".join(rnd.choice(SYLLABLES) for _ in range(parts)).capitalize()
+
+
+def _rows(n: int) -> list:
+    rnd = random.Random(11)
+    firsts = [_name(rnd, rnd.randint(2, 3)) for _ in range(5_000)]
+    lasts  = [_name(rnd, rnd.randint(2, 4)) for _ in range(50_000)]
+    rows = []
+    for i in range(n):
+        first, last = rnd.choice(firsts), rnd.choice(lasts)
+        rows.append({"email": f"{first}.{last}{i % 97}@example.com".lower(),
+                     "name": f"{first} {last}", "designation": rnd.choice(TITLES)})
+    return rows
+
+
+def _typo(rnd: random.Random, name: str) -> str:
+    i = rnd.randrange(len(name))
+    return rnd.choice([name[:i] + name[i + 1:], name[:i] + rnd.choice("aeiou") + name[i + 1:]]).lower()
+
+
+def main(n: int, queries: int = 200) -> None:
+    rows = _rows(n)
+    t = time.perf_counter()
+    resolver = NameResolver(rows)
+    build = time.perf_counter() - t
+    rnd = random.Random(3)
+    lat, top1 = [], 0
+    for _ in range(queries):
+        target = rnd.randrange(n)
+        first, last = rows[target]["name"].split()
+        q = f"{_typo(rnd, first)} {_typo(rnd, last)}"
+        t = time.perf_counter()
+        hits = resolver.resolve(q, 5)
+        lat.append((time.perf_counter() - t) * 1000)
+        top1 += bool(hits) and rows[hits[0][1]]["name"] == rows[target]["name"]
+    lat.sort()
+    print(f"{n:,} contacts, vocabulary {len(resolver._words):,} tokens, build {build:.1f} s")
+    print(f"  {queries} misspelled 'first last' queries: median {statistics.median(lat):.2f} ms, "
+          f"p95 {lat[int(len(lat) * 0.95)]:.2f} ms, top-1 name correct {top1 / queries:.0%}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
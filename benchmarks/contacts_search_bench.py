@@ -0,0 +1,73 @@
+"""
+benchmarks/contacts_search_bench.py
+search_contacts latency on a synthetic directory: the old pandas path
+(read_csv + three str.contains per call), pandas with the frame already
+loaded, and ContactStore's trigram index (app/agents/data/trigram.py).
+
+    python -m benchmarks.contacts_search_bench            # 100k rows
+    python -m benchmarks.contacts_search_bench 500000
+"""
+import csv, os, random, sys, tempfile, time
+
+import pandas as pd
+
+from app.agents.data.contact_store import ContactStore
+
+FIRST = ["John", "Jane", "Samad", "Alice", "Bob", "Charlie", "Priya", "Wei", "Olga", "Mateo",
+         "Fatima", "Kenji", "Lucas", "Amara", "Noah", "Sofia", "Omar", "Elena", "Ravi", "Zoe"]
+LAST  = ["Doe", "Smith", "Rao", "Brown", "Wilson", "Davis", "Patel", "Zhang", "Ivanova", "Garcia",
+         "Khan", "Sato", "Martin", "Okafor", "Miller", "Rossi", "Haddad", "Novak", "Iyer", "Clark"]
+TITLES = ["Software Engineer", "Senior Engineer", "Product Manager", "UX Designer", "DevOps Engineer",
+          "AI Engineer", "Data Scientist", "Sales Lead", "HR Partner", "Finance Analyst"]
+QUERIES = ["jane", "doe", "samad rao", "designer", "@example.com", "user12345", "name:olga",
+           "email:wilson", "nobody-here", "ai"]
+
+
+def _write(path: str, n: int) -> None:
+    rnd = random.Random(7)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(["email", "name", "designation"])
+        for i in range(n):
+            first, last = rnd.choice(FIRST), rnd.choice(LAST)
+            w.writerow([f"{first}.{last}.user{i}@example.com".lower(), f"{first} {last}", rnd.choice(TITLES)])
+
+
+def _pandas_scan(df, query: str) -> int:
+    mask = (df["name"].str.contains(query, case=False, na=False)
+            | df["email"].str.contains(query, case=False, na=False)
+            | df["designation"].str.contains(query, case=False, na=False))
+    return int(mask.sum())
+
+
+def _ms(fn) -> float:
+    t = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t) * 1000
+
+
+def main(n: int) -> None:
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "contacts.csv")
+        _write(path, n)
+        store = ContactStore(path)
+        load_ms  = _ms(store.all)
+        build_ms = _ms(lambda: store.search("warmup"))
+        df = pd.read_csv(path)
+        print(f"{n:,} contacts  (store load {load_ms:.0f} ms, trigram build {build_ms:.0f} ms)")
+        print(f"  {'query':<16}{'hits':>8}{'pandas+read ms':>16}{'pandas ms':>11}{'trigram ms':>12}")
+        for q in QUERIES:
+            field, term = ContactStore.parse_query(q)
+            hits = len(store.search(q))
+            tri  = min(_ms(lambda: store.search(q)) for _ in range(5))
+            if field:   # the pandas path had no field scoping; time the same column scan
+                scan = lambda f: int(f[field].str.contains(term, case=False, na=False).sum())
+            else:
+                scan = lambda f: _pandas_scan(f, term)
+            cold = _ms(lambda: scan(pd.read_csv(path)))
+            warm = min(_ms(lambda: scan(df)) for _ in range(3))
+            print(f"  {q:<16}{hits:>8}{cold:>16.1f}{warm:>11.1f}{tri:>12.2f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
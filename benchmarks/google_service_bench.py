@@ -0,0 +1,132 @@
+"""
+benchmarks/google_service_bench.py
+Per-call overhead of getting a Calendar/Gmail client: the previous path
+(unpickle the token + discovery build on every call) against the pool in
+app/core/google_services.py. Uses an unexpired fake token, so no network.
+Starts with a smoke check of the configured connections (client secrets
+path and state), which must not raise, and of the state a connection
+reports and caches with client secrets missing, a corrupt token and a
+valid token.
+
+    python -m benchmarks.google_service_bench           # 200 calls, 8 threads
+    python -m benchmarks.google_service_bench 500 16
+"""
+import os, pickle, statistics, sys, tempfile, threading, time
+from datetime import datetime, timedelta, timezone
+
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build
+
+from app.core import google_services
+
+APIS = (("calendar", "v3"), ("gmail", "v1"))
+
+
+def _token(path: str) -> None:
+    creds = Credentials(token="bench", refresh_token="bench", client_id="bench", client_secret="bench",
+                        token_uri="https://oauth2.googleapis.com/token",
+                        expiry=datetime.now(timezone.utc).replace(tzinfo=None) + timedelta(hours=1))
+    with open(path, "wb") as f:
+        pickle.dump(creds, f)
+
+
+def legacy(api: str, version: str, token_path: str):
+    with open(token_path, "rb") as f:
+        creds = pickle.load(f)
+    return build(api, version, credentials=creds)
+
+
+_pool = {}
+
+
+def pooled(api: str, version: str, token_path: str):
+    conn = _pool.get(api)
+    if conn is None:
+        conn = _pool[api] = google_services.Connection(api, api, api, version, [], token_path)
+    return conn.service()
+
+
+def _time(fn, api, version, token_path, calls: int) -> list:
+    lat = []
+    for _ in range(calls):
+        t = time.perf_counter()
+        fn(api, version, token_path)
+        lat.append((time.perf_counter() - t) * 1000)
+    return lat
+
+
+def _threaded(fn, api, version, token_path, calls: int, threads: int) -> float:
+    def work():
+        for _ in range(calls // threads):
+            fn(api, version, token_path)
+    ts = [threading.Thread(target=work) for _ in range(threads)]
+    t = time.perf_counter()
+    for th in ts:
+        th.start()
+    for th in ts:
+        th.join()
+    return (time.perf_counter() - t) * 1000 / (calls // threads * threads)
+
+
+def smoke() -> None:
+    for name, conn in google_services.CONNECTIONS.items():
+        state = conn.status()
+        print(f"{name}: client secrets {conn.client_secrets}, state {state['state']}")
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as d:
+        os.chdir(d)                 # client secrets default to ./credentials.json
+        try:
+            _scenarios()
+        finally:
+            os.chdir(cwd)
+
+
+def _scenarios() -> None:
+    def check(label, conn, state, error):
+        try:
+            conn.service()
+            got = None
+        except google_services.Unavailable as e:
+            got = type(e).__name__
+            try:                    # within the backoff: the cached cause, without a re-check
+                conn.service()
+            except google_services.Unavailable as again:
+                assert type(again) is type(e) and str(again) == str(e), (label, again)
+        conn._retry_at = 0.0        # backoff over: status() may look at the files again
+        seen = conn.status()["state"]
+        ok = got == error and seen == state
+        print(f"  {label:28} service: {got or 'ok':20} state: {seen:20} {'ok' if ok else 'UNEXPECTED'}")
+        assert ok, (label, got, seen)
+
+    conn = google_services.Connection("calendar", "Calendar", "calendar", "v3", [], "token.pickle")
+    check("no client secrets", conn, "not_configured", "NotConfigured")
+    open("credentials.json", "w").close()
+    conn.reset()
+    check("secrets, no token", conn, "needs_authorization", "NeedsAuthorization")
+    with open("token.pickle", "wb") as f:
+        f.write(b"not a pickle")
+    conn.reset()
+    assert conn.status()["state"] == "ready"
+    check("corrupt token", conn, "error", "Unavailable")
+    _token("token.pickle")
+    conn.reset()
+    check("valid token", conn, "connected", None)
+
+
+def main(calls: int, threads: int) -> None:
+    smoke()
+    with tempfile.TemporaryDirectory() as d:
+        token_path = os.path.join(d, "token.pickle")
+        _token(token_path)
+        for api, version in APIS:
+            print(f"{api} {version}, {calls} calls")
+            for name, fn in (("legacy", legacy), ("pooled", pooled)):
+                lat = _time(fn, api, version, token_path, calls)
+                per = _threaded(fn, api, version, token_path, calls, threads)
+                print(f"  {name:7} first {lat[0]:8.2f} ms   median {statistics.median(lat):8.3f} ms   "
+                      f"p95 {sorted(lat)[int(len(lat) * 0.95)]:8.3f} ms   {threads} threads {per:8.3f} ms/call")
+        print(f"  pool stats: {google_services.service_stats()}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200, int(sys.argv[2]) if len(sys.argv) > 2 else 8)
@@ -0,0 +1,67 @@
+"""
+benchmarks/serializer_bench.py
+Load/dump time of tracker-shaped records for every installed serializer.
+
+    python -m benchmarks.serializer_bench            # 10k and 100k records
+    python -m benchmarks.serializer_bench 50000
+
+"legacy" is what meeting_tracker did before ui/services/serializer:
+json.dump(indent=2, default=str) / json.load.
+"""
+import json, sys, time, uuid
+from datetime import datetime, timedelta
+
+from ui.services import serializer
+
+
+def _records(n: int) -> list:
+    t0 = datetime(2025, 1, 1)
+    return [{
+        "id":         uuid.uuid4().hex,
+        "to":         f"user{i % 500}@example.com",
+        "subject":    f"Meeting Invitation: Sprint review #{i % 40}",
+        "body_hash":  uuid.uuid4().hex * 2,
+        "status":     ("sent", "rejected", "failed")[i % 3],
+        "source":     ("agent", "scheduler", "hitl")[i % 3],
+        "meeting_id": uuid.uuid4().hex if i % 2 else None,
+        "sent_at":    (t0 + timedelta(minutes=i)).isoformat(),
+    } for i in range(n)]
+
+
+def _best(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t)
+    return best
+
+
+def _cases():
+    yield "legacy (json, indent=2)", (
+        lambda d: json.dumps(d, indent=2, ensure_ascii=False, default=str).encode("utf-8"),
+        json.loads,
+    )
+    for name in serializer.installed():
+        for pretty in (False, True):
+            label = f"{name}{' (pretty)' if pretty else ''}"
+            yield label, (
+                lambda d, n=name, p=pretty: serializer.dumps(d, p, n),
+                lambda b, n=name: serializer.loads(b, n),
+            )
+
+
+def main(sizes: list) -> None:
+    for n in sizes:
+        data = _records(n)
+        print(f"\n{n:,} records")
+        print(f"  {'serializer':<26}{'dump ms':>10}{'load ms':>10}{'size KB':>10}")
+        for label, (dump, load) in _cases():
+            blob = dump(data)
+            d_ms = _best(lambda: dump(data)) * 1000
+            l_ms = _best(lambda: load(blob)) * 1000
+            print(f"  {label:<26}{d_ms:>10.1f}{l_ms:>10.1f}{len(blob) / 1024:>10.0f}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [10_000, 100_000])
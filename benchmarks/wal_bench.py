@@ -0,0 +1,57 @@
+"""
+benchmarks/wal_bench.py
+Durable writes/sec of the group-commit journal (ui/services/wal.py) for
+several group-commit windows, with concurrent writers shaped like
+meeting_tracker's (append under a lock, wait for the fsync outside it).
+
+    python -m benchmarks.wal_bench                   # 8 writers x 200 writes
+    python -m benchmarks.wal_bench 16 500
+"""
+import json, os, sys, tempfile, threading, time, uuid
+
+from ui.services.wal import GroupCommitLog
+
+WINDOWS_MS = (0, 0.5, 1, 2, 5, 10)
+
+
+def _op() -> bytes:
+    return (json.dumps({"op": "add", "record": {
+        "id": uuid.uuid4().hex, "title": "Sprint review", "status": "Pending",
+    }}) + "\n").encode()
+
+
+def run(window_ms: float, writers: int, writes: int, fsync: bool = True) -> dict:
+    with tempfile.TemporaryDirectory() as d:
+        log  = GroupCommitLog(os.path.join(d, "bench.jsonl"), window_ms, fsync)
+        lock = threading.Lock()
+
+        def writer():
+            for _ in range(writes):
+                with lock:
+                    ticket = log.append(_op())
+                log.wait(ticket)
+
+        threads = [threading.Thread(target=writer) for _ in range(writers)]
+        t0 = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        secs = time.perf_counter() - t0
+        log.close()
+    n = writers * writes
+    return {"writes_per_sec": n / secs, "fsyncs": log.stats["fsyncs"],
+            "writes_per_fsync": n / max(1, log.stats["fsyncs"])}
+
+
+def main(writers: int, writes: int) -> None:
+    print(f"{writers} writers x {writes} writes, fsync on")
+    print(f"  {'window ms':>10}{'writes/s':>12}{'fsyncs':>9}{'writes/fsync':>14}")
+    for w in WINDOWS_MS:
+        r = run(w, writers, writes)
+        print(f"  {w:>10}{r['writes_per_sec']:>12.0f}{r['fsyncs']:>9}{r['writes_per_fsync']:>14.1f}")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:3]]
+    main(*(args + [8, 200][len(args):]))
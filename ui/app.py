@@ -154,7 +154,9 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from ui.utils.session_state import init_session_state, add_log, sync_data_from_files
-from ui.services.meeting_tracker import get_meetings_stats, get_emails_stats
+from ui.services.meeting_tracker import get_meetings_stats, get_emails_stats, cache_stats
+from ui.services.retention import start_retention, summaries_since
+from ui.services.google_status import google_status
 
 logging.basicConfig(
     level=logging.INFO,
@@ -163,9 +165,18 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # ── SESSION + DATA ────────────────────────────────────────────────────────────
+_cache_at_start = cache_stats()
 init_session_state()
 sync_data_from_files()
 
+# ── RETENTION ─────────────────────────────────────────────────────────────────
+# Runs in its own thread; summaries of finished runs are logged per session.
+start_retention()
+_retention_msgs, st.session_state.retention_seen = summaries_since(
+    st.session_state.get("retention_seen", 0))
+for _msg in _retention_msgs:
+    add_log(_msg)
+
 
 # ── AGENT INIT ────────────────────────────────────────────────────────────────
 def _try_init_agent() -> None:
@@ -209,7 +220,7 @@ _try_init_agent()
 # ── HEADER ────────────────────────────────────────────────────────────────────
 def _render_header() -> None:
     azure_ok   = bool(os.getenv("AZURE_OPENAI_ENDPOINT") and os.getenv("AZURE_OPENAI_API_KEY"))
-    google_ok  = os.path.exists("credentials.json")
+    google_ok, google_msg = google_status()
     agent_ok   = st.session_state.get("initialized", False)
     deployment = os.getenv("AZURE_OPENAI_DEPLOYMENT", "Not configured")
 
@@ -239,7 +250,7 @@ def _render_header() -> None:
         </div>
         <div style="display:flex;gap:8px;flex-wrap:wrap;align-items:center;">
             {badge(azure_ok,  "Azure Connected",  "Azure Missing")}
-            {badge(google_ok, "Google Connected", "No Google Creds", warn=True)}
+            {badge(google_ok, "Google Connected", f"Google: {google_msg}", warn=True)}
             {badge(agent_ok,  "Agent Ready",      "Agent Not Ready")}
             <span style="background:#1e3a5f;color:#93c5fd;padding:3px 10px;
                 border-radius:20px;font-size:0.75rem;font-weight:700;">
@@ -323,4 +334,12 @@ with tab_logs:
     render_logs()
 
 with tab_settings:
-    render_settings()
\ No newline at end of file
+    render_settings()
+
+# ── TRACKER CACHE ─────────────────────────────────────────────────────────────
+_cache_at_end = cache_stats()
+logger.debug(
+    f"Tracker cache this rerun: "
+    f"{_cache_at_end['misses'] - _cache_at_start['misses']} parse(s), "
+    f"{_cache_at_end['hits'] - _cache_at_start['hits']} hit(s)"
+)
@@ -19,7 +19,7 @@ from ui.services.agent_runner import (
     stream_agent, resume_agent, extract_email_info_from_action,
 )
 from ui.services.meeting_tracker import (
-    add_meeting, load_meetings, update_meeting_status,
+    add_meeting, find_recent_meeting, update_meeting_status,
 )
 from ui.services.email_service import send_and_save_email
 
@@ -301,6 +301,7 @@ def _process_hitl_resume() -> None:
                 approval_status=approval_status,
                 meeting_id=meeting_id,
                 force_gmail=True,
+                idempotency_key=f"hitl:{interrupt_id}:{subj}",
             )
             lbl = (
                 "\U0001f4e7 Email sent"     if result["sent"] else
@@ -430,14 +431,7 @@ def _default_email_body(title: str, date_val: str, start: str, end: str, loc: st
 
 def _is_duplicate_meeting(title: str, date_val: str) -> bool:
     cutoff = (_dt.datetime.now() - _dt.timedelta(seconds=30)).isoformat()
-    for m in load_meetings():
-        if (
-            m.get("title", "").strip() == title
-            and m.get("date", "")       == date_val
-            and m.get("created_at", "") >= cutoff
-        ):
-            return True
-    return False
+    return find_recent_meeting(title, date_val, cutoff) is not None
 
 
 def _save_meeting_from_event(event: dict) -> None:
@@ -9,7 +9,7 @@ Email Replies Tracker.
 import streamlit as st
 from datetime import datetime, timedelta, timezone
 from ui.utils.session_state import add_log
-from ui.services.meeting_tracker import load_emails, load_meetings
+from ui.services.meeting_tracker import get_emails_stats, query_emails, load_meetings
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -205,11 +205,11 @@ def _availability_badge(body: str) -> tuple:
 # ─────────────────────────────────────────────────────────────────────────────
 # TIME FILTER HELPER
 # ─────────────────────────────────────────────────────────────────────────────
-def _filter_emails_by_time(sent_emails: list, time_filter: str) -> list:
-    if time_filter == "All":
-        return sent_emails
+SENT_STATUSES = ("sent", "delivered")
 
-    now = datetime.now()
+
+def _cutoff_for(time_filter: str):
+    """Start of the selected window, or None for "All"."""
     delta_map = {
         "Last 1 Hour":   timedelta(hours=1),
         "Last 24 Hours": timedelta(hours=24),
@@ -217,20 +217,7 @@ def _filter_emails_by_time(sent_emails: list, time_filter: str) -> list:
         "Last 1 Week":   timedelta(weeks=1),
     }
     delta = delta_map.get(time_filter)
-    if not delta:
-        return sent_emails
-
-    cutoff = now - delta
-    filtered = []
-    for e in sent_emails:
-        sent_at_str = e.get("sent_at", "")
-        try:
-            sent_dt = datetime.fromisoformat(sent_at_str[:19])
-            if sent_dt >= cutoff:
-                filtered.append(e)
-        except Exception:
-            filtered.append(e)  # If parse fails, include it
-    return filtered
+    return datetime.now() - delta if delta else None
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -249,19 +236,11 @@ def render_email_replies() -> None:
         st.error("❌ Gmail service not available. Please check Google credentials in Settings.")
         return
 
-    all_emails  = load_emails()
-    sent_emails = [
-        e for e in all_emails
-        if e.get("status", "").lower() in ("sent", "delivered")
-        and "@" in e.get("to", "")
-    ]
-
-    if not sent_emails:
+    total_sent = get_emails_stats()["sent"]
+    if not total_sent:
         st.info("No sent emails found. Send a meeting invitation first.")
         return
 
-    sent_emails = sorted(sent_emails, key=lambda x: x.get("sent_at", ""), reverse=True)
-
     # ── TIME FILTER ───────────────────────────────────────────────────────────
     st.markdown("#### Filter by Send Time")
     time_options = ["All", "Last 1 Hour", "Last 24 Hours", "Last 2 Days", "Last 1 Week"]
@@ -275,13 +254,17 @@ def render_email_replies() -> None:
         label_visibility="collapsed",
     )
 
-    filtered_emails = _filter_emails_by_time(sent_emails, selected_filter)
+    filtered_emails = [
+        e for e in query_emails(status=SENT_STATUSES, since=_cutoff_for(selected_filter))
+        if "@" in e.get("to", "")
+    ]
+    filtered_emails = sorted(filtered_emails, key=lambda x: x.get("sent_at", ""), reverse=True)
 
     if not filtered_emails:
         st.warning(f"No emails found in the selected time range: **{selected_filter}**")
         return
 
-    st.caption(f"Showing **{len(filtered_emails)}** of **{len(sent_emails)}** sent emails")
+    st.caption(f"Showing **{len(filtered_emails)}** of **{total_sent}** sent emails")
     st.divider()
 
     # ── FETCH + CLEAR BUTTONS ─────────────────────────────────────────────────
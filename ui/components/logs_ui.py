@@ -3,18 +3,18 @@ ui/components/logs_ui.py
 History & Logs — meetings, emails (with delete button), contacts, system logs.
 FIX: Email tab mein har row mein delete button added.
 """
-import os, csv
 import streamlit as st
 import pandas as pd
-from ui.services.meeting_tracker import load_meetings, load_emails, delete_email_record
+from datetime import datetime, timedelta
+from ui.services.meeting_tracker import list_meetings, list_emails, delete_email_record, email_preview, get_meetings_stats, get_emails_stats
 from ui.utils.session_state import add_log, sync_data_from_files
+from ui.components.pagination import PAGE_SIZE, page_cursor, render_pager
+from app.agents.data.contact_store import get_contact_store
 
 
 def _load_contacts() -> list:
-    p = "data/contacts.csv"
-    if not os.path.exists(p): return []
     try:
-        with open(p,"r",encoding="utf-8") as f: return list(csv.DictReader(f))
+        return get_contact_store().all()
     except Exception as e:
         add_log(f"contact load error: {e}","ERROR"); return []
 
@@ -40,13 +40,12 @@ def render_logs() -> None:
 # MEETINGS
 # ─────────────────────────────────────────────────────────────────────────────
 def _render_meetings() -> None:
-    meetings = load_meetings()
-    sc = sum(1 for m in meetings if m.get("source")=="scheduler")
-    ac = sum(1 for m in meetings if m.get("source") in ("agent","chat"))
+    stats = get_meetings_stats()
+    total, sc, ac = stats["total"], stats["from_scheduler"], stats["from_agent"]
 
     hc1, hc2 = st.columns([6,1])
     hc1.markdown(
-        f"**{len(meetings)} total** &nbsp;·&nbsp; "
+        f"**{total} total** &nbsp;·&nbsp; "
         f"<span style='color:#059669;font-size:0.85rem;'>📋 Scheduler: {sc}</span>"
         f"&nbsp;·&nbsp;"
         f"<span style='color:#2563eb;font-size:0.85rem;'>🤖 Agent: {ac}</span>",
@@ -55,7 +54,7 @@ def _render_meetings() -> None:
     if hc2.button("🔄", key="ref_mtg", help="Refresh"):
         sync_data_from_files(); st.rerun()
 
-    if not meetings:
+    if not total:
         st.info("📭 No meetings yet."); return
 
     cs, cf, csr = st.columns([3,2,2])
@@ -63,17 +62,14 @@ def _render_meetings() -> None:
     status_f = cf.selectbox("Status", ["All","Pending","Approved","Rejected"], key="lmtg_st")
     source_f = csr.selectbox("Source", ["All Sources","📋 Scheduler","🤖 Agent/Chat"], key="lmtg_src")
 
-    filtered = meetings[:]
-    if search:
-        ql = search.lower()
-        filtered = [m for m in filtered
-                    if ql in m.get("title","").lower()
-                    or any(ql in a.lower() for a in m.get("attendees",[]))
-                    or ql in m.get("location","").lower()]
-    if status_f != "All":       filtered = [m for m in filtered if m.get("status")==status_f]
-    if source_f=="📋 Scheduler": filtered = [m for m in filtered if m.get("source")=="scheduler"]
-    elif source_f=="🤖 Agent/Chat": filtered = [m for m in filtered if m.get("source") in ("agent","chat")]
-    filtered = sorted(filtered, key=lambda x: x.get("created_at",""), reverse=True)
+    filters = {
+        "search": search or None,
+        "status": status_f if status_f != "All" else None,
+        "source": {"📋 Scheduler":"scheduler","🤖 Agent/Chat":("agent","chat")}.get(source_f),
+    }
+    filtered, next_cursor = list_meetings(page_cursor("lmtg", filters), PAGE_SIZE, filters)
+    if not filtered:
+        st.info("📭 No meetings match filters."); return
 
     SI = {"Approved":"🟢","Pending":"🟡","Rejected":"🔴"}
     SL = {"scheduler":"📋 Scheduler","agent":"🤖 Agent","chat":"🤖 Agent"}
@@ -101,46 +97,44 @@ def _render_meetings() -> None:
         return [""]*len(row)
     st.dataframe(df.style.apply(_hl, axis=1),
                  use_container_width=True, height=420, hide_index=True)
-    st.caption(f"Showing {len(filtered)} of {len(meetings)} meetings")
-    st.download_button("⬇️ Export CSV", df.to_csv(index=False),
+    render_pager("lmtg", next_cursor, len(filtered))
+    st.download_button("⬇️ Export Page CSV", df.to_csv(index=False),
                        "meetings_history.csv","text/csv", key="dl_mtg")
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # EMAILS — with delete button
 # ─────────────────────────────────────────────────────────────────────────────
+EMAIL_PERIODS = {"Last 7 Days":7, "Last 30 Days":30, "Last 90 Days":90, "All Time":None}
+
 def _render_emails() -> None:
-    emails = load_emails()
+    total = get_emails_stats()["total"]
 
     eh1, eh2 = st.columns([5,1])
-    eh1.caption(f"Total **{len(emails)}** email records")
+    eh1.caption(f"Total **{total}** email records")
     if eh2.button("🔄 Refresh", key="ref_email"):
         sync_data_from_files(); st.rerun()
 
-    if not emails:
+    if not total:
         st.info("📭 No emails recorded yet."); return
 
     # Filters
-    fs1, fs2, fs3 = st.columns([3,2,2])
+    fs1, fs2, fs3, fs4 = st.columns([3,2,2,2])
     search   = fs1.text_input("Search", placeholder="To, subject...", key="lemail_q")
     status_f = fs2.selectbox("Status", ["All","sent","rejected","failed","pending"], key="lemail_st")
     source_f = fs3.selectbox("Source", ["All","Agent (Chat)","Scheduler","HITL"], key="lemail_src")
+    period   = fs4.selectbox("Period", list(EMAIL_PERIODS), index=1, key="lemail_period")
     src_map  = {"All":None,"Agent (Chat)":"agent","Scheduler":"scheduler","HITL":"hitl"}
 
-    filtered = emails[:]
-    if search:
-        ql = search.lower()
-        filtered = [e for e in filtered
-                    if ql in e.get("to","").lower() or ql in e.get("subject","").lower()]
-    if status_f != "All":
-        filtered = [e for e in filtered
-                    if e.get("status","").lower() == status_f.lower()]
-    src = src_map.get(source_f)
-    if src:
-        filtered = [e for e in filtered if e.get("source") == src]
-    filtered = sorted(filtered, key=lambda x: x.get("sent_at",""), reverse=True)
-
-    st.caption(f"Showing **{len(filtered)}** of {len(emails)} emails")
+    days    = EMAIL_PERIODS[period]
+    filters = {
+        "search": search or None,
+        "status": status_f if status_f != "All" else None,
+        "source": src_map.get(source_f),
+        # Day-granular so the page-1 reset key stays stable across reruns
+        "since":  (datetime.now() - timedelta(days=days)).date().isoformat() if days else None,
+    }
+    filtered, next_cursor = list_emails(page_cursor("lemail", filters), PAGE_SIZE, filters)
 
     if not filtered:
         st.info("📭 No emails match filters."); return
@@ -198,14 +192,16 @@ def _render_emails() -> None:
                     add_log(f"Email record deleted: {eid[:8]}")
                     st.rerun()
 
+    render_pager("lemail", next_cursor, len(filtered))
+
     # Export
     export = [{
         "Status": e.get("status",""), "Sent At": e.get("sent_at","")[:16],
         "To": e.get("to",""), "Subject": e.get("subject",""),
         "Source": e.get("source",""), "Meeting Linked": "Yes" if e.get("meeting_id") else "No",
-        "Body Preview": (e.get("body_preview","") or "")[:80],
+        "Body Preview": email_preview(e, 80),
     } for e in filtered]
-    st.download_button("⬇️ Export CSV", pd.DataFrame(export).to_csv(index=False),
+    st.download_button("⬇️ Export Page CSV", pd.DataFrame(export).to_csv(index=False),
                        "emails_history.csv","text/csv", key="dl_emails")
 
 
@@ -213,21 +209,47 @@ def _render_emails() -> None:
 # CONTACTS
 # ─────────────────────────────────────────────────────────────────────────────
 def _render_contacts() -> None:
-    os.makedirs("data", exist_ok=True)
-    fp = "data/contacts.csv"
-    df = pd.read_csv(fp) if os.path.exists(fp) else pd.DataFrame(columns=["email","name","designation"])
+    store = get_contact_store()
+    try:
+        df = pd.DataFrame(store.all(), columns=store.fields, dtype=str)
+    except Exception as e:
+        add_log(f"contact load error: {e}","ERROR")
+        df = pd.DataFrame(columns=store.fields, dtype=str)
     st.markdown("### 📇 Contacts Manager")
     edited = st.data_editor(df, num_rows="dynamic", use_container_width=True, height=400, key="contacts_ed")
     st.caption(f"Total Contacts: {len(edited)}")
     cc1, cc2 = st.columns(2)
     with cc1:
         if st.button("💾 Save Contacts", use_container_width=True):
-            edited.to_csv(fp, index=False)
+            store.replace(edited.fillna("").to_dict("records"), list(edited.columns))
             st.success("Contacts saved!")
     with cc2:
         st.download_button("⬇️ Export CSV", edited.to_csv(index=False),
                            "contacts_export.csv","text/csv",
                            use_container_width=True, key="dl_contacts")
+    _render_contact_import(store)
+
+
+def _render_contact_import(store) -> None:
+    from app.agents.data.importer import import_contacts
+    with st.expander("📥 Bulk Import (CSV / vCard)"):
+        st.caption("CSV with email, name, designation columns, or a .vcf export. "
+                   "Invalid and already-known emails are skipped; the batch is saved in one write.")
+        up = st.file_uploader("Contacts file", type=["csv","vcf","vcard"], key="contacts_import")
+        dry = st.checkbox("Dry run (validate only)", key="contacts_import_dry")
+        if up is not None and st.button("📥 Import", key="contacts_import_btn", use_container_width=True):
+            status = st.empty()
+            try:
+                r = import_contacts(up, store=store, dry_run=dry,
+                                    progress=lambda p: status.caption(f"{p['read']:,} rows read · {p['rows_per_sec']:,.0f} rows/s"))
+            except Exception as e:
+                add_log(f"contact import error: {e}","ERROR"); st.error(f"❌ Import failed: {e}"); return
+            msg = (f"{'Would add' if dry else 'Added'} {r['added']:,} · duplicates {r['duplicates']:,} · "
+                   f"invalid {r['invalid']:,} — {r['read']:,} rows in {r['seconds']:.2f}s ({r['rows_per_sec']:,.0f} rows/s)")
+            add_log(f"Contact import ({up.name}): {msg}")
+            st.success(msg)
+            if r["errors"]:
+                st.code("\n".join(r["errors"]))
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -4,19 +4,17 @@ Meeting Scheduler.
 FIX: Email sirf Approve karne pe jati hai (Schedule karne pe nahi)
 FIX: Approve pe original invitation email body use hoti hai
 """
-import os, csv
 import streamlit as st
 from datetime import date, time, timedelta
 from ui.utils.session_state import add_log, add_message, get_agent_config, sync_data_from_files
-from ui.services.meeting_tracker import add_meeting, load_meetings, update_meeting_status, delete_meeting
-from ui.services.email_service import send_and_save_email
+from ui.services.meeting_tracker import add_meeting, list_meetings, get_meetings_stats, update_meeting_status, delete_meeting
+from ui.services.email_service import send_and_save_emails
+from ui.components.pagination import PAGE_SIZE, page_cursor, render_pager
+from app.agents.data.contact_store import get_contact_store
 
 
 def _load_contacts() -> list:
-    p = "data/contacts.csv"
-    if not os.path.exists(p): return []
-    try:
-        with open(p,"r",encoding="utf-8") as f: return list(csv.DictReader(f))
+    try: return get_contact_store().all()
     except Exception as e: add_log(f"contact load: {e}","ERROR"); return []
 
 def _parse_emails(text: str) -> list:
@@ -150,8 +148,8 @@ def _save_meeting(title, meeting_date, start_time, end_time,
 # HISTORY
 # ─────────────────────────────────────────────────────────────────────────────
 def _render_history() -> None:
-    meetings = load_meetings()
-    if not meetings:
+    total = get_meetings_stats()["total"]
+    if not total:
         st.info("📭 No meetings yet."); return
 
     c1, c2, c3 = st.columns([2,2,4])
@@ -162,17 +160,13 @@ def _render_history() -> None:
     q   = c3.text_input("Search", placeholder="🔍 Title or attendee...",
                         key="hist_q", label_visibility="collapsed")
 
-    filtered = meetings[:]
-    if sf != "All":              filtered = [m for m in filtered if m.get("status")==sf]
-    if src=="Via Scheduler":     filtered = [m for m in filtered if m.get("source")=="scheduler"]
-    elif src=="Via Chat/Agent":  filtered = [m for m in filtered if m.get("source") in ("agent","chat")]
-    if q:
-        ql = q.lower()
-        filtered = [m for m in filtered
-                    if ql in m.get("title","").lower()
-                    or any(ql in a.lower() for a in m.get("attendees",[]))]
-    filtered = sorted(filtered, key=lambda x: x.get("created_at",""), reverse=True)
-    st.caption(f"Showing **{len(filtered)}** of **{len(meetings)}** meetings")
+    filters = {
+        "status": sf if sf != "All" else None,
+        "source": {"Via Scheduler":"scheduler","Via Chat/Agent":("agent","chat")}.get(src),
+        "search": q or None,
+    }
+    filtered, next_cursor = list_meetings(page_cursor("hist", filters), PAGE_SIZE, filters)
+    st.caption(f"Showing **{len(filtered)}** of **{total}** meetings")
 
     ICON = {"Approved":"🟢","Pending":"🟡","Rejected":"🔴"}
     for m in filtered:
@@ -232,6 +226,8 @@ def _render_history() -> None:
             if dc.button("🗑️", key=f"del_{mid}", use_container_width=True, help="Delete"):
                 delete_meeting(mid); sync_data_from_files(); st.rerun()
 
+    render_pager("hist", next_cursor, len(filtered))
+
 
 def _send_invitation_emails(meeting: dict) -> int:
     """
@@ -252,14 +248,14 @@ def _send_invitation_emails(meeting: dict) -> int:
             meeting.get("location",""),
         )
 
+    results = send_and_save_emails(
+        atts, subject, body,
+        source="scheduler", approval_status="approved",
+        meeting_id=meeting.get("id"),
+        force_gmail=True,
+    )
     sent_count = 0
-    for to in atts:
-        res = send_and_save_email(
-            to=to, subject=subject, body=body,
-            source="scheduler", approval_status="approved",
-            meeting_id=meeting.get("id"),
-            force_gmail=True,
-        )
+    for to, res in zip(atts, results):
         if res["sent"]:
             sent_count += 1
             add_log(f"Invitation email sent to {to} for meeting: {meeting.get('title')}")
@@ -284,11 +280,11 @@ def _send_rejection_email(meeting: dict) -> None:
         f"We apologize for any inconvenience.\n\nBest regards,\nMeeting Organizer"
     )
 
-    for to in atts:
-        res = send_and_save_email(
-            to=to, subject=subj, body=bod,
-            source="scheduler", approval_status="rejected",
-            meeting_id=meeting.get("id"),
-            force_gmail=False,
-        )
+    results = send_and_save_emails(
+        atts, subj, bod,
+        source="scheduler", approval_status="rejected",
+        meeting_id=meeting.get("id"),
+        force_gmail=False,
+    )
+    for to, res in zip(atts, results):
         add_log(f"Rejection email to={to} sent={res['sent']}")
\ No newline at end of file
@@ -0,0 +1,28 @@
+"""
+ui/components/pagination.py
+Prev/Next pager for the history tables — walks meeting_tracker.list_meetings /
+list_emails cursors, so each rerun renders a single page.
+"""
+import streamlit as st
+
+PAGE_SIZE = 50
+
+
+def page_cursor(key: str, filters: dict):
+    """Cursor of the page to show for table `key`; back to page 1 when the filters change."""
+    state = st.session_state.setdefault(f"pager_{key}", {"filters": None, "stack": [None]})
+    if state["filters"] != filters:
+        state["filters"], state["stack"] = dict(filters), [None]
+    return state["stack"][-1]
+
+
+def render_pager(key: str, next_cursor, shown: int) -> None:
+    state = st.session_state[f"pager_{key}"]
+    page  = len(state["stack"])
+    c1, c2, c3 = st.columns([1,3,1])
+    if c1.button("◀ Prev", key=f"pg_prev_{key}", disabled=page == 1, use_container_width=True):
+        state["stack"].pop(); st.rerun()
+    c2.markdown(f"<div style='text-align:center;color:#718096;font-size:0.8rem;padding-top:8px;'>"
+                f"Page {page} · {shown} shown</div>", unsafe_allow_html=True)
+    if c3.button("Next ▶", key=f"pg_next_{key}", disabled=not next_cursor, use_container_width=True):
+        state["stack"].append(next_cursor); st.rerun()
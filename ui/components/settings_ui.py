@@ -6,6 +6,7 @@ import os
 import sys
 import streamlit as st
 from ui.utils.session_state import add_log, reinit_agent, sync_data_from_files
+from ui.services.google_status import STATE_LABELS, connection_states
 
 
 def render_settings() -> None:
@@ -63,18 +64,14 @@ def _render_connections() -> None:
 
     st.divider()
     st.markdown("#### 🔑 Google APIs (Calendar & Gmail)")
-    cred_exists  = os.path.exists("credentials.json")
-    token_exists = os.path.exists("token.json")
-
-    gcol1, gcol2 = st.columns(2)
-    with gcol1:
-        if cred_exists:  st.success("✅ `credentials.json` found")
-        else:            st.error("❌ `credentials.json` not found")
-    with gcol2:
-        if token_exists: st.success("✅ `token.json` found (OAuth authorized)")
-        else:            st.warning("⚠️ `token.json` not found — will be created on first use")
-
-    if not cred_exists:
+    states = connection_states()
+    if not states:
+        st.error("❌ Google client libraries are not installed (`pip install -r requirements.txt`).")
+        return
+    for name, state in states.items():
+        _render_google_connection(name, state)
+
+    if any(s["state"] == "not_configured" for s in states.values()):
         with st.expander("📖 How to get credentials.json"):
             st.markdown("""
             1. Go to [Google Cloud Console](https://console.cloud.google.com/)
@@ -84,31 +81,56 @@ def _render_connections() -> None:
             5. Click **Create Credentials → OAuth 2.0 Client ID**
             6. Choose **Desktop Application**
             7. Download the JSON and rename it `credentials.json`
-            8. Place it in your project root and restart the app
+            8. Place it in your project root and click **Re-check**
             """)
 
-    if cred_exists:
-        if st.button("🧪 Test Google Calendar Connection", type="primary"):
-            with st.spinner("Testing Google Calendar API..."):
-                try:
-                    import subprocess
-                    result = subprocess.run(
-                        [sys.executable, "-c",
-                         "import sys; sys.path.insert(0, '.'); "
-                         "from app.agents.calendar.tools import get_calendar_service; "
-                         "s = get_calendar_service(); print('SUCCESS' if s else 'FAILED')"],
-                        capture_output=True, text=True, timeout=20,
-                    )
-                    if "SUCCESS" in result.stdout:
-                        st.success("✅ Google Calendar connected successfully!")
-                        add_log("Google Calendar test: PASS")
-                    else:
-                        st.error(f"❌ Test failed:\n```\n{result.stderr[:400]}\n```")
-                        add_log("Google Calendar test: FAIL", "ERROR")
-                except subprocess.TimeoutExpired:
-                    st.warning("⚠️ Test timed out. Google OAuth browser window may have opened.")
-                except Exception as e:
-                    st.error(f"❌ Test error: {e}")
+
+def _render_google_connection(name: str, s: dict) -> None:
+    """One Google connection: state from the connection manager + re-check / authorize."""
+    label = STATE_LABELS.get(s["state"], s["state"])
+    msg   = f"**{s['label']}** — {label}" + (f"  \n`{s['detail']}`" if s["detail"] else "")
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        if s["state"] == "connected":        st.success(f"✅ {msg}")
+        elif s["ok"]:                        st.info(f"🔑 {msg}")
+        elif s["state"] == "not_configured": st.error(f"❌ {msg}")
+        else:                                st.warning(f"⚠️ {msg}")
+        if s["retry_in"]:
+            st.caption(f"Result cached — tools skip this connection for {s['retry_in']:.0f}s more")
+    with col2:
+        if st.button("🔄 Re-check", key=f"google_recheck_{name}", use_container_width=True):
+            _check_google(name, s["label"])
+        if s["state"] in ("needs_authorization", "error") and st.button(
+                "🔐 Authorize", key=f"google_auth_{name}", type="primary", use_container_width=True,
+                help="Opens the Google consent page in a browser on the machine running this app."):
+            _authorize_google(name, s["label"])
+
+
+def _check_google(name: str, label: str) -> None:
+    from app.core.google_services import Unavailable, get_service, invalidate
+    invalidate(name)
+    with st.spinner(f"Checking {label}..."):
+        try:
+            get_service(name)
+            add_log(f"{label} check: PASS")
+        except Unavailable as e:
+            add_log(f"{label} check: {e.state} — {e}", "WARNING")
+        except Exception as e:
+            add_log(f"{label} check error: {e}", "ERROR")
+    st.rerun()
+
+
+def _authorize_google(name: str, label: str) -> None:
+    from app.core.google_services import AUTHORIZE_TIMEOUT, authorize
+    with st.spinner(f"Waiting up to {AUTHORIZE_TIMEOUT}s for Google consent in the browser..."):
+        try:
+            authorize(name)
+            add_log(f"{label} authorized")
+        except Exception as e:
+            st.error(f"❌ {label} authorization failed: {e}")
+            add_log(f"{label} authorization failed: {e}", "ERROR")
+            return
+    st.rerun()
 
 
 def _render_agent_config() -> None:
@@ -208,6 +230,21 @@ def _render_diagnostics() -> None:
             exists = os.path.exists(path)
             results.append((f"File: {desc}", exists, "✓ Found" if exists else "✗ Missing", ""))
 
+        from ui.services.meeting_tracker import cache_stats
+        cs = cache_stats()
+        results.append(("Tracker load cache", True,
+                        f"{cs['hits']} hits · {cs['misses']} parses · {cs['entries']} cached", ""))
+
+        try:
+            from app.agents.calendar.event_cache import cache_stats as calendar_cache_stats
+            ec = calendar_cache_stats()
+            results.append(("Calendar event cache", ec["errors"] == 0,
+                            f"{ec['hit_ratio']:.0%} hit ratio ({ec['hits']}/{ec['reads']}) · "
+                            f"{ec['full_syncs']} full / {ec['incremental_syncs']} delta syncs · "
+                            f"avg {ec['avg_sync_ms']:.0f} ms", f"{ec['errors']} sync error(s), see logs"))
+        except ImportError:
+            pass
+
         for label, ok, detail, hint in results:
             icon   = "✅" if ok else "❌"
             color  = "#f0fdf4" if ok else "#fef2f2"
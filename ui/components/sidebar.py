@@ -5,6 +5,8 @@ Sidebar — FIX: collapse/expand button + status indicators always visible.
 import os
 import streamlit as st
 from ui.utils.session_state import clear_session, reinit_agent, add_log, sync_data_from_files
+from ui.services.meeting_tracker import get_meetings_stats, get_emails_stats
+from ui.services.google_status import google_status
 
 
 def render_sidebar() -> None:
@@ -57,12 +59,12 @@ def _render_status():
         os.getenv("AZURE_OPENAI_API_KEY") and
         os.getenv("AZURE_OPENAI_DEPLOYMENT")
     )
-    google_ok = os.path.exists("credentials.json")
+    google_ok, google_msg = google_status()
     agent_ok  = st.session_state.get("initialized", False)
     init_err  = st.session_state.get("init_error")
 
     _status_row("Azure OpenAI", azure_ok)
-    _status_row("Google APIs",  google_ok, "No Credentials" if not google_ok else "")
+    _status_row("Google APIs",  google_ok, google_msg)
     _status_row("AI Agent",     agent_ok,  "Not Ready"      if not agent_ok  else "")
 
     if agent_ok:
@@ -122,17 +124,15 @@ def _render_stats():
         text-transform:uppercase;letter-spacing:1px;margin-bottom:8px;">
         Quick Stats</div>""", unsafe_allow_html=True)
 
-    meetings = st.session_state.get("meetings", [])
-    emails   = st.session_state.get("emails_sent", [])
+    mtg      = get_meetings_stats()
+    em       = get_emails_stats()
     messages = st.session_state.get("messages", [])
-    pending  = sum(1 for m in meetings if m.get("status")=="Pending")
-    approved = sum(1 for m in meetings if m.get("status")=="Approved")
 
     stats = [
-        ("📅","Meetings",  len(meetings)),
-        ("📧","Emails",    len(emails)),
-        ("🟡","Pending",   pending),
-        ("🟢","Approved",  approved),
+        ("📅","Meetings",  mtg["total"]),
+        ("📧","Emails",    em["total"]),
+        ("🟡","Pending",   mtg["pending"]),
+        ("🟢","Approved",  mtg["approved"]),
         ("💬","Messages",  len(messages)),
     ]
     cols = st.columns(2)
@@ -1,8 +1,10 @@
 """ui/components/status_dashboard.py"""
 import streamlit as st
 import pandas as pd
-from ui.services.meeting_tracker import load_meetings, load_emails, update_meeting_status, get_meetings_stats, get_emails_stats, save_email_record
+from datetime import datetime, timedelta
+from ui.services.meeting_tracker import load_meetings, list_emails, update_meeting_status, get_meetings_stats, get_emails_stats, save_email_record
 from ui.utils.session_state import add_log, sync_data_from_files
+from ui.components.pagination import PAGE_SIZE, page_cursor, render_pager
 
 def render_dashboard():
     st.markdown("""<h2 style="font-family:'Georgia',serif;color:#1a365d;margin:0 0 4px 0;font-size:1.5rem;">
@@ -82,23 +84,25 @@ def _render_meetings_dashboard():
             st.success(f"✅ Updated to **{new_st}**"); st.rerun()
         else: st.error("Update failed.")
 
+PERIODS = {"Last 7 Days":7, "Last 30 Days":30, "Last 90 Days":90, "All Time":None}
+
 def _render_agent_emails_dashboard():
-    all_emails = load_emails()
-    agent_emails = [e for e in all_emails if e.get("source") in ("agent","hitl")]
     st.markdown("""<div style="background:#f0f4ff;border-radius:10px;padding:10px 16px;
         border-left:4px solid #3b82f6;margin-bottom:12px;font-size:0.85rem;color:#1e40af;">
         ℹ️ Emails attempted via Chat tab.
         <strong>✅ Sent</strong> = approved &amp; delivered.
         <strong>❌ Rejected</strong> = rejected in HITL panel.</div>""", unsafe_allow_html=True)
-    q = st.text_input("Search", placeholder="Recipient or subject...", key="email_search_agent")
-    filtered = agent_emails[:]
-    if q:
-        ql=q.lower()
-        filtered=[e for e in filtered if ql in e.get("to","").lower() or ql in e.get("subject","").lower()]
-    filtered=sorted(filtered,key=lambda x:x.get("sent_at",""),reverse=True)
-    if filtered:
-        st.caption(f"Showing **{len(filtered)}** of {len(agent_emails)} agent emails")
-        _render_email_table(filtered, key_suffix="agent")
+    c1,c2 = st.columns([3,1])
+    with c1: q      = st.text_input("Search", placeholder="Recipient or subject...", key="email_search_agent")
+    with c2: period = st.selectbox("Period", list(PERIODS), index=1, key="email_period_agent")
+    days = PERIODS[period]
+    em   = get_emails_stats()
+    # Range-scoped, paged load — archive segments outside the period are never opened
+    filters = {"source": ("agent","hitl"), "search": q or None,
+               "since": (datetime.now()-timedelta(days=days)).date().isoformat() if days else None}
+    if em["from_chat"]+em["from_hitl"]:
+        st.caption(f"{em['from_chat']+em['from_hitl']} agent emails in total · showing {period.lower()}")
+        _render_email_table(filters, key_suffix="agent")
     else:
         st.info("📭 No agent emails yet.")
     st.divider()
@@ -115,9 +119,11 @@ def _render_agent_emails_dashboard():
             sync_data_from_files(); add_log(f"Manual email saved: {manual_to}"); st.success(f"✅ Saved — {manual_to}"); st.rerun()
         else: st.error("To and Subject are required.")
 
-def _render_email_table(emails, key_suffix=""):
+def _render_email_table(filters, key_suffix=""):
+    emails, next_cursor = list_emails(page_cursor(f"dash_{key_suffix}", filters), PAGE_SIZE, filters)
+    if not emails: st.info("📭 No emails match filters."); return
     rows=[]
-    for e in emails[:100]:
+    for e in emails:
         status=e.get("status","Sent")
         sd = "✅ Sent" if status.lower()=="sent" else ("❌ Rejected" if status.lower()=="rejected" else ("❌ Failed" if status.lower()=="failed" else f"⏳ {status}"))
         rows.append({"📅 Sent At":e.get("sent_at","")[:16],"📬 To":e.get("to",""),
@@ -131,6 +137,7 @@ def _render_email_table(emails, key_suffix=""):
         if "Failed" in s:   return ["background-color:#fef2f2"]*len(row)
         return [""]*len(row)
     st.dataframe(df.style.apply(hl,axis=1), use_container_width=True, height=320, hide_index=True)
+    render_pager(f"dash_{key_suffix}", next_cursor, len(emails))
     csv=pd.DataFrame([{"sent_at":e.get("sent_at"),"to":e.get("to"),"subject":e.get("subject"),
         "status":e.get("status"),"source":e.get("source"),"meeting_id":e.get("meeting_id")} for e in emails]).to_csv(index=False)
     st.download_button("⬇️ Download CSV", csv, f"emails_{key_suffix}.csv","text/csv", key=f"dl_emails_{key_suffix}")
\ No newline at end of file
@@ -0,0 +1,137 @@
+"""
+ui/services/body_store.py
+Content-addressed store for email bodies: data/email_bodies/<aa>/<sha256>.txt.
+Email records keep only the body_hash, so a body sent to many recipients
+(invitation fan-out) is written once; previews are cut from it on demand.
+Bodies no record references any more are removed by sweep(); the JSON
+tracker backend tracks references with ref()/unref() (see
+meeting_tracker's BODY STORE UPKEEP).
+"""
+import hashlib, os, logging, threading, time
+from functools import lru_cache
+from typing import Iterable, Optional
+
+logger   = logging.getLogger(__name__)
+BODY_DIR = os.path.join("data", "email_bodies")
+GC_GRACE_SECONDS = 600     # a put() this recent may belong to a record not saved yet
+
+_lock = threading.Lock()
+_refs: Optional[dict] = None     # body_hash -> records using it; None until load_refs()
+
+
+def body_hash(body: str) -> str:
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+def _path(h: str) -> str:
+    return os.path.join(BODY_DIR, h[:2], h + ".txt")
+
+
+def put(body: str) -> Optional[str]:
+    """Store body (once) and return its hash; None for an empty body."""
+    if not body:
+        return None
+    h = body_hash(body)
+    with _lock:
+        p = _path(h)
+        try:
+            os.utime(p)     # fresh mtime keeps sweep() off it until the record is saved
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(p), exist_ok=True)
+            tmp = f"{p}.{threading.get_ident()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(body)
+            os.replace(tmp, p)
+    return h
+
+
+@lru_cache(maxsize=512)
+def _read(h: str) -> str:
+    with open(_path(h), "r", encoding="utf-8") as f:
+        return f.read()
+
+def get(h: str) -> str:
+    try:
+        return _read(h)
+    except OSError as e:   # not cached — a later put() can still fill it
+        logger.warning(f"Body store: missing {h[:12]} — {e}")
+        return ""
+
+
+def preview(h: str, length: int = 200) -> str:
+    return get(h)[:length]
+
+
+# ── REFERENCE COUNTS ──────────────────────────────────────────────────────────
+def refs_loaded() -> bool:
+    return _refs is not None
+
+def load_refs(hashes: Iterable[str]) -> None:
+    """(Re)count references from every record's body_hash."""
+    global _refs
+    counts: dict = {}
+    for h in hashes:
+        if h:
+            counts[h] = counts.get(h, 0) + 1
+    with _lock:
+        _refs = counts
+
+def drop_refs() -> None:
+    global _refs
+    with _lock:
+        _refs = None
+
+def ref(hashes: Iterable[str]) -> None:
+    """Count new records; a no-op until load_refs() (they are counted then)."""
+    with _lock:
+        if _refs is None:
+            return
+        for h in hashes:
+            if h:
+                _refs[h] = _refs.get(h, 0) + 1
+
+def unref(hashes: Iterable[str]) -> list:
+    """Uncount deleted records; returns the hashes no record uses any more."""
+    zero = []
+    with _lock:
+        if _refs is None:
+            return zero
+        for h in hashes:
+            if not h:
+                continue
+            n = _refs.get(h, 0) - 1
+            if n > 0:
+                _refs[h] = n
+            else:
+                _refs.pop(h, None)
+                zero.append(h)
+    return zero
+
+
+def sweep(live: set, candidates: Optional[Iterable[str]] = None,
+          grace_seconds: float = GC_GRACE_SECONDS) -> int:
+    """Delete stored bodies whose hash is not in live (only those in
+    candidates when given), skipping files touched in the last grace_seconds.
+    Returns how many were removed."""
+    if candidates is None:
+        try:
+            candidates = [n[:-4] for d in os.listdir(BODY_DIR) if len(d) == 2
+                          for n in os.listdir(os.path.join(BODY_DIR, d)) if n.endswith(".txt")]
+        except FileNotFoundError:
+            return 0
+    cutoff  = time.time() - grace_seconds
+    removed = 0
+    with _lock:
+        for h in set(candidates) - live:
+            p = _path(h)
+            try:
+                if os.path.getmtime(p) > cutoff:
+                    continue
+                os.remove(p)
+            except FileNotFoundError:
+                pass
+            else:
+                removed += 1
+    if removed:
+        _read.cache_clear()
+        logger.info(f"Body store: removed {removed} unreferenced bod{'y' if removed == 1 else 'ies'}")
+    return removed
@@ -0,0 +1,89 @@
+"""
+ui/services/dedup_store.py
+Send dedup / idempotency keys for email_service.
+
+Keys are either a hash of (to, subject, status) that expires after
+settings.email_dedup_ttl_seconds, or a caller-supplied idempotency key that
+lives for settings.email_idempotency_ttl_seconds. Claims are O(1) dict
+lookups shared by every Streamlit session in the process; with
+settings.email_dedup_persist the same claim is also taken in the tracker
+SQLite database, so it holds across restarts and other processes.
+"""
+import hashlib, logging, threading, time
+from typing import Optional
+
+from app.core.settings_access import setting
+from ui.services import tracker_db
+
+logger = logging.getLogger(__name__)
+
+PURGE_EVERY = 1024
+
+_lock    = threading.Lock()
+_expiry: dict = {}
+_claims  = 0
+
+
+def _db_path() -> Optional[str]:
+    if not setting("email_dedup_persist", False):
+        return None
+    return setting("tracker_db_path", "data/tracker.db")
+
+
+def dedup_key(to: str, subject: str, status: str) -> str:
+    raw = "\x1f".join((to or "", subject or "", (status or "").lower()))
+    return "h:" + hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+def idempotency_key(key: str) -> str:
+    return "k:" + str(key)
+
+
+def claim(key: str, ttl: Optional[float] = None) -> bool:
+    """True if key was free (and is now held for ttl seconds), False if a
+    live claim already exists — i.e. the caller is a duplicate."""
+    global _claims
+    ttl = setting("email_dedup_ttl_seconds", 30) if ttl is None else ttl
+    now = time.time()
+    with _lock:
+        if _expiry.get(key, 0) > now:
+            return False
+        _expiry[key] = now + ttl
+        _claims += 1
+        if _claims % PURGE_EVERY == 0:
+            _purge(now)
+    db = _db_path()
+    if db:
+        try:
+            if not tracker_db.claim_key(db, key, now + ttl, now):
+                return False
+        except Exception as e:
+            logger.warning(f"Dedup store: persisted claim failed, memory only — {e}")
+    return True
+
+
+def release(key: str) -> None:
+    """Drop a claim so the same send can be retried (e.g. after a failure)."""
+    with _lock:
+        _expiry.pop(key, None)
+    db = _db_path()
+    if db:
+        try:
+            tracker_db.release_key(db, key)
+        except Exception as e:
+            logger.warning(f"Dedup store: release failed — {e}")
+
+
+def _purge(now: float) -> None:
+    for k in [k for k, exp in _expiry.items() if exp <= now]:
+        del _expiry[k]
+    db = _db_path()
+    if db:
+        try:
+            tracker_db.purge_keys(db, now)
+        except Exception as e:
+            logger.warning(f"Dedup store: purge failed — {e}")
+
+
+def clear() -> None:
+    with _lock:
+        _expiry.clear()
@@ -0,0 +1,191 @@
+"""
+ui/services/email_archive.py
+Time-partitioned archive for email records (JSON backend).
+
+Records older than the current segment (month by default) are moved out of
+emails_sent.json into data/emails_archive/<key>.json, where <key> is a prefix
+of sent_at ("2025-03" for months). manifest.json lists every segment with
+its first/last sent_at and status/source counts, so range loads open only
+the overlapping segments and stats never read them. All but the newest
+settings.email_archive_plain_segments segments are gzipped.
+"""
+import gzip, os, logging, threading
+from typing import Optional
+
+from ui.services import serializer
+
+logger      = logging.getLogger(__name__)
+ARCHIVE_DIR = os.path.join("data", "emails_archive")
+MANIFEST    = os.path.join(ARCHIVE_DIR, "manifest.json")
+
+# sent_at prefix length per granularity ("YYYY", "YYYY-MM", "YYYY-MM-DD")
+KEY_LENGTH = {"year": 4, "month": 7, "day": 10}
+
+_lock  = threading.RLock()
+_cache: dict = {}
+
+
+def segment_key(sent_at: str, granularity: str = "month") -> str:
+    return (sent_at or "")[:KEY_LENGTH.get(granularity, 7)]
+
+def _stat_sig(p: str):
+    try:
+        st = os.stat(p)
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+    except FileNotFoundError:
+        return None
+
+def _cached(path: str, reader):
+    sig = _stat_sig(path)
+    with _lock:
+        hit = _cache.get(path)
+        if hit is not None and hit[0] == sig:
+            return hit[1]
+    data = reader(path) if sig is not None else None
+    with _lock:
+        _cache[path] = (sig, data)
+    return data
+
+
+# ── FILES ─────────────────────────────────────────────────────────────────────
+def _read_json(path: str):
+    opener = gzip.open if path.endswith(".gz") else open
+    try:
+        with opener(path, "rb") as f:
+            return serializer.loads(f.read())
+    except (OSError, ValueError) as e:
+        logger.error(f"Archive read {path}: {e}")
+        return None
+
+def _write_json(path: str, data, compress: bool = False) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp    = path + ".tmp"
+    opener = gzip.open if compress else open
+    with opener(tmp, "wb") as f:
+        f.write(serializer.dumps(data))
+    os.replace(tmp, path)
+
+def read_manifest() -> dict:
+    m = _cached(MANIFEST, _read_json)
+    return m if isinstance(m, dict) and "segments" in m else {"segments": {}}
+
+def _segment_records(seg: dict) -> list:
+    data = _cached(os.path.join(ARCHIVE_DIR, seg["file"]), _read_json)
+    return data if isinstance(data, list) else []
+
+
+# ── READS ─────────────────────────────────────────────────────────────────────
+def iter_segments(since: Optional[str] = None, until: Optional[str] = None,
+                  reverse: bool = False):
+    """Yield the record list of each segment overlapping [since, until), in
+    time order (newest first with reverse). Segments are read lazily."""
+    for key, seg in sorted(read_manifest()["segments"].items(), reverse=reverse):
+        if since is not None and seg.get("last", "") < since:
+            continue
+        if until is not None and seg.get("first", "") >= until:
+            continue
+        yield _segment_records(seg)
+
+def load(since: Optional[str] = None, until: Optional[str] = None) -> list:
+    """Records of every segment overlapping [since, until), oldest first.
+    Segments are whole; callers filter records at the edges."""
+    return [r for chunk in iter_segments(since, until) for r in chunk]
+
+def counters() -> dict:
+    """Summed status/source counts of all segments, from the manifest."""
+    c = {"total": 0, "status": {}, "source": {}}
+    for seg in read_manifest()["segments"].values():
+        c["total"] += seg.get("count", 0)
+        for field in ("status", "source"):
+            for k, n in seg.get(field, {}).items():
+                c[field][k] = c[field].get(k, 0) + n
+    return c
+
+
+# ── WRITES ────────────────────────────────────────────────────────────────────
+def _summary(records: list, file: str) -> dict:
+    seg = {"file": file, "count": len(records), "status": {}, "source": {},
+           "first": min(r.get("sent_at", "") for r in records),
+           "last":  max(r.get("sent_at", "") for r in records)}
+    for r in records:
+        for field in ("status", "source"):
+            k = str(r.get(field) or "")
+            seg[field][k] = seg[field].get(k, 0) + 1
+    return seg
+
+def _write_segments(manifest: dict, groups: dict, plain_segments: int) -> None:
+    """Rewrite the given segments, re-gzip by age and publish the manifest."""
+    segs     = manifest["segments"]
+    keep_raw = set(sorted(set(segs) | set(groups))[-plain_segments:] if plain_segments > 0 else ())
+    for key in sorted(set(segs) | set(groups)):
+        old      = segs.get(key)
+        compress = key not in keep_raw
+        file     = f"{key}.json" + (".gz" if compress else "")
+        if key in groups:
+            if not groups[key]:
+                segs.pop(key, None)
+            else:
+                _write_json(os.path.join(ARCHIVE_DIR, file), groups[key], compress)
+                segs[key] = _summary(groups[key], file)
+        elif old and old["file"] != file:
+            # Aged out of the plain window — compress in place
+            _write_json(os.path.join(ARCHIVE_DIR, file), _segment_records(old), compress)
+            segs[key] = {**old, "file": file}
+        if old and old["file"] != segs.get(key, {}).get("file"):
+            try:
+                os.remove(os.path.join(ARCHIVE_DIR, old["file"]))
+            except FileNotFoundError:
+                pass
+    _write_json(MANIFEST, manifest)
+
+def append(records: list, granularity: str = "month", plain_segments: int = 1) -> None:
+    """Merge records into their segments (by id, so a replay after a crash
+    between archive write and hot-file rewrite cannot duplicate rows)."""
+    with _lock:
+        manifest = {"segments": dict(read_manifest()["segments"])}
+        groups: dict = {}
+        for r in records:
+            groups.setdefault(segment_key(r.get("sent_at", ""), granularity), []).append(r)
+        for key, new in groups.items():
+            seg = manifest["segments"].get(key)
+            ids = {r.get("id") for r in new}
+            old = [r for r in _segment_records(seg) if r.get("id") not in ids] if seg else []
+            groups[key] = sorted(old + new, key=lambda r: r.get("sent_at", ""))
+        _write_segments(manifest, groups, plain_segments)
+    logger.info(f"Email archive: moved {len(records)} record(s) into {len(groups)} segment(s)")
+
+def remove_many(records: list, plain_segments: int = 1, removed_out: Optional[list] = None) -> int:
+    """Delete archived records (matched by id); only segments whose time
+    range covers one of their sent_at values are opened. The deleted
+    records are appended to removed_out when given."""
+    ids   = {r.get("id") for r in records}
+    times = [r.get("sent_at", "") for r in records]
+    removed = 0
+    with _lock:
+        manifest = {"segments": dict(read_manifest()["segments"])}
+        groups   = {}
+        for key, seg in manifest["segments"].items():
+            if not any(seg.get("first", "") <= t <= seg.get("last", "") for t in times):
+                continue
+            data = _segment_records(seg)
+            keep = [r for r in data if r.get("id") not in ids]
+            if len(keep) != len(data):
+                groups[key] = keep
+                removed += len(data) - len(keep)
+                if removed_out is not None:
+                    removed_out.extend(r for r in data if r.get("id") in ids)
+        if groups:
+            _write_segments(manifest, groups, plain_segments)
+    return removed
+
+def remove(record_id: str, plain_segments: int = 1) -> Optional[dict]:
+    """Delete one archived record; returns it, or None if not archived."""
+    with _lock:
+        manifest = {"segments": dict(read_manifest()["segments"])}
+        for key, seg in list(manifest["segments"].items()):
+            data = _segment_records(seg)
+            hit  = next((r for r in data if r.get("id") == record_id), None)
+            if hit is not None:
+                _write_segments(manifest, {key: [r for r in data if r is not hit]}, plain_segments)
+                return hit
+    return None
@@ -14,11 +14,12 @@ send_and_save_email() ke parameters:
 """
 import logging
 import os
-from datetime import datetime, timedelta
 from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+STATUS_CHUNK = 50   # force_gmail: sends per bulk status update
+
 
 def send_and_save_email(
     to: str,
@@ -30,80 +31,143 @@ def send_and_save_email(
     supervisor=None,        # unused — kept for backward compat
     agent_config=None,      # unused — kept for backward compat
     force_gmail: bool = False,  # True → directly use Gmail API
+    idempotency_key: Optional[str] = None,
 ) -> dict:
     """
     Returns: {sent, saved, record_id, error}
     """
-    from ui.services.meeting_tracker import save_email_record, load_emails
-    from ui.utils.session_state import add_log, sync_data_from_files
+    return send_and_save_emails(
+        [to], subject, body, source=source, approval_status=approval_status,
+        meeting_id=meeting_id, force_gmail=force_gmail,
+        idempotency_key=idempotency_key,
+    )[0]
 
-    result = {"sent": False, "saved": False, "record_id": None, "error": None}
 
-    # Validate
-    if not to or not str(to).strip():
-        result["error"] = "missing_recipient"
-        add_log("email_service: no recipient", "WARNING")
-        return result
+def send_and_save_emails(
+    recipients: list,
+    subject: str,
+    body: str,
+    source: str = "agent",
+    approval_status: str = "approved",
+    meeting_id: Optional[str] = None,
+    force_gmail: bool = False,
+    idempotency_key: Optional[str] = None,
+) -> list:
+    """
+    Fan-out version of send_and_save_email — har recipient ko send karo,
+    phir saare records ek hi batch write mein save karo.
+    With force_gmail the records are written as "pending" in that one write
+    *before* sending, and the final statuses follow in bulk updates of
+    STATUS_CHUNK sends, so a crash mid-fan-out leaves "pending" records,
+    never sent emails without one.
+    idempotency_key: caller key (per recipient) — repeat calls with the same
+    key are skipped for settings.email_idempotency_ttl_seconds.
+    Returns: one {sent, saved, record_id, error} per recipient, same order.
+    """
+    from app.core.settings_access import setting
+    from ui.services import dedup_store
+    from ui.services.meeting_tracker import save_email_record, save_email_records, update_email_statuses
+    from ui.utils.session_state import add_log, sync_data_from_files
 
-    to      = str(to).strip()
     subject = (str(subject) if subject else "").strip() or "Email from Agent"
     body    = (str(body) if body else "").strip()
-
-    # Dedup — same to+subject+status within 30s
-    try:
-        cutoff = (datetime.now() - timedelta(seconds=30)).isoformat()
-        for e in load_emails():
-            if (
-                e.get("to","").strip()      == to
-                and e.get("subject","").strip() == subject
-                and e.get("sent_at","")         >= cutoff
-                and e.get("status","").lower()  == approval_status.lower()
-            ):
+    key_ttl = setting("email_idempotency_ttl_seconds", 24 * 60 * 60) if idempotency_key else None
+    sends   = force_gmail and approval_status == "approved"
+
+    results, batch = [], []     # batch: (result, entry, dedup key)
+    for to in recipients:
+        result = {"sent": False, "saved": False, "record_id": None, "error": None}
+        results.append(result)
+
+        # Validate
+        if not to or not str(to).strip():
+            result["error"] = "missing_recipient"
+            add_log("email_service: no recipient", "WARNING")
+            continue
+        to = str(to).strip()
+
+        # Dedup — caller key, else same to+subject+status within the TTL
+        key = (dedup_store.idempotency_key(f"{idempotency_key}:{to}") if idempotency_key
+               else dedup_store.dedup_key(to, subject, approval_status))
+        try:
+            if not dedup_store.claim(key, key_ttl):
                 add_log(f"email_service: dedup skip → {to}", "INFO")
                 result["error"] = "duplicate"
                 result["saved"] = True
-                return result
-    except Exception as exc:
-        add_log(f"email_service: dedup error — {exc}", "WARNING")
-
-    # Determine delivery_status
-    if approval_status == "rejected":
-        delivery_status = "rejected"
-
-    elif approval_status == "pending":
-        delivery_status = "pending"
+                continue
+        except Exception as exc:
+            add_log(f"email_service: dedup error — {exc}", "WARNING")
 
-    elif approval_status == "approved":
-        if force_gmail:
-            # Directly use Gmail API (scheduler path)
-            delivery_status = _send_via_gmail(to, subject, body)
-        else:
-            # Chat/HITL path: agent already sent it via tool
-            # We are just recording the fact
-            delivery_status = "sent"
-    else:
-        delivery_status = "pending"
+        status = "pending" if sends else _delivery_status(approval_status, force_gmail, to, subject, body)
+        result["sent"] = status in ("sent", "delivered")
+        batch.append((result, {
+            "to": to, "subject": subject, "body": body,
+            "status": status, "source": source, "meeting_id": meeting_id,
+        }, key))
 
-    result["sent"] = delivery_status in ("sent", "delivered")
+    if not batch:
+        return results
 
-    # Always save
+    # One write for the whole batch; if it fails, retry record by record
     try:
-        record = save_email_record(
-            to=to, subject=subject, body=body,
-            status=delivery_status, source=source, meeting_id=meeting_id,
-        )
-        sync_data_from_files()
-        result["saved"]     = True
-        result["record_id"] = record.get("id") if isinstance(record, dict) else None
+        records = save_email_records([entry for _, entry, _ in batch])
+    except Exception as exc:
+        add_log(f"email_service: save error — {exc}, saving one by one", "ERROR")
+        records = []
+        for result, entry, key in batch:
+            try:
+                records.append(save_email_record(**entry))
+            except Exception as exc:
+                records.append(None)
+                result["error"] = f"save_failed:{exc}"
+                dedup_store.release(key)   # nothing was recorded (or sent): allow a retry
+                logger.error(f"email_service: no record for email to={entry['to']} "
+                             f"subject={entry['subject']!r} — {exc}")
+    batch = [(result, entry, key, record["id"])
+             for (result, entry, key), record in zip(batch, records) if record is not None]
+    for result, _, _, record_id in batch:
+        result["saved"], result["record_id"] = True, record_id
+
+    if sends:
+        # Only emails that already have a record are sent
+        updates = {}
+        for n, (result, entry, key, record_id) in enumerate(batch, 1):
+            entry["status"] = _send_via_gmail(entry["to"], subject, body)
+            result["sent"]  = entry["status"] in ("sent", "delivered")
+            if entry["status"] == "failed":
+                dedup_store.release(key)   # let a retry through
+            updates[record_id] = entry["status"]
+            if len(updates) >= STATUS_CHUNK or n == len(batch):
+                try:
+                    update_email_statuses(updates)
+                except Exception as exc:
+                    add_log(f"email_service: status update error — {exc}", "ERROR")
+                    logger.error(f"email_service: {len(updates)} record(s) left 'pending' "
+                                 f"after sending: {updates} — {exc}")
+                updates = {}
+
+    for result, entry, _, _ in batch:
         add_log(
-            f"Email | to={to} | status={delivery_status} | "
+            f"Email | to={entry['to']} | status={entry['status']} | "
             f"approval={approval_status} | src={source}"
         )
-    except Exception as exc:
-        result["error"] = f"save_failed:{exc}"
-        add_log(f"email_service: save error — {exc}", "ERROR")
+    if batch:
+        sync_data_from_files()
+    return results
 
-    return result
+
+def _delivery_status(approval_status: str, force_gmail: bool,
+                     to: str, subject: str, body: str) -> str:
+    if approval_status == "rejected":
+        return "rejected"
+    if approval_status == "approved":
+        if force_gmail:
+            # Directly use Gmail API (scheduler path)
+            return _send_via_gmail(to, subject, body)
+        # Chat/HITL path: agent already sent it via tool
+        # We are just recording the fact
+        return "sent"
+    return "pending"
 
 
 def _send_via_gmail(to: str, subject: str, body: str) -> str:
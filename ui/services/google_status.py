@@ -0,0 +1,41 @@
+"""
+ui/services/google_status.py
+Google connection state for the sidebar, header and Settings page.
+
+Reads the in-memory state kept by app/core/google_services.py, so page
+renders do not probe credential files or spawn test subprocesses.
+"""
+import logging
+
+logger = logging.getLogger(__name__)
+
+STATE_LABELS = {
+    "connected":           "Connected",
+    "ready":               "Token Found",
+    "needs_authorization": "Needs Authorization",
+    "not_configured":      "No Credentials",
+    "error":               "Error",
+    "unknown":             "Unknown",
+}
+
+
+def connection_states() -> dict:
+    """{name: state dict} per Google connection; {} if the client libraries are missing."""
+    try:
+        from app.core.google_services import connection_states as states
+        return states()
+    except ImportError as e:
+        logger.warning(f"Google client libraries unavailable: {e}")
+        return {}
+
+
+def google_status() -> tuple:
+    """(ok, warning label) across all Google connections, for a status row or badge."""
+    states = connection_states()
+    if not states:
+        return False, "Not Installed"
+    bad = [s for s in states.values() if not s["ok"]]
+    if not bad:
+        return True, ""
+    labels = {STATE_LABELS.get(s["state"], s["state"]) for s in bad}
+    return False, labels.pop() if len(labels) == 1 else "Partly Configured"
@@ -1,38 +1,721 @@
 """
 ui/services/meeting_tracker.py
 JSON persistence — atomic writes. Single data directory for ALL records.
+
+Journal mode (settings.tracker_journal): adds, status changes and deletes are
+appended as single JSONL lines next to the snapshot; loads replay the log and
+the snapshot is rewritten once the log passes tracker_journal_compact_bytes.
+Appends go through ui/services/wal: concurrent writers share one fsync
+(tracker_wal_group_ms widens the group), checkpoints run on a background thread and the first load after a
+start repairs a torn log tail before replaying it.
+
+settings.tracker_backend = "sqlite" swaps the JSON files for ui/services/tracker_db
+(seeded from the JSON files on first use). query_*/count_* work on both backends.
+
+On the JSON backend emails from closed months are moved to ui/services/email_archive
+segments (settings.email_archive_segment); range loads only open the segments
+that overlap the requested window.
 """
-import json, os, uuid, logging
+import base64, glob, json, os, uuid, logging, threading, queue, tempfile
 from datetime import datetime
 from typing import Optional
 
+from app.core.settings_access import setting
+from ui.services import body_store, email_archive, serializer, tracker_db, wal
+
 logger   = logging.getLogger(__name__)
 DATA_DIR = "data"
 MEETINGS = os.path.join(DATA_DIR, "meetings_status.json")
 EMAILS   = os.path.join(DATA_DIR, "emails_sent.json")
 
+JOURNAL_COMPACT_BYTES = 4 * 1024 * 1024
+_write_lock = threading.RLock()
+
+
+def _journal_enabled() -> bool:
+    return bool(setting("tracker_journal", False))
+
+def _use_sqlite() -> bool:
+    return str(setting("tracker_backend", "json")).lower() == "sqlite"
+
+def _dumps(obj, pretty: Optional[bool] = None) -> bytes:
+    if pretty is None:
+        pretty = bool(setting("tracker_json_pretty", False))
+    return serializer.dumps(obj, pretty, setting("tracker_serializer", "auto"))
+
+def _loads(data):
+    return serializer.loads(data, setting("tracker_serializer", "auto"))
+
 
 def _ensure():
     os.makedirs(DATA_DIR, exist_ok=True)
 
-def _load(path: str) -> list:
-    _ensure()
+def _journal_path(path: str) -> str:
+    return os.path.splitext(path)[0] + ".jsonl"
+
+def _sealed_path(path: str) -> str:
+    """Journal segment frozen by a running checkpoint (replayed before the live one)."""
+    return _journal_path(path) + ".1"
+
+def _read_snapshot(path: str) -> list:
     if not os.path.exists(path):
         return []
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            d = json.load(f)
+        with open(path, "rb") as f:
+            d = _loads(f.read())
             return d if isinstance(d, list) else []
     except Exception as e:
         logger.error(f"Load {path}: {e}")
         return []
 
+def _replay(records: list, journal: str) -> list:
+    """Apply journal ops on top of the snapshot. Replay is idempotent, so a
+    crash between snapshot rewrite and log truncation cannot duplicate rows."""
+    if not os.path.exists(journal):
+        return records
+    index = {r.get("id"): i for i, r in enumerate(records)}
+    deleted = set()
+    with open(journal, "rb") as f:
+        for n, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                op = _loads(line)
+            except ValueError:
+                logger.warning(f"Journal {journal}:{n}: skipping unreadable line")
+                continue
+            kind, rid = op.get("op"), op.get("id")
+            if kind == "add":
+                rec = op.get("record") or {}
+                rid = rec.get("id")
+                if rid in index:
+                    records[index[rid]] = rec
+                else:
+                    index[rid] = len(records)
+                    records.append(rec)
+                deleted.discard(rid)
+            elif kind == "update" and rid in index and rid not in deleted:
+                records[index[rid]].update(op.get("fields") or {})
+            elif kind == "delete" and rid in index:
+                deleted.add(rid)
+    if deleted:
+        records = [r for r in records if r.get("id") not in deleted]
+    return records
+
+# ── CACHE ─────────────────────────────────────────────────────────────────────
+# Process-wide, shared by every Streamlit session. JSON entries are validated
+# by (st_mtime_ns, st_size, st_ino) of the snapshot and journal, SQLite entries
+# by PRAGMA data_version; this module's own writes refresh the entry in place.
+_cache: dict       = {}
+_cache_lock        = threading.Lock()
+_cache_counters    = {"hits": 0, "misses": 0}
+
+def _stat_sig(p: str):
+    try:
+        st = os.stat(p)
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+    except FileNotFoundError:
+        return None
+
+def _signature(path: str) -> tuple:
+    return (_stat_sig(path), _stat_sig(_sealed_path(path)), _stat_sig(_journal_path(path)))
+
+def _db_signature() -> tuple:
+    return ("sqlite", tracker_db.data_version(_db_path()))
+
+def _cache_get(path: str, sig: tuple) -> Optional[list]:
+    with _cache_lock:
+        hit = _cache.get(path)
+        if hit is not None and hit[0] == sig:
+            _cache_counters["hits"] += 1
+            return list(hit[1])
+        _cache_counters["misses"] += 1
+        return None
+
+def _cache_put(path: str, data: list, sig: Optional[tuple] = None) -> None:
+    with _cache_lock:
+        _cache[path] = (sig or _signature(path), list(data))
+
+def cache_stats() -> dict:
+    """Hit/miss counters of the load cache (misses == file parses / DB scans)."""
+    with _cache_lock:
+        return {**_cache_counters, "entries": len(_cache)}
+
+def _cache_drop(key: str) -> None:
+    with _cache_lock:
+        _cache.pop(key, None)
+
+def clear_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
+        _cache_counters.update(hits=0, misses=0)
+
+
+def _cache_peek(path: str) -> Optional[list]:
+    with _cache_lock:
+        hit = _cache.get(path)
+        return list(hit[1]) if hit is not None else None
+
+def _load_json(path: str) -> list:
+    _ensure()
+    _recover(path)
+    if _wal_busy(path):
+        # Our own appends are still queued for fsync: the cache is ahead of disk
+        data = _cache_peek(path)
+        if data is not None:
+            return data
+        _wal(path).flush()
+    sig  = _signature(path)
+    data = _cache_get(path, sig)
+    if data is None:
+        data = _replay(_read_snapshot(path), _sealed_path(path))
+        data = _replay(data, _journal_path(path))
+        _cache_put(path, data, sig)
+    return data
+
+def _load(path: str) -> list:
+    if not _use_sqlite():
+        return _load_json(path)
+    table = _table(path)
+    sig   = _db_signature()
+    data  = _cache_get(table, sig)
+    if data is None:
+        data = tracker_db.select(_db_path(), table)
+        _cache_put(table, data, sig)
+    return data
+
+def _write_snapshot(path: str, data: list, unique: bool = False) -> str:
+    """Write data to path.tmp (a private path.*.ckpt file when unique) and
+    fsync it; the caller os.replace()s it in."""
+    if unique:
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path) or ".",
+                                   prefix=os.path.basename(path) + ".", suffix=".ckpt")
+        f = os.fdopen(fd, "wb")
+    else:
+        tmp = path + ".tmp"
+        f = open(tmp, "wb")
+    with f:
+        f.write(_dumps(data))
+        f.flush()
+        os.fsync(f.fileno())
+    return tmp
+
 def _save(path: str, data: list) -> None:
     _ensure()
-    tmp = path + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False, default=str)
-    os.replace(tmp, path)
+    _wal(path).close()
+    os.replace(_write_snapshot(path, data), path)
+    # Snapshot now holds everything the journal described
+    for log_path in (_sealed_path(path), _journal_path(path)):
+        if os.path.exists(log_path):
+            os.remove(log_path)
+    wal.fsync_dir(path)
+    _cache_put(path, data)
+
+
+# ── JOURNAL / WAL ─────────────────────────────────────────────────────────────
+# Writers update the cache and counters under _write_lock, queue their ops on
+# the group-commit log, then wait for the fsync outside the lock so that
+# concurrent writers share it. Cache and counters are re-signed with the
+# journal's new stat once the log is idle (single-writer-process assumption,
+# as everywhere in this module).
+_recovered: set = set()
+
+def _wal(path: str) -> wal.GroupCommitLog:
+    return wal.log(_journal_path(path),
+                   window_ms=float(setting("tracker_wal_group_ms", 0.0)),
+                   fsync=bool(setting("tracker_wal_fsync", True)))
+
+def _wal_busy(path: str) -> bool:
+    return _journal_enabled() and _wal(path).pending()
+
+def _recover(path: str) -> None:
+    """Once per process: cut a torn journal tail and finish a checkpoint
+    that was interrupted by a crash."""
+    if path in _recovered:
+        return
+    with _write_lock:
+        if path in _recovered:
+            return
+        _recovered.add(path)
+        for log_path in (_sealed_path(path), _journal_path(path)):
+            wal.repair_tail(log_path)
+        for tmp in glob.glob(glob.escape(path) + ".*.ckpt"):
+            os.remove(tmp)          # snapshot of a checkpoint that never got swapped in
+        if os.path.exists(_sealed_path(path)):
+            logger.info(f"Recovery: folding interrupted checkpoint of {path}")
+            compact_journal(path)
+
+def _journal_write(path: str, ops: list, data: list) -> int:
+    """Queue ops on the log and publish ``data`` (the state after them) to the
+    cache. Returns the ticket to wait on for durability."""
+    _ensure()
+    ticket = _wal(path).append(b"".join(_dumps(op, pretty=False) + b"\n" for op in ops))
+    with _cache_lock:
+        old = _cache.get(path)
+        _cache[path] = (old[0] if old else _signature(path), list(data))
+    return ticket
+
+def _commit(path: str, ticket: Optional[int]) -> None:
+    """Block until a journal append is fsynced (called without _write_lock)."""
+    if ticket is None:
+        return
+    _wal(path).wait(ticket)
+    with _write_lock:
+        _resign(path)
+
+def _resign(path: str) -> None:
+    """Re-sign cache entry and counters with the on-disk signature once no
+    append is pending, so the next load is a cache hit."""
+    if _wal(path).pending():
+        return
+    sig = _signature(path)
+    with _cache_lock:
+        hit = _cache.get(path)
+        if hit is not None:
+            _cache[path] = (sig, hit[1])
+        c = _counters.get(path)
+    if c is not None:
+        c["sig"] = _sig_key(sig)
+        _write_stats(path, c)
+
+def _settle(path: str) -> tuple:
+    """Flush queued appends and return the now-stable signature (for a
+    _bump_counters() after a full rewrite). Call with _write_lock held."""
+    _wal(path).close()
+    _resign(path)
+    return _signature(path)
+
+def compact_journal(path: Optional[str] = None) -> None:
+    """Fold the journal into a fresh snapshot now (both stores when path is None).
+    Waits for a checkpoint of the same store that is in flight."""
+    for p in ([path] if path else [MEETINGS, EMAILS]):
+        with _checkpoint_lock(p), _write_lock:
+            if os.path.exists(_journal_path(p)) or os.path.exists(_sealed_path(p)):
+                pre  = _settle(p)
+                data = _load_json(p)
+                if p == EMAILS:
+                    data, migrated = _externalize_bodies(data)
+                    if migrated:
+                        body_store.drop_refs()
+                _save(p, data)
+                _bump_counters(p, pre)
+                logger.info(f"Journal compacted: {p}")
+    if path in (None, EMAILS):
+        gc_bodies()
+
+# Background checkpoints: the live journal is sealed (renamed to .jsonl.1)
+# under the lock, the snapshot is written and fsynced without it, then swapped
+# in. Replay is idempotent, so a crash at any step only costs a re-fold.
+# Full rewrites of a store (compact_journal, archive_emails) hold its
+# checkpoint lock, always taken before _write_lock.
+_checkpoints: "queue.Queue[str]" = queue.Queue()
+_checkpointer: Optional[threading.Thread] = None
+_checkpoint_locks: dict = {}
+
+def _checkpoint_lock(path: str) -> threading.RLock:
+    with _cache_lock:
+        return _checkpoint_locks.setdefault(path, threading.RLock())
+
+def _journal_full(path: str) -> bool:
+    limit = int(setting("tracker_journal_compact_bytes", JOURNAL_COMPACT_BYTES))
+    try:
+        return os.path.getsize(_journal_path(path)) > limit
+    except FileNotFoundError:
+        return False
+
+def _maybe_compact(path: str) -> None:
+    global _checkpointer
+    if not _journal_full(path):
+        return
+    if _checkpointer is None or not _checkpointer.is_alive():
+        _checkpointer = threading.Thread(target=_checkpoint_loop, name="tracker-checkpoint", daemon=True)
+        _checkpointer.start()
+    _checkpoints.put(path)
+
+def _checkpoint_loop() -> None:
+    while True:
+        path = _checkpoints.get()
+        try:
+            if _journal_full(path):
+                checkpoint(path)
+        except Exception as e:
+            logger.error(f"Checkpoint {path}: {e}")
+
+def checkpoint(path: str) -> bool:
+    """Sealed-segment checkpoint of one store; False if there was nothing to do."""
+    journal, sealed = _journal_path(path), _sealed_path(path)
+    _recover(path)
+    with _checkpoint_lock(path):
+        with _write_lock:
+            if os.path.exists(sealed) or not os.path.exists(journal):
+                return False
+            data = _load_json(path)      # includes every queued op
+            _wal(path).close()
+            os.replace(journal, sealed)
+            _resign(path)
+            base = (_stat_sig(path), _stat_sig(sealed))
+        tmp = _write_snapshot(path, data, unique=True)
+        try:
+            with _write_lock:
+                # Only the live journal may have moved on; anything else means
+                # another writer replaced the snapshot and this one is stale
+                if not os.path.exists(sealed) or (_stat_sig(path), _stat_sig(sealed)) != base:
+                    logger.warning(f"Checkpoint: {path} changed underneath, snapshot discarded")
+                    return False
+                os.replace(tmp, path)
+                os.remove(sealed)
+                wal.fsync_dir(path)
+                _resign(path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+    logger.info(f"Checkpoint: {path} ({len(data)} records)")
+    return True
+
+def _persist(path: str, data: list, ops: list,
+             removed: tuple = (), added: tuple = ()) -> Optional[int]:
+    """Write a change; in journal mode returns the ticket for _commit()."""
+    if _journal_enabled():
+        ticket = _journal_write(path, ops, data)
+        _bump_counters(path, None, removed, added)
+        _maybe_compact(path)
+        return ticket
+    pre = _signature(path)
+    _save(path, data)
+    _bump_counters(path, pre, removed, added)
+    return None
+
+def _append_records(path: str, records: list) -> None:
+    """Append records with one load and one write (one transaction on SQLite)."""
+    if not records:
+        return
+    with _write_lock:
+        if _use_sqlite():
+            tracker_db.insert(_db_path(), _table(path), records)
+            return _cache_drop(_TABLES[path])
+        data = _load_json(path)
+        data.extend(records)
+        ticket = _persist(path, data, [{"op": "add", "record": r} for r in records],
+                          added=tuple(records))
+        if path == EMAILS:
+            body_store.ref(r.get("body_hash") for r in records)
+    _commit(path, ticket)
+
+def _update_record(path: str, record_id: str, fields: dict) -> bool:
+    with _write_lock:
+        if _use_sqlite():
+            ok = tracker_db.update(_db_path(), _table(path), record_id, fields)
+            _cache_drop(_TABLES[path])
+            return ok
+        data = _load_json(path)
+        for i, r in enumerate(data):
+            if r.get("id") == record_id:
+                # Copy, so cached dicts never change before the write lands
+                data[i] = {**r, **fields}
+                ticket = _persist(path, data, [{"op": "update", "id": record_id, "fields": fields}],
+                                  removed=(r,), added=(data[i],))
+                break
+        else:
+            return False
+    _commit(path, ticket)
+    return True
+
+def _update_records(path: str, updates: dict) -> int:
+    """Bulk _update_record: {record_id: fields} in one write / one transaction.
+    Returns how many records were found and updated."""
+    if not updates:
+        return 0
+    with _write_lock:
+        if _use_sqlite():
+            n = tracker_db.update_many(_db_path(), _table(path), updates)
+            _cache_drop(_TABLES[path])
+            return n
+        data = _load_json(path)
+        ops, removed, added = [], [], []
+        for i, r in enumerate(data):
+            fields = updates.get(r.get("id"))
+            if fields is not None:
+                data[i] = {**r, **fields}
+                ops.append({"op": "update", "id": r.get("id"), "fields": fields})
+                removed.append(r)
+                added.append(data[i])
+        ticket = _persist(path, data, ops, removed=tuple(removed), added=tuple(added)) if ops else None
+    _commit(path, ticket)
+    return len(ops)
+
+def _delete_record(path: str, record_id: str) -> bool:
+    with _write_lock:
+        if _use_sqlite():
+            ok = tracker_db.delete(_db_path(), _table(path), record_id)
+            _cache_drop(_TABLES[path])
+            return ok
+        data    = _load_json(path)
+        updated = [r for r in data if r.get("id") != record_id]
+        if len(updated) == len(data):
+            return False
+        gone = tuple(r for r in data if r.get("id") == record_id)
+        ticket = _persist(path, updated, [{"op": "delete", "id": record_id}], removed=gone)
+    _commit(path, ticket)
+    return True
+
+def _delete_records(path: str, records: list, removed_out: Optional[list] = None) -> int:
+    """Bulk delete (one write / one transaction); returns how many were removed.
+    On the JSON backend the removed records are appended to removed_out."""
+    ids = {r.get("id") for r in records}
+    if not ids:
+        return 0
+    with _write_lock:
+        if _use_sqlite():
+            n = tracker_db.delete_many(_db_path(), _table(path), sorted(ids))
+            _cache_drop(_TABLES[path])
+            return n
+        data = _load_json(path)
+        keep = [r for r in data if r.get("id") not in ids]
+        gone = tuple(r for r in data if r.get("id") in ids)
+        ticket = None
+        if gone:
+            ticket = _persist(path, keep, [{"op": "delete", "id": r.get("id")} for r in gone],
+                              removed=gone)
+    _commit(path, ticket)
+    n = len(gone)
+    if removed_out is not None:
+        removed_out.extend(gone)
+    if path == EMAILS and n < len(ids):
+        hot = {r.get("id") for r in gone}
+        n  += email_archive.remove_many([r for r in records if r.get("id") not in hot],
+                                        _plain_segments(), removed_out)
+    return n
+
+
+# ── STATS COUNTERS ────────────────────────────────────────────────────────────
+# Record counts by status and source, kept current by every write so the stats
+# functions never scan the history. JSON stores persist them to
+# <store>.stats.json signed with the store's file signature; a missing,
+# mismatched or internally inconsistent set is rebuilt from the records.
+# The SQLite backend keeps the same counters in a trigger-maintained table.
+_counters: dict = {}
+
+def _stats_path(path: str) -> str:
+    return os.path.splitext(path)[0] + ".stats.json"
+
+def _sig_key(sig: tuple) -> str:
+    return json.dumps(sig)
+
+def _count_into(c: dict, record: dict, step: int) -> None:
+    c["total"] += step
+    for field in ("status", "source"):
+        key = str(record.get(field) or "")
+        n   = c[field].get(key, 0) + step
+        if n:
+            c[field][key] = n
+        else:
+            c[field].pop(key, None)
+
+def _consistent(c: dict) -> bool:
+    try:
+        return (
+            all(v > 0 for f in ("status", "source") for v in c[f].values())
+            and sum(c["status"].values()) == c["total"] == sum(c["source"].values())
+        )
+    except (KeyError, TypeError, AttributeError):
+        return False
+
+def _write_stats(path: str, c: dict) -> None:
+    tmp = _stats_path(path) + ".tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(c, f, ensure_ascii=False)
+        os.replace(tmp, _stats_path(path))
+    except OSError as e:
+        logger.warning(f"Stats write {path}: {e}")
+
+def _read_stats(path: str) -> Optional[dict]:
+    try:
+        with open(_stats_path(path), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _bump_counters(path: str, pre_sig: Optional[tuple],
+                   removed: tuple = (), added: tuple = ()) -> None:
+    """Apply a write's delta; drops the counters if they were already stale.
+    pre_sig=None (WAL writes): trust the in-memory counters and leave the
+    signature to _resign() once the append is on disk."""
+    with _cache_lock:
+        c = _counters.pop(path, None)
+    if pre_sig is None:
+        if c is not None:
+            for r in removed:
+                _count_into(c, r, -1)
+            for r in added:
+                _count_into(c, r, +1)
+            with _cache_lock:
+                _counters[path] = c
+        return
+    if c is None:
+        c = _read_stats(path)
+    if not c or c.get("sig") != _sig_key(pre_sig):
+        return
+    for r in removed:
+        _count_into(c, r, -1)
+    for r in added:
+        _count_into(c, r, +1)
+    c["sig"] = _sig_key(_signature(path))
+    with _cache_lock:
+        _counters[path] = c
+    _write_stats(path, c)
+
+def _get_counters(path: str) -> dict:
+    if _use_sqlite():
+        return tracker_db.counters(_db_path(), _table(path))
+    sig = _sig_key(_signature(path))
+    with _cache_lock:
+        c = _counters.get(path)
+    if c is not None and _wal_busy(path):
+        return c
+    if c is None:
+        c = _read_stats(path)
+    if not c or c.get("sig") != sig or not _consistent(c):
+        with _write_lock:
+            sig = _sig_key(_signature(path))
+            c   = {"total": 0, "status": {}, "source": {}, "sig": sig}
+            for r in _load_json(path):
+                _count_into(c, r, +1)
+            _write_stats(path, c)
+        logger.info(f"Stats counters rebuilt: {path} ({c['total']} records)")
+    with _cache_lock:
+        _counters[path] = c
+    return c
+
+
+# ── SQLITE / QUERIES ──────────────────────────────────────────────────────────
+_TABLES   = {MEETINGS: "meetings", EMAILS: "emails"}
+_migrated = set()
+
+def _db_path() -> str:
+    return setting("tracker_db_path", os.path.join(DATA_DIR, "tracker.db"))
+
+def _table(path: str) -> str:
+    """SQLite table for path; seeds it from the JSON file the first time."""
+    table = _TABLES[path]
+    if table not in _migrated:
+        with _write_lock:
+            if table not in _migrated:
+                records = _load_json(path)
+                if path == EMAILS:
+                    records = _externalize_bodies(email_archive.load() + records)[0]
+                tracker_db.import_if_empty(_db_path(), table, records)
+                _migrated.add(table)
+    return table
+
+def _iso(v) -> Optional[str]:
+    return v.isoformat() if isinstance(v, datetime) else v
+
+def _matches(record: dict, table: str, filters: dict) -> bool:
+    """In-memory twin of tracker_db.build_where for the JSON backend."""
+    for key, val in filters.items():
+        if val is None:
+            continue
+        if key == "status":
+            vals = (val,) if isinstance(val, str) else val
+            if str(record.get("status", "")).lower() not in {v.lower() for v in vals}:
+                return False
+        elif key in ("since", "until"):
+            # Like SQL, a record without a time never matches a time bound
+            t = record.get(tracker_db.TIME_COLUMN[table])
+            if not isinstance(t, str) or (t < val if key == "since" else t >= val):
+                return False
+        elif key == "title":
+            if str(record.get("title") or "").strip() != str(val).strip():
+                return False
+        elif key == "search":
+            text = val.lower()
+            if not any(text in _text(record.get(c)) for c in tracker_db.SEARCH_COLUMNS[table]):
+                return False
+        elif isinstance(val, (tuple, list)):
+            if record.get(key) not in val:
+                return False
+        elif record.get(key) != val:
+            return False
+    return True
+
+def _text(v) -> str:
+    return " ".join(map(str, v)).lower() if isinstance(v, list) else str(v or "").lower()
+
+def _query(path: str, filters: dict, limit: Optional[int] = None) -> list:
+    filters = {k: _iso(v) for k, v in filters.items() if v is not None}
+    if _use_sqlite():
+        return tracker_db.query(_db_path(), _table(path), filters, limit=limit)
+    table = _TABLES[path]
+    rows  = (_json_emails(filters.get("since"), filters.get("until")) if path == EMAILS
+             else _load(path))
+    hits  = [r for r in rows if _matches(r, table, filters)]
+    return hits[:limit] if limit is not None else hits
+
+# ── PAGINATION ────────────────────────────────────────────────────────────────
+# Keyset pages ordered by (time column, id). The cursor is the opaque, encoded
+# (time, id) of the last row served, so pages stay stable while rows are added.
+def _encode_cursor(record: dict, table: str) -> str:
+    key = [record.get(tracker_db.TIME_COLUMN[table]) or "", record.get("id") or ""]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+def _decode_cursor(cursor: Optional[str]) -> Optional[tuple]:
+    if not cursor:
+        return None
+    try:
+        t, rid = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return (str(t), str(rid))
+    except (ValueError, TypeError):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+
+def _json_chunks(path: str, filters: dict, after: Optional[tuple], desc: bool):
+    """Record lists in page order. Emails walk the hot file and then the
+    archive segments one at a time, so early pages never open old segments."""
+    if path != EMAILS:
+        yield _load_json(path)
+        return
+    since, until = filters.get("since"), filters.get("until")
+    if after is not None:
+        # Skip whole segments the cursor has already passed
+        if desc:
+            until = min(until or "\uffff", after[0] + "\x7f")
+        else:
+            since = max(since or "", after[0])
+    if desc:
+        yield _load_json(EMAILS)
+    yield from email_archive.iter_segments(since, until, reverse=desc)
+    if not desc:
+        yield _load_json(EMAILS)
+
+def _page(path: str, cursor: Optional[str], limit: int,
+          filters: Optional[dict], order: str) -> tuple:
+    if order not in ("asc", "desc"):
+        raise ValueError(f"order must be 'asc' or 'desc', not {order!r}")
+    table   = _TABLES[path]
+    desc    = order == "desc"
+    after   = _decode_cursor(cursor)
+    limit   = max(1, int(limit))
+    filters = {k: _iso(v) for k, v in (filters or {}).items() if v is not None}
+    if _use_sqlite():
+        rows = tracker_db.page(_db_path(), _table(path), filters, after, limit + 1, desc)
+    else:
+        col  = tracker_db.TIME_COLUMN[table]
+        key  = lambda r: (r.get(col) or "", r.get("id") or "")
+        rows = []
+        for chunk in _json_chunks(path, filters, after, desc):
+            hits = [r for r in chunk if _matches(r, table, filters) and
+                    (after is None or (key(r) < after if desc else key(r) > after))]
+            rows.extend(sorted(hits, key=key, reverse=desc))
+            if len(rows) > limit:
+                break
+    page = rows[:limit]
+    return page, (_encode_cursor(page[-1], table) if len(rows) > limit else None)
+
+def _count(path: str, filters: dict) -> int:
+    if _use_sqlite():
+        filters = {k: _iso(v) for k, v in filters.items() if v is not None}
+        return tracker_db.count(_db_path(), _table(path), filters)
+    return len(_query(path, filters))
 
 
 # ── MEETINGS ──────────────────────────────────────────────────────────────────
@@ -45,7 +728,6 @@ def add_meeting(
     email_subject: str = "", email_body: str = "",
     status: str = "Pending", source: str = "scheduler",
 ) -> dict:
-    meetings = load_meetings()
     m = {
         "id": uuid.uuid4().hex, "title": title, "date": str(date),
         "start_time": str(start_time), "end_time": str(end_time),
@@ -55,91 +737,324 @@ def add_meeting(
         "created_at": datetime.now().isoformat(),
         "updated_at": datetime.now().isoformat(),
     }
-    meetings.append(m)
-    _save(MEETINGS, meetings)
+    _append_records(MEETINGS, [m])
     logger.info(f"Meeting saved: {title}")
     return m
 
 def update_meeting_status(meeting_id: str, status: str) -> bool:
-    meetings = load_meetings()
-    for m in meetings:
-        if m.get("id") == meeting_id:
-            m["status"] = status
-            m["updated_at"] = datetime.now().isoformat()
-            _save(MEETINGS, meetings)
-            return True
-    return False
+    return _update_record(MEETINGS, meeting_id, {
+        "status": status, "updated_at": datetime.now().isoformat(),
+    })
 
 def delete_meeting(meeting_id: str) -> bool:
-    meetings = load_meetings()
-    updated  = [m for m in meetings if m.get("id") != meeting_id]
-    if len(updated) < len(meetings):
-        _save(MEETINGS, updated)
-        return True
-    return False
+    return _delete_record(MEETINGS, meeting_id)
+
+def delete_meetings(meetings: list) -> int:
+    return _delete_records(MEETINGS, meetings)
+
+def query_meetings(
+    status=None, title: Optional[str] = None, date: Optional[str] = None,
+    since=None, until=None, limit: Optional[int] = None,
+) -> list:
+    """Meetings matching every given filter. status may be a str or a tuple
+    (case-insensitive); title ignores surrounding whitespace on both sides;
+    since/until bound created_at (ISO str or datetime)."""
+    return _query(MEETINGS, {"status": status, "title": title, "date": date,
+                             "since": since, "until": until}, limit)
+
+def list_meetings(cursor: Optional[str] = None, limit: int = 50,
+                  filters: Optional[dict] = None, order: str = "desc") -> tuple:
+    """One page of meetings ordered by created_at -> (records, next_cursor).
+    filters takes the query_meetings keys plus source (str or tuple) and
+    search (substring of title/attendees/location); next_cursor is None on
+    the last page."""
+    return _page(MEETINGS, cursor, limit, filters, order)
+
+def find_recent_meeting(title: str, date: str, since) -> Optional[dict]:
+    hits = query_meetings(title=title, date=date, since=since, limit=1)
+    return hits[0] if hits else None
 
 def get_meetings_stats() -> dict:
-    m = load_meetings()
+    c = _get_counters(MEETINGS)
     return {
-        "total":    len(m),
-        "approved": sum(1 for x in m if x.get("status") == "Approved"),
-        "pending":  sum(1 for x in m if x.get("status") == "Pending"),
-        "rejected": sum(1 for x in m if x.get("status") == "Rejected"),
+        "total":    c["total"],
+        "approved": c["status"].get("Approved", 0),
+        "pending":  c["status"].get("Pending", 0),
+        "rejected": c["status"].get("Rejected", 0),
+        "from_scheduler": c["source"].get("scheduler", 0),
+        "from_agent":     c["source"].get("agent", 0) + c["source"].get("chat", 0),
     }
 
 
+# ── EMAIL ARCHIVE ─────────────────────────────────────────────────────────────
+def _archive_granularity() -> Optional[str]:
+    g = str(setting("email_archive_segment", "month")).lower()
+    return g if g in email_archive.KEY_LENGTH and not _use_sqlite() else None
+
+def _plain_segments() -> int:
+    return int(setting("email_archive_plain_segments", 1))
+
+def _json_emails(since: Optional[str] = None, until: Optional[str] = None) -> list:
+    """Hot file plus the archive segments overlapping [since, until)."""
+    return email_archive.load(since, until) + _load_json(EMAILS)
+
+def archive_emails() -> int:
+    """Move emails of closed segments from the hot file into the archive.
+    Cheap no-op while the oldest hot record is still in the current segment."""
+    g = _archive_granularity()
+    if not g:
+        return 0
+    current = email_archive.segment_key(datetime.now().isoformat(), g)
+    closed  = lambda r: r.get("sent_at") and email_archive.segment_key(r["sent_at"], g) < current
+    with _checkpoint_lock(EMAILS), _write_lock:
+        data = _load_json(EMAILS)
+        if not data or not (closed(data[0]) or not data[0].get("sent_at")):
+            return 0
+        old = [r for r in data if closed(r)]
+        if not old:
+            return 0
+        # Archive first: segments merge by id, so a crash before the hot
+        # rewrite only leaves records that the next roll de-duplicates
+        email_archive.append(old, g, _plain_segments())
+        pre = _settle(EMAILS)
+        _save(EMAILS, [r for r in data if not closed(r)])
+        _bump_counters(EMAILS, pre, removed=tuple(old))
+    return len(old)
+
+
 # ── EMAILS ────────────────────────────────────────────────────────────────────
-def load_emails() -> list:
-    return _load(EMAILS)
+def load_emails(since=None, until=None) -> list:
+    """All email records, or those with since <= sent_at < until (ISO str or
+    datetime). Range loads skip archive segments outside the window."""
+    if since is None and until is None:
+        return _load(EMAILS) if _use_sqlite() else _json_emails()
+    return query_emails(since=since, until=until)
 
-def save_email_record(
+def _email_record(
     to: str, subject: str, body: str = "",
     status: str = "sent", source: str = "agent",
     meeting_id: Optional[str] = None,
 ) -> dict:
-    emails = load_emails()
-    r = {
+    return {
         "id":           uuid.uuid4().hex,
         "to":           to,
         "subject":      subject,
-        "body_preview": body[:200] if body else "",
-        "body":         body or "",
+        "body_hash":    body_store.put(body),   # body lives in the body store
         "status":       status,
         "source":       source,
         "meeting_id":   meeting_id,
         "sent_at":      datetime.now().isoformat(),
     }
-    emails.append(r)
-    _save(EMAILS, emails)
+
+def _email_upkeep() -> None:
+    """Archive roll and body migration after a save. The records are already
+    durable, so a failure here is logged rather than reported as a failed save."""
+    try:
+        archive_emails()
+        migrate_inline_bodies()
+    except Exception as e:
+        logger.error(f"Email upkeep after save failed: {e}")
+
+def save_email_record(
+    to: str, subject: str, body: str = "",
+    status: str = "sent", source: str = "agent",
+    meeting_id: Optional[str] = None,
+) -> dict:
+    r = _email_record(to, subject, body, status, source, meeting_id)
+    _append_records(EMAILS, [r])
+    _email_upkeep()
     logger.info(f"Email saved: to={to} status={status}")
     return r
 
+def save_email_records(entries: list) -> list:
+    """
+    Batch version of save_email_record — one load and one atomic write for
+    all entries. Each entry is a dict of save_email_record keyword arguments;
+    entries without a recipient are skipped. Returns the saved records.
+    """
+    records = []
+    for e in entries:
+        to = str(e.get("to") or "").strip()
+        if not to:
+            continue
+        records.append(_email_record(
+            to, str(e.get("subject") or ""), e.get("body") or "",
+            e.get("status", "sent"), e.get("source", "agent"), e.get("meeting_id"),
+        ))
+    _append_records(EMAILS, records)
+    if records:
+        _email_upkeep()
+        logger.info(f"Emails saved: {len(records)} record(s)")
+    return records
+
+def update_email_statuses(statuses: dict) -> int:
+    """Set {record_id: status} on hot email records in one write; returns how
+    many were found."""
+    return _update_records(EMAILS, {rid: {"status": s} for rid, s in statuses.items()})
+
+def email_body(record: dict) -> str:
+    """Full body of an email record — from the body store, or inline for
+    records saved before bodies were content-addressed."""
+    h = record.get("body_hash")
+    return body_store.get(h) if h else (record.get("body") or "")
+
+def email_preview(record: dict, length: int = 200) -> str:
+    if record.get("body_preview"):
+        return record["body_preview"][:length]
+    h = record.get("body_hash")
+    return body_store.preview(h, length) if h else (record.get("body") or "")[:length]
+
 def delete_email_record(email_id: str) -> bool:
-    emails = load_emails()
-    updated = [e for e in emails if e.get("id") != email_id]
-    if len(updated) < len(emails):
-        _save(EMAILS, updated)
-        return True
-    return False
+    with _write_lock:
+        if _use_sqlite():
+            rec = next(iter(tracker_db.select(_db_path(), _table(EMAILS), '"id" = ?', (email_id,))), None)
+            if not _delete_record(EMAILS, email_id):
+                return False
+        else:
+            _body_refs()
+            rec = next((r for r in _load_json(EMAILS) if r.get("id") == email_id), None)
+            if rec is None or not _delete_record(EMAILS, email_id):
+                rec = email_archive.remove(email_id, _plain_segments())
+                if rec is None:
+                    return False
+        dropped = _unreferenced([rec.get("body_hash")] if rec else [])
+    body_store.sweep(set(), dropped)
+    return True
+
+def delete_email_records(emails: list) -> int:
+    with _write_lock:
+        if _use_sqlite():
+            n = _delete_records(EMAILS, emails)
+            dropped = _unreferenced([r.get("body_hash") for r in emails])
+        else:
+            _body_refs()
+            gone: list = []
+            n = _delete_records(EMAILS, emails, gone)
+            dropped = _unreferenced([r.get("body_hash") for r in gone])
+    body_store.sweep(set(), dropped)
+    return n
+
+# ── BODY STORE UPKEEP ─────────────────────────────────────────────────────────
+# SQLite answers "is this body still used?" with one indexed lookup. The JSON
+# backend keeps reference counts in body_store, counted from every record
+# (hot and archived) once per process and then moved by saves and deletes
+# under _write_lock (single-writer-process assumption, as for the journal).
+def _body_refs() -> None:
+    """Make sure the JSON backend's body reference counts are loaded. Call
+    with _write_lock held, before the change they should count."""
+    if not body_store.refs_loaded():
+        body_store.load_refs(r.get("body_hash") for r in _json_emails())
+
+def _unreferenced(hashes: list) -> list:
+    """Of the body hashes of just-deleted records, those no email record
+    references any more. Call with _write_lock held."""
+    hashes = [h for h in hashes if h]
+    if not hashes:
+        return []
+    if _use_sqlite():
+        return [h for h in set(hashes) if not tracker_db.has_body_ref(_db_path(), _table(EMAILS), h)]
+    return body_store.unref(hashes)
+
+def gc_bodies() -> int:
+    """Full sweep: remove stored bodies no email record (hot, archived or
+    SQLite) references, and recount the JSON backend's references."""
+    with _write_lock:
+        hashes = [r.get("body_hash") for r in load_emails()]
+        if not _use_sqlite():
+            body_store.load_refs(hashes)
+    return body_store.sweep(set(hashes))
+
+def _externalize_bodies(records: list) -> tuple:
+    """(records, n): records with inline body/body_preview (saved before the
+    body store existed) moved to body_hash. Preview-only records keep their preview."""
+    out, n = [], 0
+    for r in records:
+        if r.get("body") and not r.get("body_hash"):
+            body = r["body"]
+            r = {k: v for k, v in r.items() if k not in ("body", "body_preview")}
+            r["body_hash"] = body_store.put(body)
+            n += 1
+        out.append(r)
+    return out, n
+
+_bodies_migrated = False
+
+def migrate_inline_bodies() -> int:
+    """Once per process: move legacy inline bodies into the body store (hot
+    JSON file or SQLite table) so the tracker shrinks. Returns records changed."""
+    global _bodies_migrated
+    if _bodies_migrated:
+        return 0
+    with _checkpoint_lock(EMAILS), _write_lock:
+        if _bodies_migrated:
+            return 0
+        _bodies_migrated = True
+        if _use_sqlite():
+            old = tracker_db.select(_db_path(), _table(EMAILS), '"body" IS NOT NULL AND "body" != \'\'')
+            new, n = _externalize_bodies(old)
+            if n:
+                tracker_db.insert(_db_path(), _table(EMAILS), new)
+                _cache_drop(_table(EMAILS))
+        else:
+            new, n = _externalize_bodies(_load_json(EMAILS))
+            if n:
+                pre = _settle(EMAILS)
+                _save(EMAILS, new)
+                body_store.drop_refs()      # recounted on next use, with the new hashes
+                _bump_counters(EMAILS, pre)
+    if n:
+        logger.info(f"Body store: moved {n} inline email bod{'y' if n == 1 else 'ies'} out of the tracker")
+    return n
 
 def save_bulk_emails(
     recipients: list, subject: str, body: str = "",
     meeting_id: Optional[str] = None,
     source: str = "scheduler", status: str = "sent",
 ) -> list:
-    return [
-        save_email_record(str(t).strip(), subject, body, status, source, meeting_id)
+    return save_email_records([
+        {"to": t, "subject": subject, "body": body, "status": status,
+         "source": source, "meeting_id": meeting_id}
         for t in recipients if t and str(t).strip()
-    ]
+    ])
+
+def query_emails(
+    status=None, since=None, until=None, meeting_id: Optional[str] = None,
+    to: Optional[str] = None, subject: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> list:
+    """Email records matching every given filter. status may be a str or a
+    tuple (case-insensitive); since/until bound sent_at (ISO str or datetime)."""
+    return _query(EMAILS, {"status": status, "since": since, "until": until,
+                           "meeting_id": meeting_id, "to": to, "subject": subject}, limit)
+
+def list_emails(cursor: Optional[str] = None, limit: int = 50,
+                filters: Optional[dict] = None, order: str = "desc") -> tuple:
+    """One page of emails ordered by sent_at -> (records, next_cursor).
+    filters takes the query_emails keys plus source (str or tuple) and
+    search (substring of to/subject)."""
+    return _page(EMAILS, cursor, limit, filters, order)
+
+def count_emails(status=None, since=None, until=None) -> int:
+    return _count(EMAILS, {"status": status, "since": since, "until": until})
+
+def find_recent_email(to: str, subject: str, status: str, since) -> Optional[dict]:
+    hits = query_emails(status=status, since=since, to=to, subject=subject, limit=1)
+    return hits[0] if hits else None
 
 def get_emails_stats() -> dict:
-    e = load_emails()
+    c = _get_counters(EMAILS)
+    if not _use_sqlite():
+        a = email_archive.counters()
+        c = {"total": c["total"] + a["total"],
+             **{f: {k: c[f].get(k, 0) + a[f].get(k, 0) for k in c[f].keys() | a[f].keys()}
+                for f in ("status", "source")}}
+    by_status = lambda *names: sum(n for k, n in c["status"].items() if k.lower() in names)
     return {
-        "total":          len(e),
-        "sent":           sum(1 for x in e if x.get("status","").lower() in ("sent","delivered")),
-        "rejected":       sum(1 for x in e if x.get("status","").lower() == "rejected"),
-        "failed":         sum(1 for x in e if x.get("status","").lower() == "failed"),
-        "from_chat":      sum(1 for x in e if x.get("source") == "agent"),
-        "from_hitl":      sum(1 for x in e if x.get("source") == "hitl"),
-        "from_scheduler": sum(1 for x in e if x.get("source") == "scheduler"),
-    }
\ No newline at end of file
+        "total":          c["total"],
+        "sent":           by_status("sent", "delivered"),
+        "rejected":       by_status("rejected"),
+        "failed":         by_status("failed"),
+        "from_chat":      c["source"].get("agent", 0),
+        "from_hitl":      c["source"].get("hitl", 0),
+        "from_scheduler": c["source"].get("scheduler", 0),
+    }
@@ -0,0 +1,150 @@
+"""
+ui/services/retention.py
+Background retention for the meeting/email tracker.
+
+Rules come from settings (retention_*): a maximum age in days per status
+("*" = any status) and a maximum record count per store. Records that fall
+outside them are written to a gzipped JSONL archive under
+retention_archive_dir and then removed from the tracker in one bulk write.
+A daemon thread runs the rules every retention_interval_minutes; summaries
+are queued for the UI, which logs them with add_log on its next rerun.
+"""
+import gzip, os, logging, threading, time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from app.core.settings_access import setting
+from ui.services import meeting_tracker as mt, serializer, wal
+
+logger = logging.getLogger(__name__)
+
+_run_lock    = threading.Lock()
+_thread_lock = threading.Lock()
+_thread: Optional[threading.Thread] = None
+_log_lock = threading.Lock()
+_summaries: list = []      # (seq, message)
+_seq = 0
+
+STORES = {
+    "meetings": (mt.query_meetings, mt.list_meetings, mt.get_meetings_stats, mt.delete_meetings),
+    "emails":   (mt.query_emails,   mt.list_emails,   mt.get_emails_stats,   mt.delete_email_records),
+}
+
+
+# ── RULES ─────────────────────────────────────────────────────────────────────
+def _expired(store: str, now: datetime) -> dict:
+    """{rule label: records} for every max-age rule of store."""
+    query = STORES[store][0]
+    out   = {}
+    for status, days in (setting(f"retention_{store}_max_age_days", {}) or {}).items():
+        if not days or int(days) <= 0:
+            continue
+        cutoff = now - timedelta(days=int(days))
+        hits   = query(status=None if status == "*" else status, until=cutoff)
+        if hits:
+            out[f"{status}>{int(days)}d"] = hits
+    return out
+
+def _overflow(store: str, picked: dict) -> list:
+    """Oldest records beyond retention_<store>_max_records, not already picked."""
+    cap = int(setting(f"retention_{store}_max_records", 0) or 0)
+    if cap <= 0:
+        return []
+    _, list_page, stats, _ = STORES[store]
+    excess = stats()["total"] - len(picked) - cap
+    if excess <= 0:
+        return []
+    page, _ = list_page(limit=excess + len(picked), order="asc")
+    return [r for r in page if r.get("id") not in picked][:excess]
+
+
+# ── ARCHIVE ───────────────────────────────────────────────────────────────────
+def _archive_dir() -> str:
+    return setting("retention_archive_dir", os.path.join(mt.DATA_DIR, "retention"))
+
+def _write_archive(store: str, records: list, now: datetime) -> str:
+    """gzip JSONL, fsynced before anything is deleted from the tracker."""
+    d    = _archive_dir()
+    path = os.path.join(d, f"{store}-{now:%Y%m%d-%H%M%S}.jsonl.gz")
+    os.makedirs(d, exist_ok=True)
+    tmp  = path + ".tmp"
+    with open(tmp, "wb") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb") as f:
+            for r in records:
+                f.write(serializer.dumps(r) + b"\n")
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(tmp, path)
+    wal.fsync_dir(path)
+    return path
+
+
+# ── RUN ───────────────────────────────────────────────────────────────────────
+def run_retention(now: Optional[datetime] = None) -> dict:
+    """Apply every rule once. Returns {store: {"archived", "rules", "file"}}."""
+    now     = now or datetime.now()
+    summary = {}
+    with _run_lock:
+        for store in STORES:
+            picked, rules = {}, {}
+            for label, hits in _expired(store, now).items():
+                new = [r for r in hits if r.get("id") not in picked]
+                picked.update((r.get("id"), r) for r in new)
+                rules[label] = len(new)
+            over = _overflow(store, picked)
+            if over:
+                picked.update((r.get("id"), r) for r in over)
+                rules["max_records"] = len(over)
+            if not picked:
+                continue
+            records = list(picked.values())
+            if store == "emails":
+                # The archive keeps the body itself: the body store drops it with the record
+                records = [{**r, "body": mt.email_body(r)} if r.get("body_hash") else r for r in records]
+            path    = _write_archive(store, records, now)
+            removed = STORES[store][3](records)
+            summary[store] = {"archived": removed, "rules": rules, "file": path}
+    if summary:
+        _publish(summary)
+    return summary
+
+def _publish(summary: dict) -> None:
+    global _seq
+    parts = [
+        f"{v['archived']} {store} ({', '.join(f'{k}: {n}' for k, n in v['rules'].items())}) → {v['file']}"
+        for store, v in summary.items()
+    ]
+    msg = "Retention: archived " + "; ".join(parts)
+    logger.info(msg)
+    with _log_lock:
+        _seq += 1
+        _summaries.append((_seq, msg))
+        del _summaries[:-50]
+
+def summaries_since(seq: int) -> tuple:
+    """(messages newer than seq, latest seq) — for add_log in each session."""
+    with _log_lock:
+        return [m for s, m in _summaries if s > seq], _seq
+
+
+# ── BACKGROUND ────────────────────────────────────────────────────────────────
+def _loop() -> None:
+    time.sleep(30)   # keep the first run off app startup
+    while True:
+        try:
+            if setting("retention_enabled", False):
+                run_retention()
+        except Exception as e:
+            logger.error(f"Retention run failed: {e}")
+        time.sleep(max(1, int(setting("retention_interval_minutes", 60))) * 60)
+
+def start_retention() -> bool:
+    """Start the daemon thread once per process (no-op when disabled)."""
+    global _thread
+    if not setting("retention_enabled", False):
+        return False
+    with _thread_lock:
+        if _thread is None or not _thread.is_alive():
+            _thread = threading.Thread(target=_loop, name="tracker-retention", daemon=True)
+            _thread.start()
+    return True
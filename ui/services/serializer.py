@@ -0,0 +1,82 @@
+"""
+ui/services/serializer.py
+JSON encode/decode for tracker files. Uses orjson or msgspec when installed,
+stdlib json otherwise (settings.tracker_serializer = "auto" | "orjson" |
+"msgspec" | "json"). Output is compact unless pretty=True / settings.tracker_json_pretty.
+Everything works in bytes so callers can write files opened in binary mode.
+"""
+import json, logging
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("orjson", "msgspec", "json")
+
+
+def _available(name: str) -> bool:
+    try:
+        __import__(name)
+        return True
+    except ImportError:
+        return False
+
+
+def installed() -> list:
+    return [b for b in BACKENDS if b == "json" or _available(b)]
+
+
+@lru_cache(maxsize=None)
+def backend(preferred: str = "auto") -> str:
+    """Serializer actually used for preferred (first installed one for "auto")."""
+    if preferred in BACKENDS and _available(preferred):
+        return preferred
+    if preferred not in ("auto", "json"):
+        logger.warning(f"Serializer '{preferred}' not installed, falling back")
+    return installed()[0]
+
+
+def _default(obj) -> str:
+    """Fallback for values JSON has no type for. datetime/date/time become
+    RFC 3339 (UTC as "Z"), exactly as msgspec encodes them natively;
+    anything else is written with str()."""
+    if isinstance(obj, (datetime, time)):
+        s = obj.isoformat()
+        return s[:-6] + "Z" if obj.utcoffset() == timedelta(0) else s
+    if isinstance(obj, date):
+        return obj.isoformat()
+    return str(obj)
+
+
+def dumps(obj, pretty: bool = False, preferred: str = "auto") -> bytes:
+    """Encode obj; every backend writes datetime/date/time as RFC 3339 and
+    other non-JSON values with str()."""
+    name = backend(preferred)
+    if name == "orjson":
+        import orjson
+        # orjson refuses aware times, so datetimes go through _default like stdlib json
+        opts = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+                | (orjson.OPT_INDENT_2 if pretty else 0))
+        return orjson.dumps(obj, default=_default, option=opts)
+    if name == "msgspec":
+        import msgspec
+        out = msgspec.json.encode(obj, enc_hook=_default)
+        return msgspec.json.format(out, indent=2) if pretty else out
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=_default).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, default=_default, separators=(",", ":")).encode("utf-8")
+
+
+def loads(data, preferred: str = "auto"):
+    """Decode bytes or str; malformed input raises ValueError for every backend."""
+    name = backend(preferred)
+    if name == "orjson":
+        import orjson
+        return orjson.loads(data)
+    if name == "msgspec":
+        import msgspec
+        try:
+            return msgspec.json.decode(data)
+        except msgspec.DecodeError as e:
+            raise ValueError(str(e)) from e
+    return json.loads(data)
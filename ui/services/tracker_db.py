@@ -0,0 +1,357 @@
+"""
+ui/services/tracker_db.py
+SQLite storage engine for meeting_tracker (settings.tracker_backend = "sqlite").
+WAL mode, one shared connection per database guarded by a lock, and indexes on
+every column the UI filters by so callers never need the full history.
+"""
+import json, os, sqlite3, threading, logging
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = {
+    "meetings": (
+        "id", "title", "date", "start_time", "end_time", "location", "attendees",
+        "email_subject", "email_body", "status", "source", "created_at", "updated_at",
+    ),
+    "emails": (
+        "id", "to", "subject", "body_preview", "body", "status", "source",
+        "meeting_id", "sent_at",
+    ),
+}
+JSON_COLUMNS = {"attendees"}
+TIME_COLUMN  = {"meetings": "created_at", "emails": "sent_at"}
+# Columns a free-text "search" filter matches (case-insensitive substring)
+SEARCH_COLUMNS = {"meetings": ("title", "attendees", "location"), "emails": ("to", "subject")}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meetings (
+    "id" TEXT PRIMARY KEY, "title" TEXT, "date" TEXT, "start_time" TEXT,
+    "end_time" TEXT, "location" TEXT, "attendees" TEXT, "email_subject" TEXT,
+    "email_body" TEXT, "status" TEXT, "source" TEXT, "created_at" TEXT,
+    "updated_at" TEXT, "extra" TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_meetings_status     ON meetings("status" COLLATE NOCASE);
+DROP INDEX IF EXISTS idx_meetings_title_date;
+CREATE INDEX IF NOT EXISTS idx_meetings_trim_title_date ON meetings(TRIM("title", char(32, 9, 10, 13)), "date");
+CREATE INDEX IF NOT EXISTS idx_meetings_created    ON meetings("created_at");
+
+CREATE TABLE IF NOT EXISTS emails (
+    "id" TEXT PRIMARY KEY, "to" TEXT, "subject" TEXT, "body_preview" TEXT,
+    "body" TEXT, "status" TEXT, "source" TEXT, "meeting_id" TEXT,
+    "sent_at" TEXT, "extra" TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_emails_status     ON emails("status" COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_emails_sent_at    ON emails("sent_at");
+CREATE INDEX IF NOT EXISTS idx_emails_meeting_id ON emails("meeting_id");
+CREATE INDEX IF NOT EXISTS idx_emails_to_subject ON emails("to", "subject");
+CREATE INDEX IF NOT EXISTS idx_emails_body_hash  ON emails(json_extract("extra", '$.body_hash'));
+
+CREATE TABLE IF NOT EXISTS dedup_keys (
+    "key" TEXT PRIMARY KEY, "expires" REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_dedup_expires ON dedup_keys("expires");
+"""
+
+# Counters by status/source (plus a total) per table, maintained by triggers
+# so they stay exact even when another process writes the database.
+COUNTER_KINDS = ("status", "source")
+_COUNTERS_SCHEMA = """
+CREATE TABLE IF NOT EXISTS counters (
+    "tbl" TEXT, "kind" TEXT, "key" TEXT, "n" INTEGER NOT NULL,
+    PRIMARY KEY ("tbl", "kind", "key")
+);
+"""
+
+
+def _bump_sql(table: str, row: str, step: int) -> str:
+    parts = [("total", "''")] + [(k, f'COALESCE({row}."{k}", \'\')') for k in COUNTER_KINDS]
+    return "".join(
+        f"INSERT INTO counters VALUES ('{table}', '{kind}', {key}, {step}) "
+        f"ON CONFLICT DO UPDATE SET n = n + ({step});\n"
+        for kind, key in parts
+    )
+
+
+def _trigger_schema() -> str:
+    sql = _COUNTERS_SCHEMA
+    for t in COLUMNS:
+        sql += (
+            f"CREATE TRIGGER IF NOT EXISTS trg_{t}_ins AFTER INSERT ON {t} BEGIN\n"
+            f"{_bump_sql(t, 'NEW', 1)}END;\n"
+            f"CREATE TRIGGER IF NOT EXISTS trg_{t}_del AFTER DELETE ON {t} BEGIN\n"
+            f"{_bump_sql(t, 'OLD', -1)}END;\n"
+            f'CREATE TRIGGER IF NOT EXISTS trg_{t}_upd AFTER UPDATE OF "status", "source" ON {t} BEGIN\n'
+            f"{_bump_sql(t, 'OLD', -1)}{_bump_sql(t, 'NEW', 1)}END;\n"
+        )
+    return sql
+
+_lock  = threading.RLock()
+_conns: dict = {}
+
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    conn = _conns.get(db_path)
+    if conn is not None:
+        return conn
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    # INSERT OR REPLACE must fire the delete trigger for the replaced row
+    conn.execute("PRAGMA recursive_triggers=ON")
+    conn.executescript(SCHEMA + _trigger_schema())
+    _conns[db_path] = conn
+    return conn
+
+
+def _q(col: str) -> str:
+    return f'"{col}"'
+
+
+def _to_row(table: str, record: dict) -> tuple:
+    cols  = COLUMNS[table]
+    extra = {k: v for k, v in record.items() if k not in cols}
+    vals  = []
+    for c in cols:
+        v = record.get(c)
+        if c in JSON_COLUMNS:
+            v = json.dumps(v or [], ensure_ascii=False)
+        elif v is not None and not isinstance(v, str):
+            v = str(v)
+        vals.append(v)
+    vals.append(json.dumps(extra, ensure_ascii=False, default=str) if extra else None)
+    return tuple(vals)
+
+
+def _from_row(table: str, row: sqlite3.Row) -> dict:
+    d = {c: row[c] for c in COLUMNS[table]}
+    for c in JSON_COLUMNS & d.keys():
+        d[c] = json.loads(d[c]) if d[c] else []
+    if row["extra"]:
+        d.update(json.loads(row["extra"]))
+    return d
+
+
+def build_where(table: str, filters: Optional[dict]) -> tuple:
+    """Translate meeting_tracker query filters into an indexed WHERE clause."""
+    clauses, params = [], []
+    for key, val in (filters or {}).items():
+        if val is None:
+            continue
+        if key == "status":
+            vals = (val,) if isinstance(val, str) else tuple(val)
+            clauses.append(f'"status" COLLATE NOCASE IN ({", ".join("?" * len(vals))})')
+            params.extend(vals)
+        elif key == "since":
+            clauses.append(f'{_q(TIME_COLUMN[table])} >= ?'); params.append(val)
+        elif key == "until":
+            clauses.append(f'{_q(TIME_COLUMN[table])} < ?');  params.append(val)
+        elif key == "title":
+            # Titles match ignoring surrounding whitespace (expression index)
+            clauses.append('TRIM("title", char(32, 9, 10, 13)) = ?'); params.append(str(val).strip())
+        elif key == "search":
+            cols = SEARCH_COLUMNS[table]
+            clauses.append("(" + " OR ".join(f"{_q(c)} LIKE ? ESCAPE '\\'" for c in cols) + ")")
+            like = "%" + val.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            params.extend([like] * len(cols))
+        elif key in COLUMNS[table] and isinstance(val, (tuple, list)):
+            clauses.append(f'{_q(key)} IN ({", ".join("?" * len(val))})'); params.extend(val)
+        elif key in COLUMNS[table]:
+            clauses.append(f'{_q(key)} = ?'); params.append(val)
+        else:
+            raise ValueError(f"Unknown {table} filter: {key}")
+    return " AND ".join(clauses), tuple(params)
+
+
+def query(db_path: str, table: str, filters: Optional[dict] = None,
+          limit: Optional[int] = None) -> list:
+    where, params = build_where(table, filters)
+    return select(db_path, table, where, params, limit=limit)
+
+
+def select(db_path: str, table: str, where: str = "", params: tuple = (),
+           order: str = "rowid", limit: Optional[int] = None) -> list:
+    sql = f"SELECT * FROM {table}"
+    if where:
+        sql += f" WHERE {where}"
+    sql += f" ORDER BY {order}"
+    if limit is not None:
+        sql += f" LIMIT {int(limit)}"
+    with _lock:
+        rows = _connect(db_path).execute(sql, params).fetchall()
+    return [_from_row(table, r) for r in rows]
+
+
+def page(db_path: str, table: str, filters: Optional[dict] = None,
+         after: Optional[tuple] = None, limit: int = 50, desc: bool = True) -> list:
+    """Keyset page ordered by (time column, id); after is the last
+    (time, id) of the previous page."""
+    where, params = build_where(table, filters)
+    col = _q(TIME_COLUMN[table])
+    if after is not None:
+        seek   = f'({col}, "id") {"<" if desc else ">"} (?, ?)'
+        where  = f"{where} AND {seek}" if where else seek
+        params = params + tuple(after)
+    direction = "DESC" if desc else "ASC"
+    return select(db_path, table, where, params,
+                  order=f'{col} {direction}, "id" {direction}', limit=limit)
+
+
+def count(db_path: str, table: str, filters: Optional[dict] = None) -> int:
+    where, params = build_where(table, filters)
+    sql = f"SELECT COUNT(*) FROM {table}" + (f" WHERE {where}" if where else "")
+    with _lock:
+        return _connect(db_path).execute(sql, params).fetchone()[0]
+
+
+def insert(db_path: str, table: str, records: list) -> None:
+    cols = COLUMNS[table] + ("extra",)
+    sql  = (f"INSERT OR REPLACE INTO {table} ({', '.join(_q(c) for c in cols)}) "
+            f"VALUES ({', '.join('?' * len(cols))})")
+    with _lock:
+        conn = _connect(db_path)
+        conn.execute("BEGIN")
+        try:
+            conn.executemany(sql, [_to_row(table, r) for r in records])
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+
+def update(db_path: str, table: str, record_id: str, fields: dict) -> bool:
+    cols = [c for c in fields if c in COLUMNS[table] and c != "id"]
+    if not cols:
+        return False
+    sql = f"UPDATE {table} SET {', '.join(_q(c) + ' = ?' for c in cols)} WHERE \"id\" = ?"
+    with _lock:
+        cur = _connect(db_path).execute(sql, tuple(fields[c] for c in cols) + (record_id,))
+    return cur.rowcount > 0
+
+
+def update_many(db_path: str, table: str, updates: dict) -> int:
+    """{record_id: fields} in one transaction; returns how many rows changed."""
+    n = 0
+    with _lock:
+        conn = _connect(db_path)
+        conn.execute("BEGIN")
+        try:
+            for record_id, fields in updates.items():
+                cols = [c for c in fields if c in COLUMNS[table] and c != "id"]
+                if cols:
+                    n += conn.execute(
+                        f"UPDATE {table} SET {', '.join(_q(c) + ' = ?' for c in cols)} WHERE \"id\" = ?",
+                        tuple(fields[c] for c in cols) + (record_id,)).rowcount
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    return n
+
+
+def delete(db_path: str, table: str, record_id: str) -> bool:
+    with _lock:
+        cur = _connect(db_path).execute(f'DELETE FROM {table} WHERE "id" = ?', (record_id,))
+    return cur.rowcount > 0
+
+
+def delete_many(db_path: str, table: str, record_ids: list) -> int:
+    with _lock:
+        conn = _connect(db_path)
+        conn.execute("BEGIN")
+        try:
+            cur = conn.executemany(f'DELETE FROM {table} WHERE "id" = ?', [(i,) for i in record_ids])
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    return cur.rowcount
+
+
+def has_body_ref(db_path: str, table: str, body_hash: str) -> bool:
+    """True if any row still points at body_hash (kept in the extra column)."""
+    with _lock:
+        row = _connect(db_path).execute(
+            f"SELECT 1 FROM {table} WHERE json_extract(\"extra\", '$.body_hash') = ? LIMIT 1",
+            (body_hash,)).fetchone()
+    return row is not None
+
+
+def data_version(db_path: str) -> int:
+    """Changes whenever another connection commits (own commits excluded)."""
+    with _lock:
+        return _connect(db_path).execute("PRAGMA data_version").fetchone()[0]
+
+
+def counters(db_path: str, table: str) -> dict:
+    """{"total", "status": {..}, "source": {..}} for table; rebuilt with one
+    GROUP BY pass if the stored counters do not add up."""
+    with _lock:
+        conn = _connect(db_path)
+        c = {"total": 0, "status": {}, "source": {}}
+        for kind, key, n in conn.execute(
+            'SELECT "kind", "key", "n" FROM counters WHERE "tbl" = ?', (table,)
+        ):
+            if kind == "total":
+                c["total"] = n
+            elif n:
+                c[kind][key] = n
+        if all(sum(c[k].values()) == c["total"] and min(c[k].values(), default=1) > 0
+               for k in COUNTER_KINDS) and (c["total"] or not _has_rows(conn, table)):
+            return c
+        logger.info(f"SQLite {table}: rebuilding stats counters")
+        conn.execute("BEGIN")
+        try:
+            conn.execute('DELETE FROM counters WHERE "tbl" = ?', (table,))
+            conn.execute(
+                f"INSERT INTO counters SELECT '{table}', 'total', '', COUNT(*) FROM {table}"
+            )
+            for kind in COUNTER_KINDS:
+                conn.execute(
+                    f"INSERT INTO counters SELECT '{table}', '{kind}', "
+                    f'COALESCE("{kind}", \'\'), COUNT(*) FROM {table} GROUP BY 3'
+                )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    return counters(db_path, table)
+
+
+def _has_rows(conn: sqlite3.Connection, table: str) -> bool:
+    return conn.execute(f"SELECT 1 FROM {table} LIMIT 1").fetchone() is not None
+
+
+def import_if_empty(db_path: str, table: str, records: list) -> int:
+    """One-time migration: seed an empty table from the legacy JSON file."""
+    rows = [r for r in records if r.get("id")]
+    with _lock:
+        if not rows or count(db_path, table):
+            return 0
+        insert(db_path, table, rows)
+    logger.info(f"SQLite {table}: imported {len(rows)} record(s) from JSON")
+    return len(rows)
+
+
+def claim_key(db_path: str, key: str, expires: float, now: float) -> bool:
+    """Atomically take key unless a live (unexpired) claim exists."""
+    with _lock:
+        cur = _connect(db_path).execute(
+            'INSERT INTO dedup_keys VALUES (?, ?) ON CONFLICT("key") DO UPDATE '
+            'SET "expires" = excluded."expires" WHERE dedup_keys."expires" <= ?',
+            (key, expires, now),
+        )
+    return cur.rowcount > 0
+
+
+def release_key(db_path: str, key: str) -> None:
+    with _lock:
+        _connect(db_path).execute('DELETE FROM dedup_keys WHERE "key" = ?', (key,))
+
+
+def purge_keys(db_path: str, now: float) -> int:
+    with _lock:
+        cur = _connect(db_path).execute('DELETE FROM dedup_keys WHERE "expires" <= ?', (now,))
+    return cur.rowcount
@@ -0,0 +1,149 @@
+"""
+ui/services/wal.py
+Group-commit append log used by meeting_tracker's journal mode.
+
+append() only queues bytes and returns a ticket; wait(ticket) blocks until
+they are on disk. The first waiter becomes the leader: it optionally sleeps
+for the group window so concurrent writers can queue behind it, then writes
+the whole batch with one write + one fsync and wakes everyone it covered.
+Even with no window, writers that queue during an fsync share the next one.
+"""
+import os, time, logging, threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class GroupCommitLog:
+    def __init__(self, path: str, window_ms: float = 0.0, fsync: bool = True):
+        self.path      = path
+        self.window_ms = window_ms
+        self.fsync     = fsync
+        self._cond     = threading.Condition()
+        self._buf: list = []
+        self._seq      = 0      # last ticket handed out
+        self._durable  = 0      # last ticket on disk
+        self._flushing = False
+        self._fd: Optional[int] = None
+        self.stats     = {"appends": 0, "groups": 0, "fsyncs": 0}
+
+    def append(self, data: bytes) -> int:
+        with self._cond:
+            self._buf.append(data)
+            self._seq += 1
+            self.stats["appends"] += 1
+            return self._seq
+
+    def pending(self) -> bool:
+        with self._cond:
+            return self._durable < self._seq
+
+    def wait(self, ticket: int, window: bool = True) -> None:
+        """Block until ticket is durable, leading a group flush if nobody is."""
+        while True:
+            with self._cond:
+                while self._flushing and self._durable < ticket:
+                    self._cond.wait()
+                if self._durable >= ticket:
+                    return
+                self._flushing = True
+            try:
+                if window and self.window_ms > 0:
+                    time.sleep(self.window_ms / 1000)   # let concurrent writers join
+                self._flush_once()
+            finally:
+                with self._cond:
+                    self._flushing = False
+                    self._cond.notify_all()
+
+    def _flush_once(self) -> None:
+        with self._cond:
+            batch, upto = self._buf, self._seq
+            self._buf = []
+        if not batch:
+            return
+        try:
+            self._write(b"".join(batch))
+        except Exception:
+            with self._cond:
+                self._buf[:0] = batch   # keep order; the next leader retries
+            raise
+        with self._cond:
+            self._durable = upto
+            self.stats["groups"] += 1
+
+    def _write(self, data: bytes) -> None:
+        if self._fd is None:
+            created  = not os.path.exists(self.path)
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            if created and self.fsync:
+                fsync_dir(self.path)
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self._fd, view):]
+        if self.fsync:
+            os.fsync(self._fd)
+            self.stats["fsyncs"] += 1
+
+    def flush(self) -> None:
+        self.wait(self._seq, window=False)
+
+    def close(self) -> None:
+        """Flush and release the file, e.g. before it is renamed or removed."""
+        self.flush()
+        with self._cond:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+
+_logs: dict = {}
+_logs_lock  = threading.Lock()
+
+
+def log(path: str, window_ms: float = 0.0, fsync: bool = True) -> GroupCommitLog:
+    with _logs_lock:
+        lg = _logs.get(path)
+        if lg is None:
+            lg = _logs[path] = GroupCommitLog(path, window_ms, fsync)
+        lg.window_ms, lg.fsync = window_ms, fsync
+        return lg
+
+
+def repair_tail(path: str) -> int:
+    """Cut a torn last record (no trailing newline) left by a crash so new
+    appends start on a fresh line. Returns the number of bytes dropped."""
+    try:
+        size = os.path.getsize(path)
+    except FileNotFoundError:
+        return 0
+    if not size:
+        return 0
+    with open(path, "rb+") as f:
+        f.seek(max(0, size - 65536))
+        tail = f.read()
+        if tail.endswith(b"\n"):
+            return 0
+        cut = tail.rfind(b"\n")
+        if cut < 0 and size > len(tail):
+            return 0   # torn record longer than the scan window; replay skips it
+        keep = size - len(tail) + cut + 1
+        f.truncate(keep)
+        f.flush()
+        os.fsync(f.fileno())
+    logger.warning(f"WAL {path}: dropped {size - keep} byte(s) of torn tail")
+    return size - keep
+
+
+def fsync_dir(path: str) -> None:
+    """Make a rename/remove in path's directory durable (no-op where unsupported)."""
+    try:
+        fd = os.open(os.path.dirname(path) or ".", os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
@@ -27,7 +27,6 @@ DEFAULTS: dict[str, Any] = {
     "enable_hitl":           True,
     "current_page":          "chat",
     "meetings":              [],
-    "emails_sent":           [],
     "system_logs":           [],
     "show_examples":         True,
     "last_refresh":          None,
@@ -159,8 +158,9 @@ def reinit_agent() -> None:
 
 def sync_data_from_files() -> None:
     try:
-        from ui.services.meeting_tracker import load_meetings, load_emails
-        st.session_state.meetings    = load_meetings()
-        st.session_state.emails_sent = load_emails()
+        from ui.services.meeting_tracker import load_meetings
+        # Email history is paged from the tracker (list_emails/get_emails_stats),
+        # never mirrored here: a full load would open every archive segment
+        st.session_state.meetings = load_meetings()
     except Exception as e:
         add_log(f"sync_data error: {e}", "ERROR")
\ No newline at end of file